@@ -0,0 +1,98 @@
+import re
+from typing import Dict, List, Tuple
+from config.constants import KPI_METADATA, KPI_ALIASES, PAYER_ALIASES
+
+# Keywords that change what kind of answer is wanted, independent of metric/payer/period
+INTENT_KEYWORDS = {
+    'comparison': ['compare', 'comparison', 'vs', 'versus', 'against', 'compared'],
+    'anomaly': ['anomaly', 'anomalies', 'unusual', 'spike', 'outlier', 'outliers'],
+    'report': ['report', 'deck', 'slides', 'presentation'],
+    'benchmark': ['benchmark', 'benchmarks', 'industry', 'peers', 'peer', 'mgma', 'hfma', 'national average'],
+    'ranking_top': ['highest', 'best', 'top', 'most'],
+    'ranking_bottom': ['lowest', 'worst', 'bottom', 'least'],
+}
+
+# Scopes the intent schema cannot express exactly (relative periods, facilities, trends)
+SCOPE_TERMS = {
+    'relative_period': ['this month', 'last month', 'this quarter', 'last quarter', 'this year', 'last year',
+                        'ytd', 'year to date', 'mtd', 'month to date', 'today', 'yesterday', 'this week', 'last week'],
+    'trend': ['trend', 'trends', 'over time', 'month over month', 'year over year', 'yoy', 'mom',
+              'monthly', 'weekly', 'forecast', 'predict', 'projection'],
+    'facility': ['facility', 'facilities', 'hospital', 'hospitals', 'clinic', 'clinics', 'campus', 'location'],
+}
+
+# Words that carry no meaning for the intent once entities are removed. Any
+# other leftover word (e.g. an unknown payer or facility name, "excluding")
+# makes the rule parser give up and keeps cached intents apart.
+FILLER_WORDS = frozenset("""
+a an the our my we us me i you your it its is are was were be been do does did has have had
+what what's whats which how how's why show tell give get see display list check find please can could
+for in of on at by to from with during across between and or all any overall total current currently
+much many high low rate rates number numbers value values metric metrics kpi kpis performance
+doing looking look like payer payers quarter q year
+""".split())
+
+QUARTER_WORDS = {'first': 'Q1', '1st': 'Q1', 'second': 'Q2', '2nd': 'Q2', 'third': 'Q3', '3rd': 'Q3', 'fourth': 'Q4', '4th': 'Q4'}
+
+def _phrase_pattern(phrases: List[str]) -> str:
+    # Longest first so "blue cross blue shield" wins over "blue cross"
+    escaped = sorted((re.escape(p) for p in phrases), key=len, reverse=True)
+    return r"(?<![\w/])(?:" + "|".join(escaped) + r")(?![\w/])"
+
+def _phrases(category: str, aliases: Dict[str, List[str]]) -> Dict[str, Tuple[str, str]]:
+    return {alias.lower(): (category, canonical) for canonical, names in aliases.items() for alias in names}
+
+# Every known phrase -> (entity category, canonical value)
+PHRASE_LOOKUP = {
+    **_phrases('keywords', INTENT_KEYWORDS),
+    **_phrases('scope', SCOPE_TERMS),
+    **_phrases('payers', PAYER_ALIASES),
+    **_phrases('metrics', {slug: [meta['label']] + KPI_ALIASES.get(slug, []) for slug, meta in KPI_METADATA.items()}),
+}
+
+# One compiled alternation scans a question for every entity kind in a single pass
+ENTITY_PATTERN = re.compile(
+    r"(?P<phrase>" + _phrase_pattern(list(PHRASE_LOOKUP)) + r")"
+    r"|(?P<quarter>\bq[1-4]\b|\b(?:" + "|".join(QUARTER_WORDS) + r") quarter\b)"
+    r"|(?P<year>\b20\d\d\b)"
+)
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+ENTITY_KINDS = ('payers', 'metrics', 'quarters', 'years', 'keywords', 'scope')
+
+def scan_entities(query: str) -> Tuple[Dict[str, Tuple[str, ...]], List[str]]:
+    """
+    Scans a question once and returns (entities, residual words).
+
+    Entities are sorted tuples of canonical values per kind (ENTITY_KINDS);
+    residual words are whatever text no entity matched, in order.
+    """
+    text = query.lower()
+    found = {kind: set() for kind in ENTITY_KINDS}
+    residual = []
+    last = 0
+    for match in ENTITY_PATTERN.finditer(text):
+        residual.extend(WORD_PATTERN.findall(text, last, match.start()))
+        last = match.end()
+        value = match.group()
+        if match.lastgroup == 'phrase':
+            kind, canonical = PHRASE_LOOKUP[value]
+            found[kind].add(canonical)
+        elif match.lastgroup == 'quarter':
+            found['quarters'].add(value.upper() if value.startswith('q') else QUARTER_WORDS[value.split()[0]])
+        else:
+            found['years'].add(value)
+    residual.extend(WORD_PATTERN.findall(text, last))
+    return {kind: tuple(sorted(values)) for kind, values in found.items()}, residual
+
+def extract_entities(query: str) -> Dict[str, Tuple[str, ...]]:
+    """
+    Pulls the exact-match entities out of a question: payers, metrics, quarters,
+    years, intent keywords and scope terms, each as a sorted tuple of canonical
+    values, plus 'qualifiers': the leftover non-filler words (facility names,
+    "excluding", "not", ...). Two questions with different entities must never
+    share a parsed intent.
+    """
+    entities, residual = scan_entities(query)
+    qualifiers = {word.strip("'") for word in residual} - FILLER_WORDS - {'', 's'}
+    return {**entities, 'qualifiers': tuple(sorted(qualifiers))}
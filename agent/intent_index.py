@@ -0,0 +1,100 @@
+import re
+import threading
+import zlib
+import numpy as np
+from typing import Dict, Any, Optional, Tuple
+from .entities import extract_entities
+
+class SemanticIntentIndex:
+    """
+    Offline similarity index over previously parsed questions.
+
+    Questions are embedded as TF-IDF weighted character n-gram vectors (hashed
+    into a fixed number of buckets, so no vocabulary has to be fitted) and
+    compared by cosine similarity in NumPy. A cached intent is reused only when
+    the new question is similar enough AND its extracted entities (payers,
+    metrics, quarters, years, intent keywords, leftover qualifier words) are
+    identical, so paraphrases hit while "Aetna Q4" never answers for "Aetna Q3"
+    and "North Campus" never answers for "Main Campus".
+    """
+
+    def __init__(self, threshold: float = 0.45, ngram_range: Tuple[int, int] = (2, 4),
+                 dimensions: int = 2048, max_entries: int = 2000):
+        self.threshold = threshold
+        self.ngram_range = ngram_range
+        self.dimensions = dimensions
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._tf = np.zeros((16, dimensions), dtype=np.float32) # Raw n-gram counts, one row per slot
+        self._df = np.zeros(dimensions, dtype=np.float32) # Document frequency per bucket
+        self._size = 0
+        self._next_slot = 0 # Ring position once max_entries is reached
+        self._weighted = None # Cached (unit-normalized TF-IDF rows, idf); reset by add()
+        self._entities = []
+        self._intents = []
+        self._queries = []
+
+    def _counts(self, query: str) -> np.ndarray:
+        text = f" {re.sub(r'[^a-z0-9/% ]+', ' ', query.lower())} "
+        text = re.sub(r"\s+", " ", text)
+        counts = np.zeros(self.dimensions, dtype=np.float32)
+        lo, hi = self.ngram_range
+        buckets = [zlib.crc32(text[i:i + n].encode()) % self.dimensions
+                   for n in range(lo, hi + 1) for i in range(len(text) - n + 1)]
+        np.add.at(counts, buckets, 1.0)
+        return counts
+
+    def _idf(self) -> np.ndarray:
+        n = self._size
+        return (np.log((1 + n) / (1 + self._df)) + 1.0).astype(np.float32)
+
+    def _unit_rows(self, matrix: np.ndarray) -> np.ndarray:
+        norms = np.sqrt(np.einsum('ij,ij->i', matrix, matrix))
+        return matrix / np.where(norms > 0, norms, 1.0)[:, None]
+
+    def add(self, query: str, intent: Dict[str, Any]):
+        """Indexes a parsed question. Beyond max_entries the oldest slot is overwritten."""
+        counts = self._counts(query)
+        entities = extract_entities(query)
+        with self._lock:
+            if self._size < self.max_entries:
+                if self._size == len(self._tf):
+                    grown = np.zeros((min(2 * len(self._tf), self.max_entries), self.dimensions), dtype=np.float32)
+                    grown[:self._size] = self._tf[:self._size]
+                    self._tf = grown
+                slot = self._size
+                self._size += 1
+                self._entities.append(entities)
+                self._intents.append(intent)
+                self._queries.append(query)
+            else:
+                slot = self._next_slot
+                self._next_slot = (slot + 1) % self.max_entries
+                self._df -= (self._tf[slot] > 0)
+                self._entities[slot], self._intents[slot], self._queries[slot] = entities, intent, query
+            self._tf[slot] = counts
+            self._df += (counts > 0)
+            self._weighted = None
+
+    def lookup(self, query: str) -> Optional[Tuple[Dict[str, Any], float, str]]:
+        """Returns (intent, similarity, matched question) for the best entity-compatible match, or None."""
+        entities = extract_entities(query)
+        counts = self._counts(query)
+        with self._lock:
+            if not self._size:
+                return None
+            # IDF only changes on add(), so the weighted matrix is reused across lookups
+            if self._weighted is None:
+                idf = self._idf()
+                self._weighted = (self._unit_rows(self._tf[:self._size] * idf), idf)
+            matrix, idf = self._weighted
+            vector = self._unit_rows((counts * idf)[None, :])[0]
+            scores = matrix @ vector
+            candidates = np.flatnonzero(scores >= self.threshold)
+            for i in candidates[np.argsort(scores[candidates])[::-1]]:
+                if self._entities[i] == entities:
+                    return self._intents[i], float(scores[i]), self._queries[i]
+        return None
+
+    def __len__(self) -> int:
+        return self._size
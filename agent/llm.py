@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Dict, Any, Optional
+import httpx
+import numpy as np
+from anthropic import Anthropic, AsyncAnthropic, DefaultHttpxClient, DefaultAsyncHttpxClient, Timeout
+from config.settings import settings
+
+class LLMCallStats:
+    """
+    Per-call latency and connection reuse for every request made through the
+    shared clients. Latency is measured to the response headers (for streamed
+    answers that is the wait before the first event). A request counts as a
+    new connection when httpcore reports a TCP connect for it.
+    """
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._latencies_ms = deque(maxlen=window) # Most recent calls only
+        self._counts = {'calls': 0, 'new_connections': 0, 'errors': 0}
+
+    def record(self, latency_ms: float, new_connection: bool, status_code: int):
+        with self._lock:
+            self._latencies_ms.append(latency_ms)
+            self._counts['calls'] += 1
+            self._counts['new_connections'] += int(new_connection)
+            self._counts['errors'] += int(status_code >= 400)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters plus connection reuse rate and latency percentiles (ms) over the recent window."""
+        with self._lock:
+            counts = dict(self._counts)
+            latencies = np.array(self._latencies_ms)
+        calls = counts['calls']
+        return {
+            **counts,
+            'reused_connections': calls - counts['new_connections'],
+            'reuse_rate': (calls - counts['new_connections']) / calls if calls else 0.0,
+            'latency_p50_ms': float(np.percentile(latencies, 50)) if calls else None,
+            'latency_p95_ms': float(np.percentile(latencies, 95)) if calls else None,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._latencies_ms.clear()
+            self._counts = {'calls': 0, 'new_connections': 0, 'errors': 0}
+
+llm_stats = LLMCallStats()
+
+# Process-wide sync client, plus one async client per event loop (httpx
+# connections are bound to the loop that opened them)
+_client: Optional[Anthropic] = None
+_client_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncAnthropic]" = weakref.WeakKeyDictionary()
+
+def has_api_key() -> bool:
+    """False when nodes should use their offline mock responses."""
+    return bool(settings.anthropic_api_key) and settings.anthropic_api_key != "MOCK_KEY"
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.llm_max_connections,
+        max_keepalive_connections=settings.llm_max_keepalive_connections,
+        keepalive_expiry=settings.llm_keepalive_expiry_seconds
+    )
+
+def _client_options() -> Dict[str, Any]:
+    # The SDK retries connection errors, 408/409/429 and 5xx with exponential
+    # backoff and honours retry-after headers, so rate limits are respected.
+    return {
+        "api_key": settings.anthropic_api_key,
+        "base_url": settings.anthropic_base_url,
+        "timeout": Timeout(settings.llm_timeout_seconds, connect=settings.llm_connect_timeout_seconds),
+        "max_retries": settings.llm_max_retries
+    }
+
+def _start_timer(request):
+    request.extensions["llm_started"] = time.perf_counter()
+    request.extensions["llm_new_connection"] = False
+
+def _record(response):
+    request = response.request
+    latency_ms = (time.perf_counter() - request.extensions["llm_started"]) * 1e3
+    llm_stats.record(latency_ms, request.extensions["llm_new_connection"], response.status_code)
+
+def _on_request(request):
+    _start_timer(request)
+
+    def trace(event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            request.extensions["llm_new_connection"] = True
+    request.extensions["trace"] = trace
+
+async def _aon_request(request):
+    _start_timer(request)
+
+    async def trace(event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            request.extensions["llm_new_connection"] = True
+    request.extensions["trace"] = trace
+
+async def _aon_response(response):
+    _record(response)
+
+def get_client() -> Anthropic:
+    """Returns the process-wide Anthropic client (one keep-alive connection pool for all nodes)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            http_client = DefaultHttpxClient(
+                limits=_limits(),
+                event_hooks={"request": [_on_request], "response": [_record]}
+            )
+            _client = Anthropic(**_client_options(), http_client=http_client)
+        return _client
+
+def get_async_client() -> AsyncAnthropic:
+    """
+    Returns the AsyncAnthropic client shared by every coroutine on the running
+    event loop, with the same pool limits, timeouts and retries as get_client().
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        http_client = DefaultAsyncHttpxClient(
+            limits=_limits(),
+            event_hooks={"request": [_aon_request], "response": [_aon_response]}
+        )
+        client = AsyncAnthropic(**_client_options(), http_client=http_client)
+        _async_clients[loop] = client
+    return client
+
+def reset_clients():
+    """Drops the shared clients so the next call picks up changed settings."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+    _async_clients.clear()
@@ -1,12 +1,33 @@
-import pandas as pd
+import re
 import logging
-from typing import Dict, Any
+from datetime import date
+from typing import Dict, Any, List
+from langgraph.types import Send
 from agent.state import AgentState
-from data.loader import DataLoader
+from data.dataset import claims_dataset
 from data.calculator import KPICalculator
 
 logger = logging.getLogger(__name__)
 
+# Branch key when a question is analyzed as a whole
+WHOLE_QUERY_BRANCH = "all"
+
+# Separates the payer part of a branch key from its metric ("Aetna|denial_rate")
+METRIC_BRANCH_SEPARATOR = "|"
+
+def period_filters(date_range: Any) -> Dict[str, Any]:
+    """
+    ClaimsDataset.get_range arguments for a date range filter: a quarter
+    ("Q1".."Q4", in every year) or a year ("2025"). Empty when there is none.
+    """
+    date_range = str(date_range or "").upper()
+    if re.fullmatch(r"Q[1-4]", date_range):
+        quarter = int(date_range[1])
+        return {"months": list(range(3 * quarter - 2, 3 * quarter + 1))}
+    if re.fullmatch(r"\d{4}", date_range):
+        return {"start_date": date(int(date_range), 1, 1), "end_date": date(int(date_range), 12, 31)}
+    return {}
+
 def analysis_engine_node(state: AgentState) -> AgentState:
     """Executes data analysis and KPI calculations based on intent."""
     
@@ -18,35 +39,21 @@ def analysis_engine_node(state: AgentState) -> AgentState:
         return {**state, "error": "Missing intent or metrics for analysis"}
 
     try:
-        loader = DataLoader()
         calculator = KPICalculator()
         
-        # 1. Load Data
-        df = loader.refresh_data()
-        if df.empty:
+        # 1. Load Data: only the service months a quarter/year filter covers, else the shared frame
+        period = period_filters((filters or {}).get("date_range"))
+        df = claims_dataset.get_range(**period) if period else claims_dataset.get()
+        if df.empty and (not period or claims_dataset.get().empty):
             return {**state, "error": "No data available for analysis"}
 
         # 2. Apply Filters from Intent
-        filtered_df = df.copy()
-        if filters:
-            if filters.get("payer"):
-                filtered_df = filtered_df[filtered_df['payer_name'] == filters["payer"]]
-            
-            # Simple date range parsing for demo (e.g. "Q4")
-            # In real system, this would be more robust
-            if filters.get("date_range") == "Q4":
-                filtered_df = filtered_df[pd.to_datetime(filtered_df['service_date']).dt.quarter == 4]
-            elif filters.get("date_range") == "2025":
-                filtered_df = filtered_df[pd.to_datetime(filtered_df['service_date']).dt.year == 2025]
-
-        # 3. Calculate Results
-        if intent == "comparison":
-            # Comparison logic: compare filtered vs full or specified periods
-            # For now, just calculate the metrics for the filtered set
-            result = calculator.calculate_all(filtered_df)
-        else:
-            # Standard KPI query
-            result = calculator.calculate_all(filtered_df)
+        filtered_df = df
+        if filters and filters.get("payer"):
+            filtered_df = filtered_df[filtered_df['payer_name'] == filters["payer"]]
+
+        # 3. Calculate Results (only the requested metrics are computed)
+        result = calculator.calculate_all(filtered_df, metrics)
 
         # 4. Filter result to only requested metrics
         final_result = {m: result.get(m) for m in metrics if m in result}
@@ -59,3 +66,57 @@ def analysis_engine_node(state: AgentState) -> AgentState:
     except Exception as e:
         logger.error(f"Error in analysis_engine_node: {str(e)}")
         return {**state, "error": f"Analysis failed: {str(e)}"}
+
+def plan_analysis(state: AgentState) -> List[Send]:
+    """
+    Splits a question into independent analysis branches that LangGraph runs in
+    parallel: one per payer for payer-vs-payer comparisons without a payer
+    filter, and within that one per metric when several are asked for.
+    Otherwise a single branch analyzes the whole question.
+    """
+    filters = state.get("filters") or {}
+    metrics = state.get("metrics") or []
+    payers = [None]
+    if state.get("intent") == "comparison" and state.get("comparison_type") == "payer_vs_payer" and not filters.get("payer"):
+        named = filters.get("payers")
+        if not named:
+            df = claims_dataset.get()
+            named = sorted(df['payer_name'].dropna().unique().tolist()) if 'payer_name' in df.columns else []
+        payers = named or payers
+
+    metric_sets = [[metric] for metric in metrics] if len(metrics) > 1 else [metrics]
+    sends = []
+    for payer in payers:
+        branch_filters = {**filters, "payer": payer} if payer else filters
+        for metric_set in metric_sets:
+            branch = payer or WHOLE_QUERY_BRANCH
+            if len(metric_sets) > 1:
+                branch = f"{branch}{METRIC_BRANCH_SEPARATOR}{metric_set[0]}"
+            sends.append(Send("analyzer", {**state, "filters": branch_filters, "metrics": metric_set, "branch": branch}))
+    return sends
+
+def analysis_branch_node(state: AgentState) -> AgentState:
+    """Analyzes one branch and reports its result under the branch key."""
+    result = analysis_engine_node(state)
+    branch = state.get("branch") or WHOLE_QUERY_BRANCH
+    return {"branch_results": {branch: {"data_result": result.get("data_result"), "error": result.get("error")}}}
+
+def merge_analysis_node(state: AgentState) -> AgentState:
+    """
+    Combines branch results into data_result: per-metric branches are joined
+    back in the requested metric order, and the result is keyed by payer when
+    there are several.
+    """
+    branches = state.get("branch_results") or {}
+    errors = [b["error"] for b in branches.values() if b.get("error")]
+    if errors or not branches:
+        return {**state, "error": errors[0] if errors else "Analysis produced no results"}
+
+    order = {metric: i for i, metric in enumerate(state.get("metrics") or [])}
+    grouped: Dict[str, Dict[str, Any]] = {}
+    for key in sorted(branches, key=lambda k: (k.split(METRIC_BRANCH_SEPARATOR)[0], order.get(k.partition(METRIC_BRANCH_SEPARATOR)[2], -1))):
+        group = key.split(METRIC_BRANCH_SEPARATOR)[0]
+        grouped.setdefault(group, {}).update(branches[key]["data_result"] or {})
+
+    data_result = grouped[WHOLE_QUERY_BRANCH] if list(grouped) == [WHOLE_QUERY_BRANCH] else grouped
+    return {**state, "data_result": data_result}
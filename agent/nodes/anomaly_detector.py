@@ -0,0 +1,58 @@
+import logging
+import threading
+from typing import Dict, Any, List, Optional
+from agent.state import AgentState
+from data.dataset import claims_dataset
+from data.anomalies import AnomalyDetector, ANOMALY_METRICS
+from config.constants import KPI_METADATA
+
+logger = logging.getLogger(__name__)
+
+# Anomalies in the most recent weeks are reported; older ones are history
+LOOKBACK_WEEKS = 4
+
+detector = AnomalyDetector()
+
+# Detection over every series runs once per dataset version and is filtered per caller
+_recent: Dict[str, Any] = {"key": None, "anomalies": []}
+_recent_lock = threading.Lock()
+
+def recent_anomalies(payers: Optional[List[str]] = None, facilities: Optional[List[str]] = None, metrics: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Live alerts from newly appended claims (newest first), then the anomalies
+    of the last LOOKBACK_WEEKS weeks (most severe first), optionally narrowed.
+    Live alerts are per payer, so the facility filter does not apply to them.
+    """
+    key = claims_dataset.get_version_key()
+    with _recent_lock:
+        if _recent["key"] != key:
+            cube = claims_dataset.get_aggregates()
+            _recent["anomalies"] = detector.detect(cube, freq='W', lookback=LOOKBACK_WEEKS) if cube is not None else []
+            _recent["key"] = key
+        anomalies = claims_dataset.get_live_alerts() + _recent["anomalies"]
+    return [
+        a for a in anomalies
+        if (payers is None or a['payer_name'] in payers)
+        and (facilities is None or 'facility' not in a or a['facility'] in facilities)
+        and (metrics is None or a['metric'] in metrics)
+    ]
+
+def anomaly_detector_node(state: AgentState) -> AgentState:
+    """Answers "anomaly" questions from the vectorized detector, honouring the payer filter and metrics."""
+    filters = state.get("filters") or {}
+    payer = filters.get("payer")
+    # Questions about KPIs the detector does not track look at all of them
+    metrics = [m for m in (state.get("metrics") or []) if m in ANOMALY_METRICS] or None
+
+    try:
+        anomalies = recent_anomalies(payers=[payer] if payer else None, metrics=metrics)
+    except Exception as e:
+        logger.error(f"Error in anomaly_detector_node: {str(e)}")
+        return {**state, "error": f"Anomaly detection failed: {str(e)}"}
+
+    data_result = {
+        'anomaly_count': len(anomalies),
+        # The most severe ones are enough context for the summary
+        'anomalies': [f"{KPI_METADATA[a['metric']]['label']} ({a['severity']}): {a['message']}" for a in anomalies[:10]]
+    }
+    return {**state, "anomalies": anomalies, "data_result": data_result}
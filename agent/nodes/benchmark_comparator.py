@@ -0,0 +1,39 @@
+import logging
+import pandas as pd
+from agent.state import AgentState
+from data.benchmarks import BenchmarkData
+
+logger = logging.getLogger(__name__)
+
+benchmarks = BenchmarkData()
+
+def benchmark_comparator_node(state: AgentState) -> AgentState:
+    """
+    Adds interpolated benchmark percentiles to data_result for "benchmark"
+    comparisons. Per-branch results (e.g. one per payer) are ranked as one
+    table in a single pass.
+    """
+    data_result = state.get("data_result") or {}
+    if not data_result:
+        return state
+
+    try:
+        # {metric: value} is one row; {branch: {metric: value}} is a row per branch
+        nested = all(isinstance(v, dict) for v in data_result.values())
+        table = pd.DataFrame.from_dict(data_result, orient='index') if nested else pd.DataFrame([data_result])
+        ranks = benchmarks.percentile_ranks(table.apply(pd.to_numeric, errors='coerce')).round(0)
+    except Exception as e:
+        logger.error(f"Error in benchmark_comparator_node: {str(e)}")
+        return {**state, "error": f"Benchmark comparison failed: {str(e)}"}
+
+    percentiles = {
+        row: {m: int(p) for m, p in values.items() if pd.notna(p)}
+        for row, values in ranks.to_dict(orient='index').items()
+    }
+    return {
+        **state,
+        "data_result": {
+            **data_result,
+            "benchmark_percentiles": percentiles if nested else percentiles[0]
+        }
+    }
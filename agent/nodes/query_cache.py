@@ -0,0 +1,105 @@
+import re
+import logging
+from typing import Dict, Any
+from agent.state import AgentState
+from agent.intent_index import SemanticIntentIndex
+from config.settings import settings
+from data.cache import QueryCache, TieredQueryCache
+from data.dataset import claims_dataset
+
+logger = logging.getLogger(__name__)
+
+# Parsed intents do not depend on the data, so they live longer than results
+INTENT_TTL_SECONDS = 24 * 3600
+RESULT_TTL_SECONDS = 900
+
+# Shared across sessions (memory tier) and restarts (SQLite tier)
+query_cache = TieredQueryCache(QueryCache(settings.cache_db_path))
+
+# Paraphrase fallback for intents (in-process only; rebuilt as questions are parsed)
+intent_index = SemanticIntentIndex()
+
+def normalize_query(query: str) -> str:
+    """Lowercases, collapses whitespace and drops trailing punctuation."""
+    return re.sub(r"\s+", " ", query.strip().lower()).rstrip("?.! ")
+
+def result_cache_key(state: AgentState) -> Dict[str, Any]:
+    """Canonical (intent, metrics, filters, comparison, data version) key for analysis results."""
+    filters = {k: v for k, v in (state.get("filters") or {}).items() if v is not None}
+    return {
+        "intent": state.get("intent"),
+        "metrics": sorted(state.get("metrics") or []),
+        "filters": filters,
+        "comparison_type": state.get("comparison_type"),
+        "data_version": claims_dataset.get_version_key()
+    }
+
+def intent_cache_node(state: AgentState) -> AgentState:
+    """
+    Reuses the parsed intent for a previously seen question, skipping the parser.
+    Exact (normalized) text is tried first, then a paraphrase with the same entities.
+    """
+    query = normalize_query(state.get("user_query", ""))
+    hit = "intent"
+    try:
+        cached = query_cache.get(query, {"kind": "intent"})
+        if cached is None:
+            match = intent_index.lookup(query)
+            if match is not None:
+                cached, score, matched_query = match
+                hit = "semantic_intent"
+                logger.info(f"Semantic intent hit ({score:.2f}): '{query}' ~ '{matched_query}'")
+    except Exception as e:
+        logger.warning(f"Intent cache lookup failed: {str(e)}")
+        cached = None
+
+    if cached is None:
+        return {**state, "next_node": "parser"}
+    return {
+        **state,
+        **cached,
+        "cache_hits": (state.get("cache_hits") or []) + [hit],
+        "next_node": "result_cache"
+    }
+
+def result_cache_node(state: AgentState) -> AgentState:
+    """Stores a freshly parsed intent and short-circuits to END when the result is cached."""
+    if state.get("error") or not state.get("intent"):
+        return {**state, "next_node": "analyzer"}
+
+    try:
+        hits = state.get("cache_hits") or []
+        if "intent" not in hits and "semantic_intent" not in hits:
+            parsed = {k: state.get(k) for k in ("intent", "metrics", "filters", "comparison_type")}
+            query = normalize_query(state["user_query"])
+            query_cache.set(query, {"kind": "intent"}, parsed, INTENT_TTL_SECONDS)
+            intent_index.add(query, parsed)
+
+        cached = query_cache.get("result", result_cache_key(state))
+    except Exception as e:
+        logger.warning(f"Result cache lookup failed: {str(e)}")
+        cached = None
+
+    if cached is None:
+        return {**state, "next_node": "analyzer"}
+    return {
+        **state,
+        **cached,
+        "cache_hits": (state.get("cache_hits") or []) + ["result"],
+        "next_node": "end"
+    }
+
+def cache_writer_node(state: AgentState) -> AgentState:
+    """Caches the computed result and answer for the canonical intent key."""
+    if state.get("error") or state.get("data_result") is None or not state.get("answer"):
+        return state
+    try:
+        query_cache.set(
+            "result",
+            result_cache_key(state),
+            {"data_result": state["data_result"], "answer": state["answer"]},
+            RESULT_TTL_SECONDS
+        )
+    except Exception as e:
+        logger.warning(f"Result cache write failed: {str(e)}")
+    return state
@@ -1,9 +1,10 @@
 import json
 import logging
-from typing import Dict, Any
-from anthropic import Anthropic
+import threading
+from typing import Dict, Any, Optional
 from agent.state import AgentState
-from config.settings import settings
+from agent.entities import scan_entities, FILLER_WORDS
+from agent.llm import get_client, get_async_client, has_api_key
 
 logger = logging.getLogger(__name__)
 
@@ -54,47 +55,158 @@ EXAMPLES:
 Respond with VALID JSON only.
 """
 
+class ParserStats:
+    """Counts how questions were parsed, to track how many LLM calls the rules avoid."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {'rules': 0, 'llm': 0}
+
+    def record(self, source: str):
+        with self._lock:
+            self._counts[source] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the counters plus the fraction of questions that fell through to the LLM."""
+        with self._lock:
+            counts = dict(self._counts)
+        total = counts['rules'] + counts['llm']
+        return {**counts, 'total': total, 'fall_through_rate': counts['llm'] / total if total else 0.0}
+
+parser_stats = ParserStats()
+
+def rule_based_parse(user_query: str) -> Optional[Dict[str, Any]]:
+    """
+    Parses common questions deterministically from the entity scan.
+
+    Returns the same structure as the LLM parser, or None when the question is
+    not fully understood (unrecognized words, several values where the schema
+    takes one, relative periods, facilities, trends) so it falls through.
+    """
+    entities, residual = scan_entities(user_query)
+    if entities['scope'] or any(word not in FILLER_WORDS for word in residual):
+        return None
+
+    metrics = list(entities['metrics'])
+    payers, keywords = entities['payers'], set(entities['keywords'])
+    periods = list(entities['quarters']) + list(entities['years'])
+    if not metrics or 'report' in keywords or (entities['quarters'] and entities['years']):
+        return None
+
+    # 1. Comparisons: the type must follow from the entities
+    if keywords & {'comparison', 'benchmark', 'ranking_top', 'ranking_bottom'}:
+        if 'anomaly' in keywords:
+            return None
+        if 'benchmark' in keywords:
+            comparison_type = 'benchmark'
+        elif len(payers) > 1 or keywords & {'ranking_top', 'ranking_bottom'}:
+            comparison_type = 'payer_vs_payer'
+        elif len(periods) > 1:
+            comparison_type = 'period_over_period'
+        else:
+            return None
+        filters = {
+            'payer': payers[0] if len(payers) == 1 else None,
+            'date_range': periods[0] if len(periods) == 1 else None
+        }
+        if len(payers) > 1:
+            # Named payers limit the payer-vs-payer fan-out to themselves
+            filters['payers'] = list(payers)
+        return {
+            'intent': 'comparison',
+            'metrics': metrics,
+            'filters': filters,
+            'comparison_type': comparison_type
+        }
+
+    # 2. Single-scope questions: at most one payer and one period
+    if len(payers) > 1 or len(periods) > 1:
+        return None
+    return {
+        'intent': 'anomaly' if 'anomaly' in keywords else 'kpi_query',
+        'metrics': metrics,
+        'filters': {
+            'payer': payers[0] if payers else None,
+            'date_range': periods[0] if periods else None
+        },
+        'comparison_type': None
+    }
+
+def _mock_parse(user_query: str) -> Dict[str, Any]:
+    """Simple heuristic parser for demo use without an API key."""
+    if any(word in user_query.lower() for word in ("anomal", "unusual", "spike")):
+        metrics = ["denial_rate"] if "denial" in user_query.lower() else ["net_collection_rate"]
+        return {"intent": "anomaly", "metrics": metrics, "filters": {"payer": "Aetna" if "aetna" in user_query.lower() else None}, "comparison_type": None}
+    elif "denial" in user_query.lower():
+        return {"intent": "kpi_query", "metrics": ["denial_rate"], "filters": {"payer": "Aetna" if "aetna" in user_query.lower() else None}, "comparison_type": None}
+    elif "compare" in user_query.lower():
+        return {"intent": "comparison", "metrics": ["net_collection_rate"], "filters": {}, "comparison_type": "period_over_period"}
+    return {"intent": "kpi_query", "metrics": ["net_collection_rate"], "filters": {}, "comparison_type": None}
+
+def _parser_request(user_query: str) -> Dict[str, Any]:
+    return {
+        "model": "claude-3-haiku-20240307",
+        "max_tokens": 500,
+        "temperature": 0,
+        "system": QUERY_PARSER_PROMPT,
+        "messages": [{"role": "user", "content": user_query}]
+    }
+
+def _with_intent(state: AgentState, parsed: Dict[str, Any]) -> AgentState:
+    return {
+        **state,
+        "intent": parsed.get("intent"),
+        "metrics": parsed.get("metrics"),
+        "filters": parsed.get("filters"),
+        "comparison_type": parsed.get("comparison_type")
+    }
+
+def _fast_path(user_query: str) -> Optional[Dict[str, Any]]:
+    """Rule-based parse plus bookkeeping; None means the LLM (or mock) must parse."""
+    parsed = rule_based_parse(user_query)
+    parser_stats.record('rules' if parsed is not None else 'llm')
+    if parsed is None and not has_api_key():
+        logger.warning("No Anthropic API key found. Using mock parser.")
+        return _mock_parse(user_query)
+    return parsed
+
 def query_parser_node(state: AgentState) -> AgentState:
-    """Parses user query into structured intent using Claude."""
+    """Parses user query into structured intent, using Claude only when the rules cannot."""
     
     user_query = state.get("user_query", "")
     if not user_query:
         return {**state, "error": "Empty user query"}
 
     try:
-        # Initialize Anthropic client
-        # In a real app, this key would be in settings.anthropic_api_key
-        # For this environment, we use the available LLM capabilities
-        client = Anthropic(api_key=settings.anthropic_api_key or "MOCK_KEY")
-        
-        # If no real API key, we mock the response for demonstration
-        if not settings.anthropic_api_key or settings.anthropic_api_key == "MOCK_KEY":
-             logger.warning("No Anthropic API key found. Using mock parser.")
-             # Simple heuristic parser for demo
-             if "denial" in user_query.lower():
-                 parsed = {"intent": "kpi_query", "metrics": ["denial_rate"], "filters": {"payer": "Aetna" if "aetna" in user_query.lower() else None}, "comparison_type": None}
-             elif "compare" in user_query.lower():
-                 parsed = {"intent": "comparison", "metrics": ["net_collection_rate"], "filters": {}, "comparison_type": "period_over_period"}
-             else:
-                 parsed = {"intent": "kpi_query", "metrics": ["net_collection_rate"], "filters": {}, "comparison_type": None}
-        else:
-            response = client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=500,
-                temperature=0,
-                system=QUERY_PARSER_PROMPT,
-                messages=[{"role": "user", "content": user_query}]
-            )
+        # 1. Deterministic fast path for common questions
+        parsed = _fast_path(user_query)
+
+        # 2. Fall through to the LLM
+        if parsed is None:
+            client = get_client()
+            response = client.messages.create(**_parser_request(user_query))
             parsed = json.loads(response.content[0].text)
 
-        return {
-            **state,
-            "intent": parsed.get("intent"),
-            "metrics": parsed.get("metrics"),
-            "filters": parsed.get("filters"),
-            "comparison_type": parsed.get("comparison_type")
-        }
+        return _with_intent(state, parsed)
 
     except Exception as e:
         logger.error(f"Error in query_parser_node: {str(e)}")
         return {**state, "error": f"Failed to parse query: {str(e)}"}
+
+async def aquery_parser_node(state: AgentState) -> AgentState:
+    """Async variant of query_parser_node: the LLM call awaits the shared AsyncAnthropic client."""
+
+    user_query = state.get("user_query", "")
+    if not user_query:
+        return {**state, "error": "Empty user query"}
+
+    try:
+        parsed = _fast_path(user_query)
+        if parsed is None:
+            response = await get_async_client().messages.create(**_parser_request(user_query))
+            parsed = json.loads(response.content[0].text)
+        return _with_intent(state, parsed)
+
+    except Exception as e:
+        logger.error(f"Error in aquery_parser_node: {str(e)}")
+        return {**state, "error": f"Failed to parse query: {str(e)}"}
@@ -1,7 +1,10 @@
+import re
+import time
 import logging
-from anthropic import Anthropic
+from typing import Dict, Any, List, Optional
+from langgraph.config import get_stream_writer
 from agent.state import AgentState
-from config.settings import settings
+from agent.llm import get_client, get_async_client, has_api_key
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +25,50 @@ INSTRUCTIONS:
 - Format your response in Markdown.
 """
 
+def _mock_answer(data_result: Dict[str, Any]) -> str:
+    metric_str = ", ".join([f"{k}: {v}" for k, v in data_result.items()])
+    return f"Based on the analysis, the requested metrics are: **{metric_str}**. \n\n*This is a mock response because no API key was provided.*"
+
+def _summary_request(user_query: str, data_result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "model": "claude-3-5-sonnet-20240620",
+        "max_tokens": 1000,
+        "temperature": 0,
+        "messages": [{"role": "user", "content": SUMMARY_PROMPT.format(query=user_query, results=data_result)}]
+    }
+
+class TokenCollector:
+    """
+    Receives answer tokens as they stream in: forwards each one to LangGraph's
+    custom stream (a no-op outside a streaming run), keeps the full text and
+    records time-to-first-token.
+    """
+
+    def __init__(self):
+        try:
+            self._emit = get_stream_writer()
+        except RuntimeError:
+            self._emit = lambda chunk: None # Called outside a graph run
+        self._start = time.perf_counter()
+        self._parts: List[str] = []
+        self.ttft_ms: Optional[float] = None
+
+    def __call__(self, text: str):
+        if self.ttft_ms is None:
+            self.ttft_ms = (time.perf_counter() - self._start) * 1e3
+        self._parts.append(text)
+        self._emit({"token": text})
+
+    def result(self, state: AgentState) -> AgentState:
+        logger.info(f"Summary time-to-first-token: {self.ttft_ms or 0:.0f} ms")
+        return {**state, "answer": "".join(self._parts), "ttft_ms": self.ttft_ms}
+
+def _mock_tokens(data_result: Dict[str, Any]) -> List[str]:
+    """The mock answer split into word tokens, so the offline path streams too."""
+    return re.findall(r"\s*\S+", _mock_answer(data_result))
+
 def summary_writer_node(state: AgentState) -> AgentState:
-    """Generates a natural language response using Claude."""
+    """Generates a natural language response using Claude, streaming tokens as they arrive."""
     
     user_query = state.get("user_query")
     data_result = state.get("data_result")
@@ -32,27 +77,40 @@ def summary_writer_node(state: AgentState) -> AgentState:
         return {**state, "answer": "I found no data to answer that question."}
 
     try:
-        client = Anthropic(api_key=settings.anthropic_api_key or "MOCK_KEY")
-        
-        if not settings.anthropic_api_key or settings.anthropic_api_key == "MOCK_KEY":
+        collect = TokenCollector()
+        if not has_api_key():
             # Mock summary generation
-            metric_str = ", ".join([f"{k}: {v}" for k, v in data_result.items()])
-            answer = f"Based on the analysis, the requested metrics are: **{metric_str}**. \n\n*This is a mock response because no API key was provided.*"
+            for token in _mock_tokens(data_result):
+                collect(token)
         else:
-            prompt = SUMMARY_PROMPT.format(query=user_query, results=data_result)
-            response = client.messages.create(
-                model="claude-3-5-sonnet-20240620",
-                max_tokens=1000,
-                temperature=0,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            answer = response.content[0].text
-
-        return {
-            **state,
-            "answer": answer
-        }
+            client = get_client()
+            with client.messages.stream(**_summary_request(user_query, data_result)) as stream:
+                for text in stream.text_stream:
+                    collect(text)
+        return collect.result(state)
 
     except Exception as e:
         logger.error(f"Error in summary_writer_node: {str(e)}")
         return {**state, "error": f"Failed to write summary: {str(e)}"}
+
+async def asummary_writer_node(state: AgentState) -> AgentState:
+    """Async variant of summary_writer_node using the shared AsyncAnthropic client."""
+
+    data_result = state.get("data_result")
+    if data_result is None:
+        return {**state, "answer": "I found no data to answer that question."}
+
+    try:
+        collect = TokenCollector()
+        if not has_api_key():
+            for token in _mock_tokens(data_result):
+                collect(token)
+        else:
+            async with get_async_client().messages.stream(**_summary_request(state.get("user_query"), data_result)) as stream:
+                async for text in stream.text_stream:
+                    collect(text)
+        return collect.result(state)
+
+    except Exception as e:
+        logger.error(f"Error in asummary_writer_node: {str(e)}")
+        return {**state, "error": f"Failed to write summary: {str(e)}"}
@@ -1,25 +1,59 @@
-from typing import Literal
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Literal, List, Union, Any, AsyncIterator, Tuple
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
+from langgraph.types import Send
 from .state import AgentState
-from .nodes.query_parser import query_parser_node
-from .nodes.analysis_engine import analysis_engine_node
-from .nodes.summary_writer import summary_writer_node
+from .nodes.query_parser import query_parser_node, aquery_parser_node
+from .nodes.analysis_engine import plan_analysis, analysis_branch_node, merge_analysis_node
+from .nodes.summary_writer import summary_writer_node, asummary_writer_node
+from .nodes.query_cache import intent_cache_node, result_cache_node, cache_writer_node
+from .nodes.anomaly_detector import anomaly_detector_node
+from .nodes.benchmark_comparator import benchmark_comparator_node
+
+def route_intent_cache(state: AgentState) -> Literal["parser", "result_cache"]:
+    return "result_cache" if state.get("next_node") == "result_cache" else "parser"
+
+def route_result_cache(state: AgentState) -> Union[str, List[Send]]:
+    """Ends on a cached result; anomaly questions go to the detector, others fan out into analysis branches."""
+    if state.get("next_node") == "end":
+        return END
+    if state.get("intent") == "anomaly":
+        return "anomaly_detector"
+    return plan_analysis(state)
+
+def route_analysis(state: AgentState) -> Literal["benchmark_comparator", "writer"]:
+    return "benchmark_comparator" if state.get("comparison_type") == "benchmark" and not state.get("error") else "writer"
 
 def orchestrator():
     """Builds and returns the LangGraph state machine."""
     
     workflow = StateGraph(AgentState)
 
-    # 1. Add Nodes
-    workflow.add_node("parser", query_parser_node)
-    workflow.add_node("analyzer", analysis_engine_node)
-    workflow.add_node("writer", summary_writer_node)
+    # 1. Add Nodes (LLM nodes have async variants used by ainvoke; sync nodes run in a thread pool there)
+    workflow.add_node("intent_cache", intent_cache_node)
+    workflow.add_node("parser", RunnableLambda(query_parser_node, afunc=aquery_parser_node))
+    workflow.add_node("result_cache", result_cache_node)
+    workflow.add_node("analyzer", analysis_branch_node)
+    workflow.add_node("merge", merge_analysis_node)
+    workflow.add_node("anomaly_detector", anomaly_detector_node)
+    workflow.add_node("benchmark_comparator", benchmark_comparator_node)
+    workflow.add_node("writer", RunnableLambda(summary_writer_node, afunc=asummary_writer_node))
+    workflow.add_node("cache_writer", cache_writer_node)
 
-    # 2. Define Edges
-    workflow.set_entry_point("parser")
-    workflow.add_edge("parser", "analyzer")
-    workflow.add_edge("analyzer", "writer")
-    workflow.add_edge("writer", END)
+    # 2. Define Edges (cache hits skip the parser, or the analyzer and writer)
+    workflow.set_entry_point("intent_cache")
+    workflow.add_conditional_edges("intent_cache", route_intent_cache, {"parser": "parser", "result_cache": "result_cache"})
+    workflow.add_edge("parser", "result_cache")
+    workflow.add_conditional_edges("result_cache", route_result_cache, ["analyzer", "anomaly_detector", END])
+    workflow.add_edge("analyzer", "merge")
+    workflow.add_conditional_edges("merge", route_analysis, {"benchmark_comparator": "benchmark_comparator", "writer": "writer"})
+    workflow.add_edge("benchmark_comparator", "writer")
+    workflow.add_edge("anomaly_detector", "writer")
+    workflow.add_edge("writer", "cache_writer")
+    workflow.add_edge("cache_writer", END)
 
     # 3. Compile
     return workflow.compile()
@@ -27,14 +61,92 @@ def orchestrator():
 # Singleton instance
 agent_app = orchestrator()
 
-def run_agent(query: str, session_id: str = "default") -> dict:
-    """Entry point to run the agent on a specific query."""
-    inputs = {
+def _initial_state(query: str, session_id: str) -> dict:
+    return {
         "user_query": query,
         "session_id": session_id,
-        "iteration_count": 0
+        "iteration_count": 0,
+        "cache_hits": []
     }
-    
+
+def run_agent(query: str, session_id: str = "default") -> dict:
+    """Entry point to run the agent on a specific query."""
     # Run the graph
-    final_state = agent_app.invoke(inputs)
+    final_state = agent_app.invoke(_initial_state(query, session_id))
     return final_state
+
+async def arun_agent(query: str, session_id: str = "default") -> dict:
+    """Async entry point: LLM calls are awaited, so many queries share one event loop."""
+    return await agent_app.ainvoke(_initial_state(query, session_id))
+
+async def astream_agent(query: str, session_id: str = "default") -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Runs the agent and yields ("token", text) as the summary streams in, then
+    ("final", state). Answers served from the result cache arrive only in the
+    final state.
+    """
+    final_state = None
+    async for mode, chunk in agent_app.astream(_initial_state(query, session_id), stream_mode=["custom", "values"]):
+        if mode == "custom" and "token" in chunk:
+            yield "token", chunk["token"]
+        elif mode == "values":
+            final_state = chunk
+    yield "final", final_state
+
+class AgentRun:
+    """A query running on the AgentLoop: the answer streamed so far plus a future for the final state."""
+
+    def __init__(self):
+        self.tokens: List[str] = [] # Appended from the loop thread, read by the UI
+        self.future: Future = None
+
+    @property
+    def partial_answer(self) -> str:
+        return "".join(list(self.tokens))
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: float = None) -> dict:
+        return self.future.result(timeout)
+
+class AgentLoop:
+    """
+    A background thread running one event loop for every UI session.
+
+    Streamlit runs each session's script in its own thread; submitting to this
+    loop lets all sessions' queries run concurrently on the shared async client
+    while the script thread stays free to render.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="agent-loop", daemon=True).start()
+            return self._loop
+
+    def submit(self, query: str, session_id: str = "default") -> Future:
+        """Schedules arun_agent on the loop and returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(arun_agent(query, session_id), self._ensure_loop())
+
+    def stream(self, query: str, session_id: str = "default") -> AgentRun:
+        """Like submit, but the returned AgentRun exposes the answer while it streams."""
+        run = AgentRun()
+
+        async def consume():
+            async for kind, value in astream_agent(query, session_id):
+                if kind == "token":
+                    run.tokens.append(value)
+                else:
+                    return value
+
+        run.future = asyncio.run_coroutine_threadsafe(consume(), self._ensure_loop())
+        return run
+
+# Shared by all UI sessions
+agent_loop = AgentLoop()
@@ -1,4 +1,8 @@
-from typing import TypedDict, Optional, List, Dict, Any
+from typing import TypedDict, Optional, List, Dict, Any, Annotated
+
+def merge_branch_results(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reducer for parallel analysis branches: results are keyed by branch, so re-merging is harmless."""
+    return {**(left or {}), **(right or {})}
 
 class AgentState(TypedDict):
     """Represents the state of the revenue cycle analytics agent."""
@@ -15,15 +19,19 @@ class AgentState(TypedDict):
     
     # Computed Data
     data_result: Optional[Dict[str, Any]] # Raw calculation output
+    branch: Optional[str] # Analysis branch key (set per parallel branch)
+    branch_results: Annotated[Optional[Dict[str, Any]], merge_branch_results] # branch -> {data_result, error}
     chart_config: Optional[Dict[str, Any]] # Plotly chart specification
     anomalies: Optional[List[Dict[str, Any]]] # Detected anomalies
     
     # Output
     answer: Optional[str] # Natural language response
+    ttft_ms: Optional[float] # Time to first streamed answer token
     summary: Optional[str] # Executive summary text
     report_path: Optional[str] # Path to generated file
     error: Optional[str] # Error message if pipeline fails
     
     # Control
     next_node: Optional[str] # Router decision
+    cache_hits: Optional[List[str]] # Cache levels that answered this run: "intent", "result"
     iteration_count: int # Prevent infinite loops
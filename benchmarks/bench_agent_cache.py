@@ -0,0 +1,39 @@
+"""
+End-to-end latency of run_agent with and without the query caches.
+
+Each question runs three times against an empty cache file: the first run is
+uncached, the second hits both cache levels, and a paraphrase that differs only
+in case/punctuation shows the normalized intent key. Without an Anthropic API
+key the parser and writer use their mock paths, so uncached numbers exclude LLM
+round-trips (add ~1-3s per call with a real key).
+
+Usage:
+    python -m benchmarks.bench_agent_cache
+"""
+import os
+import tempfile
+import time
+
+QUESTIONS = [
+    "What's our denial rate for Aetna in Q4?",
+    "Show me collections performance for 2025",
+    "Compare collections in Q3 vs Q4",
+]
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        # Point the shared cache at a scratch file before the agent imports settings
+        os.environ["CACHE_DB_PATH"] = os.path.join(tmp, "bench_cache.db")
+        from agent.orchestrator import run_agent
+
+        print(f"{'question':<45} {'uncached (ms)':>14} {'cached (ms)':>12} {'paraphrase (ms)':>16}")
+        for question in QUESTIONS:
+            timings = []
+            for q in (question, question, question.upper().rstrip('?') + '!'):
+                start = time.perf_counter()
+                run_agent(q)
+                timings.append((time.perf_counter() - start) * 1e3)
+            print(f"{question:<45} {timings[0]:>14.1f} {timings[1]:>12.1f} {timings[2]:>16.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Load test for the async agent against a local stub LLM server.
+
+The stub server (benchmarks/stub_llm.py) answers the Anthropic Messages API
+on 127.0.0.1 with a fixed delay (default 300 ms per call, roughly a short
+Haiku round-trip); the summary then streams one token every 20 ms. The query
+caches are replaced with no-op stand-ins and the questions miss the rule
+parser, so every query pays both LLM calls plus the analysis.
+
+Queries/sec is measured with 1, 10 and 50 concurrent users on one event loop
+(arun_agent). For comparison, the blocking run_agent is measured with one user.
+Mean time-to-first-token of the streamed summary is reported next to the
+mean end-to-end latency.
+
+Usage:
+    python -m benchmarks.bench_agent_concurrency [--latency-ms 300] [--queries-per-user 5]
+"""
+import argparse
+import asyncio
+import os
+import time
+import numpy as np
+from benchmarks.stub_llm import start_stub_server
+
+class NoCache:
+    """Stands in for the query cache so every question reaches the LLM."""
+
+    def get(self, *args, **kwargs):
+        return None
+
+    def set(self, *args, **kwargs):
+        pass
+
+def question(user: int, i: int) -> str:
+    # Unknown words ("dip", the ids) keep the rule parser from answering
+    return f"Why did collections dip for account group {user}-{i}?"
+
+async def run_users(arun_agent, users: int, per_user: int):
+    """Returns (queries/sec, mean time-to-first-token ms, mean query latency ms)."""
+    ttfts, latencies = [], []
+
+    async def user(u):
+        for i in range(per_user):
+            start = time.perf_counter()
+            result = await arun_agent(question(u, i), session_id=str(u))
+            assert result.get("answer"), result.get("error")
+            latencies.append((time.perf_counter() - start) * 1e3)
+            ttfts.append(result["ttft_ms"])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(u) for u in range(users)))
+    return users * per_user / (time.perf_counter() - start), np.mean(ttfts), np.mean(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--queries-per-user", type=int, default=5)
+    args = parser.parse_args()
+
+    server = start_stub_server(args.latency_ms / 1e3)
+
+    # Point the agent at the stub before settings are imported
+    os.environ["ANTHROPIC_API_KEY"] = "stub-key"
+    os.environ["ANTHROPIC_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+    from agent.nodes import query_cache as cache_nodes
+    from agent.intent_index import SemanticIntentIndex
+    from agent.orchestrator import run_agent, arun_agent
+    cache_nodes.query_cache = NoCache()
+    cache_nodes.intent_index = SemanticIntentIndex(threshold=2.0) # Never matches
+
+    run_agent(question(0, -1)) # Warm up dataset load and imports
+
+    start = time.perf_counter()
+    for i in range(args.queries_per_user):
+        run_agent(question(0, i))
+    print(f"stub latency {args.latency_ms:.0f} ms per LLM call, {args.queries_per_user} queries per user")
+    print(f"{'mode':<24} {'users':>6} {'queries/sec':>12} {'ttft (ms)':>10} {'latency (ms)':>13}")
+    print(f"{'sync run_agent':<24} {1:>6} {args.queries_per_user / (time.perf_counter() - start):>12.1f}")
+
+    async def sweep():
+        for users in (1, 10, 50):
+            qps, ttft, latency = await run_users(arun_agent, users, args.queries_per_user)
+            print(f"{'async arun_agent':<24} {users:>6} {qps:>12.1f} {ttft:>10.0f} {latency:>13.0f}")
+
+    asyncio.run(sweep())
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
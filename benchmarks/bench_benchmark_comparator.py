@@ -0,0 +1,60 @@
+"""
+Benchmark percentile ranking cost.
+
+Times BenchmarkData.percentile_ranks on the dashboard's single row of KPIs
+(the per-render cost) and on a payer x facility x month table. For
+comparison, the same table is ranked one cell at a time with np.interp.
+
+Usage:
+    python -m benchmarks.bench_benchmark_comparator
+    python -m benchmarks.bench_benchmark_comparator --rows 1 1000 100000 --trials 20
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from data.benchmarks import BenchmarkData, PERCENTILE_KEYS, PERCENTILES
+from config.constants import KPI_METADATA
+
+def kpi_table(rows: int, seed: int = 3) -> pd.DataFrame:
+    """Random KPI values spread around each benchmark's anchors."""
+    rng = np.random.default_rng(seed)
+    benchmarks = BenchmarkData().benchmarks
+    return pd.DataFrame({
+        metric: rng.uniform(min(b.values()) * 0.8, max(b.values()) * 1.2, rows)
+        for metric, b in benchmarks.items()
+    })
+
+def per_cell(benchmarks: BenchmarkData, table: pd.DataFrame) -> list:
+    ranks = []
+    for metric in table.columns:
+        anchors = np.array([benchmarks.benchmarks[metric][k] for k in PERCENTILE_KEYS])
+        sign = -1.0 if KPI_METADATA[metric]['is_inverse'] else 1.0
+        for value in table[metric]:
+            ranks.append(np.interp(value * sign, anchors * sign, PERCENTILES))
+    return ranks
+
+def best_of(func, trials: int) -> float:
+    times = []
+    for _ in range(trials):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1e3
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1, 720, 100_000])
+    parser.add_argument('--trials', type=int, default=10)
+    args = parser.parse_args()
+
+    benchmarks = BenchmarkData()
+    print(f"{'rows':>8} {'cells':>9} {'vectorized (ms)':>16} {'per cell (ms)':>14}")
+    for rows in args.rows:
+        table = kpi_table(rows)
+        vectorized = best_of(lambda: benchmarks.percentile_ranks(table), args.trials)
+        looped = best_of(lambda: per_cell(benchmarks, table), 1 if rows > 10_000 else args.trials)
+        print(f"{rows:>8} {table.size:>9} {vectorized:>16.3f} {looped:>14.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Filter-change latency benchmark for the dashboard.
+
+Times one sidebar interaction (KPIs, monthly trend and denials-by-payer for a
+random date range / payer / facility selection) answered by scanning raw claims
+versus summing cells of the pre-aggregated cube.
+
+Usage:
+    python -m benchmarks.bench_dashboard_filters
+    python -m benchmarks.bench_dashboard_filters --rows 15000 1000000 --trials 20
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from data.loader import MONEY_COLUMNS
+from data.synthetic_generator import iter_claim_chunks
+from data.calculator import KPICalculator
+from data.aggregates import KPIAggregates, CUBE_DIMENSIONS
+
+def random_selections(df: pd.DataFrame, trials: int, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    payers = df['payer_name'].dropna().unique().tolist()
+    facilities = df['facility'].dropna().unique().tolist()
+    first, last = df['service_date'].min(), df['service_date'].max()
+    span = (last - first).days
+    for _ in range(trials):
+        start = first + pd.Timedelta(days=int(rng.integers(0, span // 2)))
+        end = start + pd.Timedelta(days=int(rng.integers(30, span // 2)))
+        yield {
+            'start_date': start.date(),
+            'end_date': end.date(),
+            'payer_name': list(rng.choice(payers, size=rng.integers(1, len(payers) + 1), replace=False)),
+            'facility': list(rng.choice(facilities, size=rng.integers(1, len(facilities) + 1), replace=False))
+        }
+
+def scan_raw(df: pd.DataFrame, calc: KPICalculator, sel: dict):
+    filtered = df[
+        (df['service_date'] >= pd.Timestamp(sel['start_date'])) &
+        (df['service_date'] <= pd.Timestamp(sel['end_date'])) &
+        (df['payer_name'].isin(sel['payer_name'])) &
+        (df['facility'].isin(sel['facility']))
+    ]
+    calc.calculate_all(filtered)
+    calc.calculate_trends(filtered)
+    filtered[filtered['claim_status'] == 'Denied'].groupby('payer_name', observed=True).size()
+
+def query_cube(cube: KPIAggregates, sel: dict):
+    cube.calculate(**sel)
+    cube.calculate_trends(**sel)
+    cube.count('payer_name', **{**sel, 'claim_status': 'Denied'})
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[15_000, 1_000_000])
+    parser.add_argument('--trials', type=int, default=10)
+    args = parser.parse_args()
+
+    calc = KPICalculator()
+    print(f"{'rows':>12} {'cells':>8} {'build (s)':>10} {'raw (ms)':>10} {'cube (ms)':>10} {'speedup':>8}")
+    for n_rows in args.rows:
+        df = pd.concat(iter_claim_chunks(n_rows), ignore_index=True)
+        for col in MONEY_COLUMNS:
+            df[col] = df[col].astype('float32')
+
+        start = time.perf_counter()
+        cube = KPIAggregates.from_frame(df, CUBE_DIMENSIONS)
+        build = time.perf_counter() - start
+
+        selections = list(random_selections(df, args.trials))
+        start = time.perf_counter()
+        for sel in selections:
+            scan_raw(df, calc, sel)
+        raw = (time.perf_counter() - start) / len(selections)
+
+        start = time.perf_counter()
+        for sel in selections:
+            query_cube(cube, sel)
+        cubed = (time.perf_counter() - start) / len(selections)
+
+        print(f"{n_rows:>12,} {len(cube.cells):>8,} {build:>10.2f} {raw * 1e3:>10.1f} {cubed * 1e3:>10.1f} {raw / cubed:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Per-call cost of building a new Anthropic client for every request (the old
+node behaviour) versus the shared, pooled client from agent.llm.
+
+Runs against the local stub server (benchmarks/stub_llm.py) with no added
+latency, so the numbers are client and connection overhead only. Over the
+real API every new connection also pays a TLS handshake (typically 50-150 ms).
+
+Usage:
+    python -m benchmarks.bench_llm_client [--calls 200]
+"""
+import argparse
+import time
+from anthropic import Anthropic
+from benchmarks.stub_llm import start_stub_server
+
+REQUEST = {"model": "claude-3-haiku-20240307", "max_tokens": 50, "messages": [{"role": "user", "content": "hi"}]}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    server = start_stub_server(latency=0.0, token_interval=0.0)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    from config.settings import settings
+    from agent.llm import get_client, llm_stats
+    settings.anthropic_api_key, settings.anthropic_base_url = "stub-key", base_url
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        client = Anthropic(api_key="stub-key", base_url=base_url)
+        client.messages.create(**REQUEST)
+    fresh_ms = (time.perf_counter() - start) / args.calls * 1e3
+
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        get_client().messages.create(**REQUEST)
+    shared_ms = (time.perf_counter() - start) / args.calls * 1e3
+
+    stats = llm_stats.snapshot()
+    print(f"{'client':<28} {'ms/call':>8}")
+    print(f"{'new Anthropic() per call':<28} {fresh_ms:>8.2f}")
+    print(f"{'shared get_client()':<28} {shared_ms:>8.2f}")
+    print(f"shared client: {stats['calls']} calls, {stats['new_connections']} new connections "
+          f"(reuse {stats['reuse_rate']:.1%}), latency p50 {stats['latency_p50_ms']:.2f} ms, p95 {stats['latency_p95_ms']:.2f} ms")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
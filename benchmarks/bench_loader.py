@@ -0,0 +1,63 @@
+"""
+Load + validate benchmark for DataLoader.load_from_csv.
+
+Compares the columnar validator against the legacy per-row ClaimRecord path
+on extracts written by the synthetic claims generator.
+
+Usage:
+    python -m benchmarks.bench_loader                      # 15k, 1M, 10M rows
+    python -m benchmarks.bench_loader --rows 15000 200000
+"""
+import argparse
+import os
+import tempfile
+import time
+import pandas as pd
+from data.loader import DataLoader
+from data.schemas import ClaimRecord
+from data.synthetic_generator import write_synthetic_data
+
+def legacy_load(path: str) -> int:
+    """Per-row validation as shipped before the columnar validator."""
+    df = pd.read_csv(path)
+    for col in ['service_date', 'charge_entry_date', 'claim_submission_date', 'payment_date']:
+        df[col] = pd.to_datetime(df[col]).dt.date
+    invalid_rows = 0
+    for _, row in df.iterrows():
+        try:
+            ClaimRecord(**row.to_dict())
+        except Exception:
+            invalid_rows += 1
+    return invalid_rows
+
+def build_extract(n_rows: int, directory: str) -> str:
+    """Writes an n_rows synthetic claims CSV."""
+    return write_synthetic_data(os.path.join(directory, f"claims_{n_rows}.csv"), n_rows)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[15_000, 1_000_000, 10_000_000])
+    parser.add_argument('--legacy-max', type=int, default=1_000_000,
+                        help="Skip the per-row path above this size (it scales at roughly 10k rows/s)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'columnar (s)':>14} {'legacy (s)':>12} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            path = build_extract(n_rows, tmp)
+
+            start = time.perf_counter()
+            DataLoader(path).load_from_csv()
+            columnar = time.perf_counter() - start
+
+            if n_rows <= args.legacy_max:
+                start = time.perf_counter()
+                legacy_load(path)
+                legacy = time.perf_counter() - start
+                print(f"{n_rows:>12,} {columnar:>14.2f} {legacy:>12.2f} {legacy / columnar:>8.1f}x")
+            else:
+                print(f"{n_rows:>12,} {columnar:>14.2f} {'skipped':>12} {'-':>9}")
+            os.remove(path)
+
+if __name__ == "__main__":
+    main()
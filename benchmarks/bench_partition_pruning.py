@@ -0,0 +1,80 @@
+"""
+Date-filtered claim reads: month-partitioned store versus full scans.
+
+Builds a synthetic extract spanning `--years` of service dates, loads it
+once (which writes the columnar cache and the partitioned store), then times
+each query three ways, median of `--repeat` runs:
+
+    scan-memory   filter the fully loaded in-memory frame
+    scan-cache    read the whole columnar cache (memory-mapped), then filter;
+                  what a process without the frame resident pays
+    partitions    DataLoader.read_partitions: manifest lookup, then only the
+                  overlapping service-month files
+
+Queries are the last 90 days and the last 30 days of data, one quarter of one
+year, and Q4 across every year. "files" is the number of partitions read.
+
+Usage:
+    python -m benchmarks.bench_partition_pruning
+    python -m benchmarks.bench_partition_pruning --rows 5000000 --years 5 --partitions month_facility
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import pandas as pd
+from data.loader import DataLoader
+from data.partitions import PartitionedClaimsStore, filter_claims
+from data.synthetic_generator import write_synthetic_data
+
+def median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=3_000_000)
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--partitions', default='month', choices=['month', 'month_facility'])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    end = pd.Timestamp('2025-01-01')
+    start = end - pd.DateOffset(years=args.years)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_data(os.path.join(tmp, 'claims.csv'), args.rows, seed=1,
+                                    start_date=start.strftime('%Y-%m-%d'), end_date=end.strftime('%Y-%m-%d'))
+        loader = DataLoader(path, typed=True, float32_amounts=True, chunk_size=250_000, partitions=args.partitions)
+        load_start = time.perf_counter()
+        df, _ = loader.load_from_csv()
+        load_s = time.perf_counter() - load_start
+        store = PartitionedClaimsStore(loader.partitions_path, args.partitions)
+        manifest = store.manifest()
+        cache_loader = DataLoader(path, typed=True, float32_amounts=True, chunk_size=250_000)
+
+        last_day = df['service_date'].max()
+        queries = {
+            'last 90 days': dict(start_date=last_day - pd.Timedelta(days=89), end_date=last_day),
+            'last 30 days': dict(start_date=last_day - pd.Timedelta(days=29), end_date=last_day),
+            f'{last_day.year} Q3': dict(start_date=f'{last_day.year}-07-01', end_date=f'{last_day.year}-09-30'),
+            'Q4, all years': dict(months=[10, 11, 12]),
+        }
+
+        print(f"{args.rows:,} claims over {args.years} years, {len(manifest['partitions'])} partitions "
+              f"by {args.partitions} (load + partition {load_s:.1f} s)")
+        print(f"{'query':>14} {'rows':>10} {'files':>6} {'scan-memory ms':>15} {'scan-cache ms':>14} {'partitions ms':>14} {'vs cache':>9}")
+        for name, query in queries.items():
+            rows = len(loader.read_partitions(**query))
+            files = len(store.select(manifest, **query))
+            memory_ms = median_ms(lambda: filter_claims(df, **query), args.repeat)
+            cache_ms = median_ms(lambda: filter_claims(cache_loader.load_from_csv()[0], **query), args.repeat)
+            partition_ms = median_ms(lambda: loader.read_partitions(**query), args.repeat)
+            print(f"{name:>14} {rows:>10,} {files:>6} {memory_ms:>15.1f} {cache_ms:>14.1f} {partition_ms:>14.1f} {cache_ms / partition_ms:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
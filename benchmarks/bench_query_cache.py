@@ -0,0 +1,103 @@
+"""
+Concurrency benchmark for QueryCache.
+
+Many threads issue a 90/10 mix of get/set against one cache file, first with
+the previous connect-per-call implementation, then with the pooled WAL cache.
+
+Usage:
+    python -m benchmarks.bench_query_cache
+    python -m benchmarks.bench_query_cache --threads 1 8 32 --ops 2000
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from data.cache import QueryCache
+
+class LegacyQueryCache:
+    """QueryCache as it was before connection pooling (reference only)."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS query_cache (
+                    id TEXT PRIMARY KEY, query_text TEXT NOT NULL, result_json TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, ttl_seconds INTEGER DEFAULT 900
+                )
+            """)
+
+    def _generate_id(self, query_text: str, filters: dict) -> str:
+        return hashlib.sha256(f"{query_text}:{json.dumps(filters, sort_keys=True)}".encode()).hexdigest()
+
+    def get(self, query_text: str, filters: dict):
+        cache_id = self._generate_id(query_text, filters)
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT result_json, created_at, ttl_seconds FROM query_cache WHERE id = ?", (cache_id,)
+            ).fetchone()
+            if row:
+                result_json, created_at, ttl_seconds = row
+                if datetime.now() < datetime.fromisoformat(created_at) + timedelta(seconds=ttl_seconds):
+                    return json.loads(result_json)
+                conn.execute("DELETE FROM query_cache WHERE id = ?", (cache_id,))
+        return None
+
+    def set(self, query_text: str, filters: dict, result, ttl_seconds: int = 900):
+        cache_id = self._generate_id(query_text, filters)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO query_cache (id, query_text, result_json, created_at, ttl_seconds)
+                VALUES (?, ?, ?, ?, ?)
+            """, (cache_id, query_text, json.dumps(result), datetime.now().isoformat(), ttl_seconds))
+
+def run(cache, n_threads: int, ops_per_thread: int, keys: int = 500) -> float:
+    """Returns operations per second across all threads."""
+    errors = []
+
+    def worker(seed):
+        rng = random.Random(seed)
+        try:
+            for _ in range(ops_per_thread):
+                key = f"query {rng.randrange(keys)}"
+                if rng.random() < 0.9:
+                    cache.get(key, {"payer": "Aetna"})
+                else:
+                    cache.set(key, {"payer": "Aetna"}, {"denial_rate": rng.random()})
+        except sqlite3.Error as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        print(f"  {len(errors)} threads failed: {errors[0]}")
+    return n_threads * ops_per_thread / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--ops', type=int, default=1000, help="operations per thread")
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'legacy ops/s':>14} {'pooled ops/s':>14} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_threads in args.threads:
+            legacy = run(LegacyQueryCache(os.path.join(tmp, f"legacy_{n_threads}.db")), n_threads, args.ops)
+            cache = QueryCache(os.path.join(tmp, f"pooled_{n_threads}.db"), expiry_interval=None)
+            pooled = run(cache, n_threads, args.ops)
+            cache.close()
+            print(f"{n_threads:>8} {legacy:>14,.0f} {pooled:>14,.0f} {pooled / legacy:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Latency and fall-through rate of the rule-based query parser.
+
+Runs the deterministic parser over a corpus of typical console questions and
+reports how many would still need an LLM call, plus per-question parse time.
+No API key or network access is needed.
+
+Usage:
+    python -m benchmarks.bench_query_parser
+"""
+import time
+import numpy as np
+from agent.nodes.query_parser import rule_based_parse
+
+QUESTIONS = [
+    "What's our denial rate for Aetna in Q4?",
+    "Show me collections performance for 2025",
+    "Which payer has the highest denial rate?",
+    "Compare collections in Q3 vs Q4",
+    "Compare Medicare collections in Q3 vs Q4",
+    "What is the net collection rate for Medicare?",
+    "Days in A/R for UHC in the fourth quarter",
+    "How does our clean claim rate compare to industry benchmarks?",
+    "Which payer has the lowest clean claim rate?",
+    "Any unusual spike in charge lag?",
+    "What's our bad debt rate in 2024?",
+    "Compare Aetna vs BCBS denial rate",
+    "Show me the cost to collect",
+    "What is our point of service collection rate for Self-Pay?",
+    "A/R over 90 days for Medicaid",
+    "Show me anomalies in our collections this month",
+    "What's our denial rate for Cigna?",
+    "How are denials trending at the downtown facility?",
+    "Generate a board report for the CFO",
+    "Why did collections drop?",
+]
+
+def main():
+    repeats = 200
+    latencies, fell_through = [], []
+    for question in QUESTIONS:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            parsed = rule_based_parse(question)
+        latencies.append((time.perf_counter() - start) / repeats * 1e6)
+        if parsed is None:
+            fell_through.append(question)
+
+    print(f"questions: {len(QUESTIONS)}, parsed by rules: {len(QUESTIONS) - len(fell_through)}, "
+          f"fall-through rate: {len(fell_through) / len(QUESTIONS):.0%}")
+    print(f"parse latency: p50 {np.percentile(latencies, 50):.1f} us, p95 {np.percentile(latencies, 95):.1f} us")
+    for question in fell_through:
+        print(f"  -> LLM: {question}")
+
+if __name__ == "__main__":
+    main()
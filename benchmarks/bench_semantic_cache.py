@@ -0,0 +1,99 @@
+"""
+Hit rate, false-hit rate and lookup latency of the semantic intent index.
+
+The first question of each paraphrase group is indexed (as if it had been
+parsed once); every other phrasing should hit it. Near misses reuse the
+wording but change an entity (payer, quarter, year or metric) and must never
+hit. Runs fully offline.
+
+Usage:
+    python -m benchmarks.bench_semantic_cache [--threshold 0.45]
+"""
+import argparse
+import time
+import numpy as np
+from agent.intent_index import SemanticIntentIndex
+from agent.nodes.query_cache import normalize_query
+
+PARAPHRASES = [
+    ["What's our denial rate for Aetna in Q4?",
+     "what is the denial rate for aetna in q4",
+     "Show me Aetna's denial rate in Q4",
+     "Aetna denial rate Q4?",
+     "how high was the denial rate for Aetna in the fourth quarter"],
+    ["What is our net collection rate for Medicare in 2025?",
+     "net collection rate for medicare 2025",
+     "Show the NCR for Medicare in 2025",
+     "How is Medicare's net collection rate looking in 2025?"],
+    ["Compare collections in Q3 vs Q4",
+     "compare collections between q3 and q4",
+     "Q3 versus Q4 collections comparison"],
+    ["What are the days in AR for UnitedHealthcare?",
+     "days in ar for united healthcare",
+     "Show me UHC days in A/R",
+     "How many days in AR does UnitedHealthcare have?"],
+    ["Which payer has the highest denial rate?",
+     "which payer has the highest denials rate",
+     "Show me which payer has the highest denial rate"],
+    ["Are there any anomalies in charge lag?",
+     "show anomalies in charge lag",
+     "any unusual spike in charge lag?"],
+    ["What is the clean claim rate for Blue Cross Blue Shield in Q1?",
+     "clean claim rate for BCBS in Q1",
+     "Show BCBS clean claim rate in the first quarter"],
+]
+
+NEAR_MISSES = [
+    ("What's our denial rate for Aetna in Q4?", "What's our denial rate for Aetna in Q3?"),
+    ("What's our denial rate for Aetna in Q4?", "What's our denial rate for Medicare in Q4?"),
+    ("What's our denial rate for Aetna in Q4?", "What's our clean claim rate for Aetna in Q4?"),
+    ("What is our net collection rate for Medicare in 2025?", "What is our net collection rate for Medicare in 2024?"),
+    ("What is our net collection rate for Medicare in 2025?", "What is our net collection rate for Medicaid in 2025?"),
+    ("Compare collections in Q3 vs Q4", "Compare collections in Q2 vs Q4"),
+    ("What are the days in AR for UnitedHealthcare?", "What are the days in AR for Aetna?"),
+    ("Which payer has the highest denial rate?", "Which payer has the lowest denial rate?"),
+    ("What is the clean claim rate for Blue Cross Blue Shield in Q1?", "What is the clean claim rate for Blue Cross Blue Shield in Q2?"),
+]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threshold", type=float, default=SemanticIntentIndex().threshold)
+    parser.add_argument("--filler", type=int, default=1000, help="unrelated indexed questions to pad the index with")
+    args = parser.parse_args()
+
+    index = SemanticIntentIndex(threshold=args.threshold)
+    for i in range(args.filler):
+        index.add(normalize_query(f"filler question number {i} about facility {i % 17} volume"), {"intent": "filler"})
+    for group_id, group in enumerate(PARAPHRASES):
+        index.add(normalize_query(group[0]), {"intent": f"group-{group_id}"})
+
+    # 1. Paraphrases should come back with their group's intent
+    hits, latencies, scores = 0, [], []
+    total = 0
+    for group_id, group in enumerate(PARAPHRASES):
+        for question in group[1:]:
+            total += 1
+            start = time.perf_counter()
+            match = index.lookup(normalize_query(question))
+            latencies.append((time.perf_counter() - start) * 1e3)
+            if match is not None and match[0]["intent"] == f"group-{group_id}":
+                hits += 1
+                scores.append(match[1])
+            else:
+                print(f"  miss: {question!r}")
+
+    # 2. Near misses must never reuse an intent
+    false_hits = 0
+    for _, question in NEAR_MISSES:
+        match = index.lookup(normalize_query(question))
+        if match is not None:
+            false_hits += 1
+            print(f"  FALSE HIT: {question!r} -> {match[2]!r} ({match[1]:.2f})")
+
+    print(f"threshold={args.threshold} indexed={len(index)}")
+    print(f"paraphrase hit rate: {hits}/{total} ({hits / total:.0%}), mean score {np.mean(scores or [0]):.2f}")
+    print(f"near-miss false hits: {false_hits}/{len(NEAR_MISSES)}")
+    print(f"lookup latency: p50 {np.percentile(latencies, 50):.2f} ms, p95 {np.percentile(latencies, 95):.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Peak memory of loading a claims CSV in one pass versus streaming it in chunks.
+
+Each load runs in a fresh subprocess and reports its peak RSS (VmHWM on
+Linux; ru_maxrss elsewhere, which can carry over the parent's peak), so the
+numbers include the interpreter and imports; the "imports" row is that
+floor. Modes, all in the typed float32 layout the app uses:
+
+    one-pass    DataLoader.load_from_csv without chunking (no cache)
+    streamed    chunked into the columnar store, then read back memory-mapped
+    aggregates  DataLoader.ingest straight into the dashboard cube, no frame
+
+Extracts come from the synthetic claims generator.
+
+Usage:
+    python -m benchmarks.bench_streaming_ingest
+    python -m benchmarks.bench_streaming_ingest --rows 1000000 5000000 --chunk-size 100000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = ['imports', 'one-pass', 'streamed', 'aggregates']
+
+def peak_rss_mib() -> float:
+    try:
+        with open('/proc/self/status') as f:
+            return next(int(line.split()[1]) for line in f if line.startswith('VmHWM:')) / 1024
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_mode(mode: str, path: str, chunk_size: int) -> dict:
+    """Runs one load in this process and returns rows, seconds, peak RSS and the loaded frame's size."""
+    from data.loader import DataLoader
+    from data.aggregates import KPIAggregates, CUBE_DIMENSIONS
+    rows, frame_bytes = 0, 0
+    start = time.perf_counter()
+    if mode == 'one-pass':
+        df, report = DataLoader(path, use_cache=False, typed=True, float32_amounts=True).load_from_csv()
+        rows, frame_bytes = len(df), report.memory_bytes
+    elif mode == 'streamed':
+        df, report = DataLoader(path, typed=True, float32_amounts=True, chunk_size=chunk_size).load_from_csv()
+        rows, frame_bytes = len(df), report.memory_bytes
+    elif mode == 'aggregates':
+        cube = KPIAggregates(CUBE_DIMENSIONS)
+        rows = DataLoader(path, typed=True, float32_amounts=True).ingest([cube.update], chunk_size).total_rows
+    seconds = time.perf_counter() - start
+    return {'rows': rows, 'seconds': seconds, 'peak_mib': peak_rss_mib(), 'frame_mib': frame_bytes / 2**20}
+
+def measure(mode: str, path: str, chunk_size: int) -> dict:
+    out = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_streaming_ingest', '--worker', mode, path, str(chunk_size)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[200_000, 1_000_000, 3_000_000])
+    parser.add_argument('--chunk-size', type=int, default=250_000)
+    parser.add_argument('--worker', nargs=3, metavar=('MODE', 'PATH', 'CHUNK_SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        mode, path, chunk_size = args.worker
+        print(json.dumps(run_mode(mode, path, int(chunk_size))))
+        return
+
+    from data.synthetic_generator import write_synthetic_data
+    print(f"chunk size {args.chunk_size:,} rows")
+    print(f"{'rows':>10} {'csv MiB':>8} {'mode':>11} {'seconds':>8} {'peak RSS MiB':>13} {'frame MiB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            path = write_synthetic_data(os.path.join(tmp, f"claims_{n_rows}.csv"), n_rows)
+            size = os.path.getsize(path) / 2**20
+            for mode in MODES:
+                result = measure(mode, path, args.chunk_size)
+                print(f"{n_rows:>10,} {size:>8.0f} {mode:>11} {result['seconds']:>8.2f} {result['peak_mib']:>13.0f} {result['frame_mib']:>10.0f}")
+            for name in os.listdir(tmp):
+                os.remove(os.path.join(tmp, name))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Synthetic claims generation throughput.
+
+Times the vectorized generator in memory and written to CSV and Parquet in
+chunks, against the per-row loop it replaced (kept below as a reference,
+without its CSV write). Peak memory is the heap high-water mark
+(tracemalloc, in a second untimed pass) while writing, which follows the
+chunk size, not the row count.
+
+The last table writes `--parallel-rows` claims as monthly Parquet partitions
+with each worker count; the files are identical for every count, so only the
+wall time changes. Speedup is bounded by the cores available.
+
+Usage:
+    python -m benchmarks.bench_synthetic_generator
+    python -m benchmarks.bench_synthetic_generator --rows 1000000 20000000 --chunk-size 500000
+    python -m benchmarks.bench_synthetic_generator --rows 15000 --parallel-rows 20000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+import numpy as np
+from data.synthetic_generator import (
+    PAYERS, DENIAL_REASONS, CPT_CODES, generate_claims, write_synthetic_data, write_partitioned_data
+)
+
+def legacy_rows(num_rows: int, start_date: str = '2024-01-01', end_date: str = '2025-12-31') -> list:
+    """Row-by-row generation as shipped before the vectorized generator (reference only)."""
+    np.random.seed(42)
+    payer_names = list(PAYERS)
+    reasons = list(DENIAL_REASONS)
+    start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+    delta_days = (datetime.strptime(end_date, '%Y-%m-%d') - start_dt).days
+    claims_payer = np.random.choice(payer_names, size=num_rows, p=[p['weight'] for p in PAYERS.values()])
+    claims_service_date = [start_dt + timedelta(days=np.random.randint(0, delta_days)) for _ in range(num_rows)]
+
+    data = []
+    for i in range(num_rows):
+        info = PAYERS[claims_payer[i]]
+        service_date = claims_service_date[i]
+        charges = np.random.uniform(500, 5000) if np.random.random() < 0.8 else np.random.uniform(5000, 45000)
+        allowed_amount = charges * np.random.uniform(0.4, 0.7)
+        payment_date = None
+        payments = patient_responsibility = pos_collections = 0
+        if np.random.random() < info['denial_rate']:
+            denial_reason = np.random.choice(reasons, p=list(DENIAL_REASONS.values()))
+        else:
+            denial_reason = None
+            payments = allowed_amount * np.random.uniform(0.7, 0.9)
+            patient_responsibility = allowed_amount - payments
+            payment_date = service_date + timedelta(days=max(1, int(np.random.normal(info['payment_lag_avg'], 10))))
+        if info['category'] in ('Commercial', 'Self-Pay') and np.random.random() < 0.6:
+            pos_collections = patient_responsibility * np.random.uniform(0.1, 0.5)
+        charge_entry_date = service_date + timedelta(days=np.random.randint(1, 5))
+        claim_submission_date = charge_entry_date + timedelta(days=np.random.randint(1, 3))
+        data.append({
+            'claim_id': f'CLM-{100000 + i}',
+            'service_date': service_date.strftime('%Y-%m-%d'),
+            'payer_name': claims_payer[i],
+            'cpt_code': np.random.choice(CPT_CODES),
+            'charges': round(charges, 2),
+            'payments': round(payments, 2),
+            'patient_responsibility': round(patient_responsibility, 2),
+            'pos_collections': round(pos_collections, 2),
+            'denial_reason': denial_reason,
+            'charge_entry_date': charge_entry_date.strftime('%Y-%m-%d'),
+            'claim_submission_date': claim_submission_date.strftime('%Y-%m-%d'),
+            'payment_date': payment_date.strftime('%Y-%m-%d') if payment_date else None,
+            'facility': 'Main Campus' if np.random.random() < 0.8 else 'East Wing'
+        })
+    return data
+
+def timed_write(path: str, rows: int, chunk_size: int):
+    """Returns (seconds, file MiB) for one chunked write."""
+    start = time.perf_counter()
+    write_synthetic_data(path, rows, chunk_size)
+    seconds = time.perf_counter() - start
+    size = os.path.getsize(path) / 2**20
+    os.remove(path)
+    return seconds, size
+
+def peak_memory(path: str, rows: int, chunk_size: int) -> float:
+    """Peak traced MiB while writing; a separate pass, as tracing slows allocation several-fold."""
+    tracemalloc.start()
+    write_synthetic_data(path, rows, chunk_size)
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    os.remove(path)
+    return peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[15_000, 1_000_000, 5_000_000])
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--parallel-rows', type=int, default=5_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--legacy-max', type=int, default=100_000,
+                        help="Skip the per-row loop above this size (it runs at roughly 20k rows/s)")
+    args = parser.parse_args()
+
+    print(f"{'rows':>12} {'legacy rows/s':>14} {'memory rows/s':>14} {'csv rows/s':>11} {'peak MiB':>9} "
+          f"{'csv MiB':>8} {'parquet rows/s':>15} {'peak MiB':>9} {'parquet MiB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            legacy = '-'
+            if rows <= args.legacy_max:
+                start = time.perf_counter()
+                legacy_rows(rows)
+                legacy = f"{rows / (time.perf_counter() - start):,.0f}"
+
+            start = time.perf_counter()
+            generate_claims(min(rows, args.chunk_size))
+            in_memory = min(rows, args.chunk_size) / (time.perf_counter() - start)
+
+            csv_path, pq_path = os.path.join(tmp, 'claims.csv'), os.path.join(tmp, 'claims.parquet')
+            csv_s, csv_size = timed_write(csv_path, rows, args.chunk_size)
+            pq_s, pq_size = timed_write(pq_path, rows, args.chunk_size)
+            csv_peak = peak_memory(csv_path, rows, args.chunk_size)
+            pq_peak = peak_memory(pq_path, rows, args.chunk_size)
+            print(f"{rows:>12,} {legacy:>14} {in_memory:>14,.0f} {rows / csv_s:>11,.0f} {csv_peak:>9.0f} "
+                  f"{csv_size:>8.0f} {rows / pq_s:>15,.0f} {pq_peak:>9.0f} {pq_size:>12.0f}")
+
+        print(f"\n{args.parallel_rows:,} rows as monthly Parquet partitions ({os.cpu_count()} CPUs)")
+        print(f"{'workers':>8} {'files':>6} {'seconds':>8} {'rows/s':>11} {'speedup':>8}")
+        baseline = None
+        for workers in args.workers:
+            start = time.perf_counter()
+            paths = write_partitioned_data(
+                os.path.join(tmp, f'parts_{workers}'), args.parallel_rows, args.chunk_size,
+                partition_by='month', workers=workers
+            )
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(f"{workers:>8} {len(paths):>6} {seconds:>8.1f} {args.parallel_rows / seconds:>11,.0f} {baseline / seconds:>7.1f}x")
+            for path in paths:
+                os.remove(path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Responsiveness of other sessions while an upload is processed in the background.
+
+Loads a base extract into a ClaimsDataset, then times a typical dashboard
+read from another session (dataset.get() plus a date-filtered KPI total)
+in a loop: first idle, then while UploadProcessor ingests a CSV upload of
+`--upload-rows` claims on its worker thread. Reports read latency p50/p99
+for both phases and the upload's throughput. Reads never wait on the
+upload except for the final append, which holds the dataset lock briefly;
+the rest of the slowdown is the GIL shared with the parsing thread.
+
+Usage:
+    python -m benchmarks.bench_upload_pipeline
+    python -m benchmarks.bench_upload_pipeline --base-rows 1000000 --upload-rows 2000000 --chunk-size 100000
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from data.dataset import ClaimsDataset
+from data.loader import DataLoader
+from data.uploads import UploadProcessor
+from data.synthetic_generator import write_synthetic_data
+
+def session_read(dataset: ClaimsDataset) -> float:
+    """One dashboard-style read; returns its latency in ms."""
+    start = time.perf_counter()
+    df = dataset.get()
+    recent = df['service_date'] >= df['service_date'].max() - pd.Timedelta(days=90)
+    df.loc[recent, ['charges', 'payments']].sum()
+    return (time.perf_counter() - start) * 1000
+
+def read_latencies(dataset: ClaimsDataset, until, min_reads: int = 20, pause: float = 0.01) -> np.ndarray:
+    latencies = []
+    while until() or len(latencies) < min_reads:
+        latencies.append(session_read(dataset))
+        time.sleep(pause)
+    return np.array(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-rows', type=int, default=500_000)
+    parser.add_argument('--upload-rows', type=int, default=1_000_000)
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = write_synthetic_data(os.path.join(tmp, 'base.csv'), args.base_rows, seed=1)
+        upload_path = write_synthetic_data(os.path.join(tmp, 'upload.csv'), args.upload_rows, seed=2)
+        with open(upload_path, 'rb') as f:
+            upload = io.BytesIO(f.read())
+
+        dataset = ClaimsDataset(DataLoader(base_path, use_cache=False, typed=True, float32_amounts=True))
+        dataset.get()
+        processor = UploadProcessor(dataset, max_workers=1, chunk_size=args.chunk_size)
+
+        idle = read_latencies(dataset, until=lambda: False, min_reads=200)
+        start = time.perf_counter()
+        job = processor.submit(upload, 'upload.csv')
+        busy = read_latencies(dataset, until=lambda: not job.done())
+        seconds = time.perf_counter() - start
+        assert job.status == "done", job.error
+
+    print(f"base {args.base_rows:,} rows, upload {args.upload_rows:,} rows ({upload.getbuffer().nbytes / 2**20:.0f} MiB), "
+          f"chunk size {args.chunk_size:,}, {os.cpu_count()} CPUs")
+    print(f"{'phase':>8} {'reads':>6} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for phase, lat in [('idle', idle), ('upload', busy)]:
+        print(f"{phase:>8} {len(lat):>6} {np.percentile(lat, 50):>8.1f} {np.percentile(lat, 99):>8.1f} {lat.max():>8.1f}")
+    print(f"upload: {seconds:.1f} s, {args.upload_rows / seconds:,.0f} rows/s, "
+          f"{job.report.valid_rows:,} appended (dataset version {job.version})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+A local stand-in for the Anthropic Messages API, for load tests and benchmarks.
+
+Requests with a system prompt (the query parser) get a parsed-intent JSON
+answer; others (the summary writer) get canned text. Non-streaming replies
+arrive after `latency` seconds. Streaming replies (server-sent events) send
+the first token after `latency` and then one token every `token_interval`.
+The first `rate_limited` requests are refused with 429 and `retry-after: 0`.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PARSED_INTENT = {
+    "intent": "kpi_query",
+    "metrics": ["net_collection_rate", "denial_rate"],
+    "filters": {"payer": "Aetna", "date_range": None},
+    "comparison_type": None
+}
+
+SUMMARY_TOKENS = ["Net ", "collection ", "rate ", "and ", "denial ", "rate ", "for ", "Aetna ", "are ",
+                  "within ", "their ", "usual ", "range ", "this ", "period."]
+
+def make_handler(latency: float, token_interval: float, rate_limited: int):
+    class StubMessagesHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" # Keep-alive, like the real API
+        disable_nagle_algorithm = True # Headers and body go out in separate writes
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with self.server.lock:
+                self.server.requests += 1
+                limited = self.server.requests <= rate_limited
+            if limited:
+                return self._rate_limited()
+            tokens = [json.dumps(PARSED_INTENT)] if request.get("system") else SUMMARY_TOKENS
+            time.sleep(latency)
+            if request.get("stream"):
+                self._stream(request, tokens)
+            else:
+                self._reply(request, "".join(tokens))
+
+        def _message(self, request, text):
+            return {
+                "id": "msg_stub", "type": "message", "role": "assistant", "model": request["model"],
+                "content": [{"type": "text", "text": text}] if text else [],
+                "stop_reason": "end_turn" if text else None, "stop_sequence": None,
+                "usage": {"input_tokens": 1, "output_tokens": 1}
+            }
+
+        def _rate_limited(self):
+            body = json.dumps({"type": "error", "error": {"type": "rate_limit_error", "message": "Stub rate limit"}}).encode()
+            self.send_response(429)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("retry-after", "0")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _reply(self, request, text):
+            body = json.dumps(self._message(request, text)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _event(self, name, data):
+            payload = f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+            self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+            self.wfile.flush()
+
+        def _stream(self, request, tokens):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self._event("message_start", {"type": "message_start", "message": self._message(request, "")})
+            self._event("content_block_start", {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}})
+            for i, token in enumerate(tokens):
+                if i:
+                    time.sleep(token_interval)
+                self._event("content_block_delta", {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": token}})
+            self._event("content_block_stop", {"type": "content_block_stop", "index": 0})
+            self._event("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None}, "usage": {"output_tokens": len(tokens)}})
+            self._event("message_stop", {"type": "message_stop"})
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *args):
+            pass
+
+    return StubMessagesHandler
+
+def start_stub_server(latency: float = 0.3, token_interval: float = 0.02, rate_limited: int = 0) -> ThreadingHTTPServer:
+    """Starts the stub on a free localhost port in a daemon thread. Call .shutdown() when done."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(latency, token_interval, rate_limited))
+    server.daemon_threads = True
+    server.requests = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, name="stub-llm", daemon=True).start()
+    return server
@@ -1,9 +1,14 @@
 import streamlit as st
 from datetime import datetime
 
-def render_chat_message(role: str, content: str, timestamp: str = None):
-    """Renders a chat message bubble in Streamlit."""
+def render_chat_message(role: str, content: str, timestamp: str = None, streaming: bool = False, caption: str = None):
+    """
+    Renders a chat message bubble in Streamlit. `streaming` marks a partial
+    answer that is still arriving; `caption` adds a small note under the bubble.
+    """
     
+    if streaming:
+        content = f"{content}▌"
     if timestamp is None:
         timestamp = datetime.now().strftime("%H:%M")
         
@@ -36,5 +41,6 @@ def render_chat_message(role: str, content: str, timestamp: str = None):
             '>
                 {content}
             </div>
+            {f"<span style='font-size: 0.7rem; color: #9CA3AF; margin-top: 2px;'>{caption}</span>" if caption else ""}
         </div>
     """, unsafe_allow_html=True)
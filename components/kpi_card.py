@@ -2,6 +2,10 @@ import streamlit as st
 import plotly.graph_objects as go
 from typing import Optional, List, Literal
 
+def _ordinal(n: int) -> str:
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
 def render_kpi_card(
     title: str,
     value: float,
@@ -56,7 +60,7 @@ def render_kpi_card(
                 <div style='margin-left: 10px; font-size: 0.875rem;'>{trend_display}</div>
             </div>
             {f"<div style='color: #9CA3AF; font-size: 0.75rem; margin-top: 4px;'>{subtitle}</div>" if subtitle else ""}
-            {f"<div style='display: inline-block; background-color: #F3F4F6; color: #374151; font-size: 0.75rem; padding: 2px 8px; border-radius: 9999px; margin-top: 8px;'>{benchmark_percentile}th percentile</div>" if benchmark_percentile else ""}
+            {f"<div style='display: inline-block; background-color: #F3F4F6; color: #374151; font-size: 0.75rem; padding: 2px 8px; border-radius: 9999px; margin-top: 8px;'>{_ordinal(benchmark_percentile)} percentile</div>" if benchmark_percentile else ""}
         </div>
     """, unsafe_allow_html=True)
 
@@ -0,0 +1,43 @@
+import streamlit as st
+from typing import Literal, Optional
+
+def render_progress_bar(
+    label: str,
+    progress: float,
+    status: Literal["queued", "running", "appending", "done", "error"],
+    detail: Optional[str] = None
+):
+    """Renders a labelled progress bar for a background job."""
+
+    # 1. Colors and status text
+    color_map = {
+        'queued': '#9CA3AF', # Gray-400
+        'running': '#3B82F6', # Blue-500
+        'appending': '#6366F1', # Indigo-500
+        'done': '#10B981', # Emerald-500
+        'error': '#EF4444' # Red-500
+    }
+    text_map = {
+        'queued': 'Queued',
+        'running': 'Processing',
+        'appending': 'Adding to dataset',
+        'done': 'Complete',
+        'error': 'Failed'
+    }
+
+    color = color_map.get(status, '#9CA3AF')
+    percent = max(0.0, min(progress, 1.0)) * 100
+
+    # 2. Render HTML
+    st.markdown(f"""
+        <div style='margin-bottom: 12px;'>
+            <div style='display: flex; justify-content: space-between; font-size: 0.9em; margin-bottom: 4px;'>
+                <span style='font-weight: bold;'>{label}</span>
+                <span style='color: {color};'>{text_map.get(status, status)} · {percent:.0f}%</span>
+            </div>
+            <div style='background-color: #E5E7EB; border-radius: 4px; height: 8px; overflow: hidden;'>
+                <div style='background-color: {color}; width: {percent:.1f}%; height: 8px;'></div>
+            </div>
+            {f"<div style='font-size: 0.8em; color: #6B7280; margin-top: 4px;'>{detail}</div>" if detail else ""}
+        </div>
+    """, unsafe_allow_html=True)
@@ -101,3 +101,29 @@ CHART_THEME_COLORS = [
 
 # Payer Categories
 PAYER_CATEGORIES = ['Commercial', 'Medicare', 'Medicaid', 'Self-Pay', 'Blue Cross']
+
+# Payer names as they appear in claims data, with the spellings users type for them
+PAYER_ALIASES = {
+    'UnitedHealthcare': ['unitedhealthcare', 'united healthcare', 'united', 'uhc'],
+    'Aetna': ['aetna'],
+    'BCBS': ['bcbs', 'blue cross', 'blue cross blue shield', 'blue shield'],
+    'Medicare': ['medicare'],
+    'Medicaid': ['medicaid'],
+    'Self-Pay': ['self-pay', 'self pay', 'selfpay', 'uninsured']
+}
+
+# Extra phrasings for KPIs beyond their KPI_METADATA labels
+KPI_ALIASES = {
+    'net_collection_rate': ['collections', 'collection rate', 'net collections', 'ncr'],
+    'gross_collection_rate': ['gross collections'],
+    'days_in_ar': ['days in ar', 'ar days', 'a/r days', 'dar'],
+    'clean_claim_rate': ['clean claims', 'first pass rate', 'first-pass rate'],
+    'denial_rate': ['denials', 'denied', 'denial'],
+    'denial_overturn_rate': ['overturn', 'overturned', 'appeals won'],
+    'cost_to_collect': ['collection cost', 'cost to collect'],
+    'charge_lag': ['lag', 'charge lag'],
+    'ar_over_90_pct': ['ar over 90 days', 'a/r over 90 days', 'ar over 90', 'a/r over 90', 'over 90 days', 'aged ar', 'aging'],
+    'cash_as_pct_nr': ['cash as % of net revenue', 'cash to net revenue'],
+    'bad_debt_rate': ['bad debt', 'write-offs', 'write offs'],
+    'pos_collection_rate': ['pos collections', 'point of service', 'point-of-service', 'upfront collections']
+}
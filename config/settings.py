@@ -9,14 +9,25 @@ class Settings(BaseSettings):
     
     # API Keys
     anthropic_api_key: Optional[str] = None
+    anthropic_base_url: Optional[str] = None # Override for proxies or a local stub server
     
     # Data Settings
     google_sheet_id: Optional[str] = None
     csv_data_path: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'synthetic_hospital_data.csv')
+    load_chunk_rows: Optional[int] = 250_000 # Stream the claims CSV in chunks of this many rows; None parses it in one pass
+    load_partitions: Optional[str] = 'month' # Keep claims on disk by service 'month' or 'month_facility' for date-filtered reads; None disables
     cache_db_path: str = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'query_cache.db')
     
     # Agent Settings
     model_name: str = "claude-3-5-sonnet-20240620"
+
+    # LLM HTTP client (shared by all agent nodes)
+    llm_max_connections: int = 50 # Upper bound on concurrent requests per client
+    llm_max_keepalive_connections: int = 20
+    llm_keepalive_expiry_seconds: float = 60.0
+    llm_timeout_seconds: float = 60.0
+    llm_connect_timeout_seconds: float = 5.0
+    llm_max_retries: int = 3 # Backoff retries on 429/5xx/connection errors (honours retry-after)
     
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
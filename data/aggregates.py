@@ -0,0 +1,229 @@
+import pandas as pd
+import numpy as np
+from datetime import date, timedelta
+from typing import Dict, Any, Optional, List, Sequence, Union
+from .calculator import KPI_INPUTS, KPICalculator, kpis_from_totals, _as_datetime
+
+# Dimensions of the dashboard cube (in addition to service day)
+CUBE_DIMENSIONS = ('payer_name', 'facility', 'claim_status', 'cpt_code')
+
+# Additive components kept per cell; every KPI is a ratio of these
+COMPONENT_COLUMNS = ['claims', 'denied', 'unpaid', 'lag_sum', 'lag_count'] + KPICalculator.SUM_COLUMNS
+
+class KPIAggregates:
+    """
+    Mergeable KPI state: additive sums and counts per (service day, *dimensions) cell.
+
+    Cells are keyed at day grain so any date range (and the 90-day aging
+    cutoff) can be answered exactly; month and other rollups are sums of day
+    cells. Appending claims only aggregates the new rows and adds them into
+    the existing cells, so the cost scales with the batch, not the history.
+    """
+
+    def __init__(self, dimensions: Sequence[str] = ('payer_name', 'facility')):
+        self.dimensions = list(dimensions)
+        self.keys = ['service_date'] + self.dimensions
+        self.cells = pd.DataFrame(columns=self.keys + COMPONENT_COLUMNS)
+
+    @property
+    def cells(self) -> pd.DataFrame:
+        return self._cells
+
+    @cells.setter
+    def cells(self, cells: pd.DataFrame):
+        self._cells = cells
+        self._rows: Optional[Dict[tuple, int]] = None # Cell key -> row, built on the first update
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dimensions: Sequence[str] = ('payer_name', 'facility')) -> 'KPIAggregates':
+        """Builds the aggregate state from a claims frame."""
+        aggregates = cls(dimensions)
+        aggregates.cells = aggregates._aggregate(df)
+        return aggregates
+
+    def _aggregate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Reduces claim rows to cells. Rows with missing keys are kept as their own cell."""
+        work = pd.DataFrame(index=df.index)
+        work['service_date'] = _as_datetime(df['service_date']).dt.floor('D')
+        for dim in self.dimensions:
+            work[dim] = df[dim]
+
+        work['claims'] = 1
+        status = df['claim_status'] if 'claim_status' in df.columns else pd.Series(np.nan, index=df.index)
+        work['denied'] = (status == 'Denied').astype('int64')
+        work['unpaid'] = (status != 'Paid').astype('int64')
+        if 'charge_entry_date' in df.columns:
+            lag = (_as_datetime(df['charge_entry_date']) - work['service_date']).dt.days
+            work['lag_sum'] = lag.fillna(0)
+            work['lag_count'] = lag.notna().astype('int64')
+        else:
+            work['lag_sum'] = 0.0
+            work['lag_count'] = 0
+        for col in KPICalculator.SUM_COLUMNS:
+            work[col] = df[col].astype('float64') if col in df.columns else 0.0
+
+        cells = work.groupby(self.keys, observed=True, dropna=False, sort=False).sum()
+        return cells.reset_index()
+
+    def update(self, new_rows: pd.DataFrame) -> 'KPIAggregates':
+        """Adds a batch of newly arrived claims into the state (in place)."""
+        if not new_rows.empty:
+            self._add_cells(self._aggregate(new_rows))
+        return self
+
+    def merge(self, other: 'KPIAggregates') -> 'KPIAggregates':
+        """Returns the combination of two states over the same dimensions."""
+        if other.dimensions != self.dimensions:
+            raise ValueError(f"Cannot merge aggregates over {other.dimensions} into {self.dimensions}")
+        merged = KPIAggregates(self.dimensions)
+        merged.cells = self.cells.copy()
+        merged._add_cells(other.cells)
+        return merged
+
+    def _key_tuples(self, cells: pd.DataFrame) -> List[tuple]:
+        """Cell keys as hashable tuples; missing values become None so they match each other."""
+        columns = [cells[key].astype(object).where(cells[key].notna(), None).tolist() for key in self.keys]
+        return list(zip(*columns))
+
+    def _add_cells(self, new: pd.DataFrame):
+        """
+        Adds aggregated cells (unique keys) into the state: components of keys
+        already present are summed in place by row, new keys are appended.
+        Only the batch is looked up, so history is never regrouped.
+        """
+        if new.empty:
+            return
+        if self._cells.empty:
+            self.cells = new.copy()
+            return
+        if self._rows is None:
+            self._rows = {key: i for i, key in enumerate(self._key_tuples(self._cells))}
+        new_keys = self._key_tuples(new)
+        positions = np.array([self._rows.get(key, -1) for key in new_keys])
+        hit = positions >= 0
+
+        if hit.any():
+            rows = positions[hit]
+            for col in COMPONENT_COLUMNS:
+                j = self._cells.columns.get_loc(col)
+                self._cells.iloc[rows, j] = self._cells[col].to_numpy()[rows] + new[col].to_numpy()[hit]
+
+        if not hit.all():
+            fresh = new[~hit]
+            current = self._cells
+            # Dimension values are plain objects so categoricals with different categories can combine
+            for dim in self.dimensions:
+                if isinstance(current[dim].dtype, pd.CategoricalDtype):
+                    current[dim] = current[dim].astype(object)
+                if isinstance(fresh[dim].dtype, pd.CategoricalDtype):
+                    fresh = fresh.assign(**{dim: fresh[dim].astype(object)})
+            fresh_keys = [key for key, found in zip(new_keys, hit) if not found]
+            self._rows.update(zip(fresh_keys, range(len(current), len(current) + len(fresh_keys))))
+            self._cells = pd.concat([current, fresh], ignore_index=True)
+
+    def select(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        **dimension_filters: Any
+    ) -> pd.DataFrame:
+        """
+        Returns the cells inside an inclusive service-date range whose dimensions
+        match the filters (a scalar or a list of accepted values per dimension).
+        """
+        cells = self.cells
+        mask = np.ones(len(cells), dtype=bool)
+        if start_date is not None:
+            mask &= (cells['service_date'] >= pd.Timestamp(start_date)).to_numpy()
+        if end_date is not None:
+            mask &= (cells['service_date'] <= pd.Timestamp(end_date)).to_numpy()
+        for dim, accepted in dimension_filters.items():
+            if dim not in self.dimensions:
+                raise KeyError(f"Unknown aggregate dimension: {dim}")
+            values = accepted if isinstance(accepted, (list, tuple, set)) else [accepted]
+            mask &= cells[dim].isin(values).to_numpy()
+        return cells[mask]
+
+    def _totals(self, cells: pd.DataFrame, by: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Collapses cells into the totals expected by kpis_from_totals, either
+        overall (one row) or per group of `by` (dimensions or PERIOD_KEYS).
+        """
+        ninety_days_ago = pd.Timestamp(date.today() - timedelta(days=90))
+        work = cells[COMPONENT_COLUMNS].copy()
+        work['aged'] = cells['unpaid'].where(cells['service_date'] < ninety_days_ago, 0)
+        if by:
+            for key in by:
+                if key in KPICalculator.PERIOD_KEYS:
+                    work[key] = cells['service_date'].dt.to_period(KPICalculator.PERIOD_KEYS[key])
+                else:
+                    work[key] = cells[key]
+            sums = work.groupby(by, observed=True, sort=True).sum()
+        else:
+            sums = work.sum().to_frame().T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sums['lag'] = np.where(sums['lag_count'] > 0, sums['lag_sum'] / sums['lag_count'], np.nan)
+        return sums
+
+    def calculate(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        metrics: Optional[List[str]] = None,
+        **dimension_filters: Any
+    ) -> Dict[str, Any]:
+        """Answers KPIs for any filter combination from the cells (same output as calculate_all)."""
+        names = list(KPI_INPUTS) if metrics is None else [m for m in metrics if m in KPI_INPUTS]
+        cells = self.select(start_date, end_date, **dimension_filters)
+        if cells.empty:
+            return {name: None for name in names}
+        totals = self._totals(cells)
+        kpis = kpis_from_totals({col: totals[col].to_numpy() for col in totals.columns})
+        return {name: kpis[name][0] for name in names}
+
+    def calculate_grouped(
+        self,
+        by: Union[str, List[str]],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        **dimension_filters: Any
+    ) -> List[Dict[str, Any]]:
+        """Per-group KPIs from the cells, in the same shape as KPICalculator.calculate_grouped."""
+        keys = [by] if isinstance(by, str) else list(by)
+        cells = self.select(start_date, end_date, **dimension_filters)
+        if cells.empty:
+            return []
+        totals = self._totals(cells, keys)
+        kpis = kpis_from_totals({col: totals[col].to_numpy() for col in totals.columns})
+
+        results = []
+        for i, group_key in enumerate(totals.index):
+            row = {name: values[i] for name, values in kpis.items()}
+            group_values = group_key if isinstance(group_key, tuple) else (group_key,)
+            row.update({k: (str(v) if isinstance(v, pd.Period) else v) for k, v in zip(keys, group_values)})
+            results.append(row)
+        return results
+
+    def calculate_trends(
+        self,
+        months: int = 12,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        **dimension_filters: Any
+    ) -> List[Dict[str, Any]]:
+        """Monthly KPI trends from the cells, in the same shape as KPICalculator.calculate_trends."""
+        monthly_trends = self.calculate_grouped('month', start_date, end_date, **dimension_filters)[-months:]
+        for kpis in monthly_trends:
+            kpis['period'] = kpis.pop('month')
+        return monthly_trends
+
+    def count(
+        self,
+        by: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        **dimension_filters: Any
+    ) -> pd.Series:
+        """Claim counts per value of one dimension for the selected cells."""
+        cells = self.select(start_date, end_date, **dimension_filters)
+        return cells.groupby(by, observed=True)['claims'].sum()
@@ -0,0 +1,421 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Union, Iterable, Iterator
+from config.constants import KPI_METADATA, ANOMALY_THRESHOLDS
+from .aggregates import KPIAggregates, COMPONENT_COLUMNS
+from .calculator import kpi_arrays
+
+# KPIs that vary per period; mirrors (clean claim rate, cash as % NR), mocked
+# constants and the today-relative A/R aging are left out
+ANOMALY_METRICS = [
+    'denial_rate', 'net_collection_rate', 'gross_collection_rate', 'days_in_ar',
+    'charge_lag', 'bad_debt_rate', 'pos_collection_rate'
+]
+
+SEVERITY_ORDER = {'critical': 0, 'warning': 1, 'info': 2}
+
+class AnomalyDetector:
+    """
+    Flags unusual KPI values across every (dimension values, KPI) series at once.
+
+    Claims (or the KPI cube) are reduced to one (series x period) matrix per
+    additive component in a single grouped pass; KPI matrices are derived from
+    those. Each value is scored against three baselines built from earlier
+    periods only, all as NumPy operations over the whole matrix:
+    - rolling: mean/std of the previous `window` periods (cumulative sums)
+    - ewma: exponentially weighted mean/variance (one vector step per period)
+    - seasonal: same weekday over the previous `seasonal_lags` weeks (daily only)
+    A value is an anomaly when its z-score in the adverse direction (up for
+    inverse KPIs such as denial rate, down otherwise) reaches `z_threshold`
+    against every available baseline and, where ANOMALY_THRESHOLDS defines
+    one, the relative change from the baseline reaches it too.
+    """
+
+    def __init__(
+        self,
+        dimensions: Sequence[str] = ('payer_name', 'facility'),
+        metrics: Optional[List[str]] = None,
+        window: int = 12,
+        ewma_alpha: float = 0.1,
+        seasonal_lags: int = 4,
+        z_threshold: float = 3.5,
+        min_claims: int = 20,
+        min_periods: int = 4
+    ):
+        self.dimensions = list(dimensions)
+        self.metrics = [m for m in (metrics or ANOMALY_METRICS) if m in ANOMALY_METRICS] or list(ANOMALY_METRICS)
+        self.window = window
+        self.ewma_alpha = ewma_alpha
+        self.seasonal_lags = seasonal_lags
+        self.z_threshold = z_threshold
+        self.min_claims = min_claims # Periods with fewer claims are too noisy to score
+        self.min_periods = min_periods # Earlier observations needed before a baseline counts
+
+    def build_series(
+        self,
+        source: Union[pd.DataFrame, KPIAggregates],
+        freq: str = 'W'
+    ) -> Tuple[pd.DataFrame, pd.PeriodIndex, Dict[str, np.ndarray]]:
+        """
+        Returns (series keys, periods, component matrices). Row i of every
+        matrix is the series in keys.iloc[i]; column j is periods[j]. Empty
+        series/period cells are 0.
+        """
+        if isinstance(source, KPIAggregates):
+            missing = [d for d in self.dimensions if d not in source.dimensions]
+            if missing:
+                raise KeyError(f"Aggregates have no dimension(s): {missing}")
+            cells = source.cells
+        else:
+            cells = KPIAggregates.from_frame(source, self.dimensions).cells
+
+        # 1. One grouped pass: components per (series, period)
+        work = cells[self.dimensions + COMPONENT_COLUMNS].copy()
+        work['period'] = cells['service_date'].dt.to_period(freq)
+        for dim in self.dimensions:
+            if isinstance(work[dim].dtype, pd.CategoricalDtype):
+                work[dim] = work[dim].astype(object)
+        sums = work.groupby(self.dimensions + ['period'], sort=True).sum().reset_index()
+
+        # 2. Scatter into dense (series x period) matrices
+        series_codes = sums.groupby(self.dimensions, sort=True).ngroup().to_numpy()
+        keys = sums[self.dimensions].drop_duplicates().reset_index(drop=True)
+        if sums.empty:
+            return keys, pd.PeriodIndex([], freq=freq), {col: np.zeros((0, 0)) for col in COMPONENT_COLUMNS}
+        start, end = sums['period'].min(), sums['period'].max()
+        periods = pd.period_range(start, end, freq=freq)
+        period_codes = pd.PeriodIndex(sums['period']).asi8 - start.ordinal
+
+        shape = (len(keys), len(periods))
+        matrices = {}
+        for col in COMPONENT_COLUMNS:
+            matrix = np.zeros(shape)
+            matrix[series_codes, period_codes] = sums[col].to_numpy(dtype=np.float64)
+            matrices[col] = matrix
+        return keys, periods, matrices
+
+    def kpi_matrices(self, components: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """KPI values per (series, period); NaN where a period has fewer than min_claims claims."""
+        totals = dict(components)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            totals['lag'] = np.where(components['lag_count'] > 0, components['lag_sum'] / components['lag_count'], np.nan)
+        values = kpi_arrays(totals)
+        thin = components['claims'] < self.min_claims
+        return {m: np.where(thin, np.nan, values[m]) for m in self.metrics}
+
+    def _rolling_baseline(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Mean/std of the previous `window` valid values, via cumulative sums along time."""
+        valid = ~np.isnan(x)
+        filled = np.where(valid, x, 0.0)
+        pad = np.zeros((x.shape[0], 1))
+        csum = np.concatenate([pad, np.cumsum(filled, axis=1)], axis=1)
+        csq = np.concatenate([pad, np.cumsum(filled ** 2, axis=1)], axis=1)
+        cnt = np.concatenate([pad, np.cumsum(valid, axis=1)], axis=1)
+
+        t = np.arange(x.shape[1])
+        lo = np.maximum(t - self.window, 0)
+        n = cnt[:, t] - cnt[:, lo]
+        total = csum[:, t] - csum[:, lo]
+        total_sq = csq[:, t] - csq[:, lo]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = total / n
+            var = (total_sq - total * mean) / (n - 1)
+        enough = n >= self.min_periods
+        return np.where(enough, mean, np.nan), np.where(enough, np.sqrt(np.maximum(var, 0.0)), np.nan)
+
+    def _ewma_baseline(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """EWMA mean/std before each period; one vectorized update per period across all series."""
+        series, steps = x.shape
+        mean_out = np.full(x.shape, np.nan)
+        std_out = np.full(x.shape, np.nan)
+        mean = np.full(series, np.nan)
+        var = np.zeros(series)
+        seen = np.zeros(series)
+        alpha = self.ewma_alpha
+        for t in range(steps):
+            ready = seen >= self.min_periods
+            mean_out[:, t] = np.where(ready, mean, np.nan)
+            std_out[:, t] = np.where(ready, np.sqrt(var), np.nan)
+
+            value = x[:, t]
+            valid = ~np.isnan(value)
+            first = valid & np.isnan(mean)
+            diff = np.where(valid & ~first, value - mean, 0.0)
+            mean = np.where(first, value, mean + alpha * diff)
+            var = np.where(valid & ~first, (1 - alpha) * (var + alpha * diff ** 2), var)
+            seen += valid
+        return mean_out, std_out
+
+    def _seasonal_baseline(self, x: np.ndarray, period: int = 7) -> Tuple[np.ndarray, np.ndarray]:
+        """Mean/std of the same weekday over the previous `seasonal_lags` weeks (daily series)."""
+        lagged = np.full((self.seasonal_lags,) + x.shape, np.nan)
+        for k in range(1, self.seasonal_lags + 1):
+            shift = k * period
+            if shift < x.shape[1]:
+                lagged[k - 1, :, shift:] = x[:, :-shift]
+        n = np.sum(~np.isnan(lagged), axis=0)
+        enough = n >= min(self.min_periods, self.seasonal_lags)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = np.nansum(lagged, axis=0) / n
+            std = np.sqrt(np.nansum((lagged - mean) ** 2, axis=0) / (n - 1))
+        return np.where(enough, mean, np.nan), np.where(enough, std, np.nan)
+
+    def score(self, x: np.ndarray, metric: str, freq: str = 'W') -> Dict[str, np.ndarray]:
+        """
+        Scores one KPI matrix. Returns arrays (series x period): the adverse
+        z-score, the baseline it was measured against, the index of that
+        method (into the returned 'methods' list) and the anomaly flag.
+        """
+        baselines = {'rolling': self._rolling_baseline(x), 'ewma': self._ewma_baseline(x)}
+        if freq == 'D':
+            baselines['seasonal'] = self._seasonal_baseline(x)
+        direction = 1.0 if KPI_METADATA[metric]['is_inverse'] else -1.0
+
+        zs, means = [], []
+        for mean, std in baselines.values():
+            # Floor the spread so near-constant history does not turn tiny moves into huge z-scores
+            floor = 0.01 * np.abs(mean) + 1e-9
+            with np.errstate(invalid='ignore'):
+                z = direction * (x - mean) / np.maximum(std, floor)
+            zs.append(np.where(np.isnan(z), np.inf, z)) # A missing baseline does not veto
+            means.append(mean)
+        zs, means = np.stack(zs), np.stack(means)
+
+        # Every available baseline must agree: the weakest z-score decides
+        best = np.argmin(zs, axis=0)
+        z = np.take_along_axis(zs, best[None], axis=0)[0]
+        baseline = np.take_along_axis(means, best[None], axis=0)[0]
+
+        flagged = np.isfinite(z) & (z >= self.z_threshold)
+        relative_gate = ANOMALY_THRESHOLDS.get(metric)
+        if relative_gate is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                change = np.abs(x - baseline) / np.abs(baseline)
+            flagged &= change >= relative_gate
+        return {'z': z, 'baseline': baseline, 'method': best, 'flagged': flagged, 'methods': list(baselines)}
+
+    def detect(
+        self,
+        source: Union[pd.DataFrame, KPIAggregates],
+        freq: str = 'W',
+        lookback: int = 1,
+        **dimension_filters: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns anomalies in the last `lookback` periods, most severe first, in
+        the AgentState.anomalies shape. `dimension_filters` restrict the series
+        (a scalar or a list of accepted values per dimension).
+        """
+        keys, periods, components = self.build_series(source, freq)
+        if keys.empty:
+            return []
+
+        rows = np.ones(len(keys), dtype=bool)
+        for dim, accepted in dimension_filters.items():
+            if dim not in self.dimensions:
+                raise KeyError(f"Unknown anomaly dimension: {dim}")
+            values = accepted if isinstance(accepted, (list, tuple, set)) else [accepted]
+            rows &= keys[dim].isin(values).to_numpy()
+
+        anomalies = []
+        first_period = max(len(periods) - lookback, 0)
+        for metric, x in self.kpi_matrices(components).items():
+            scored = self.score(x, metric, freq)
+            hit_rows, hit_cols = np.nonzero(scored['flagged'][:, first_period:] & rows[:, None])
+            for i, j in zip(hit_rows, hit_cols + first_period):
+                anomalies.append(self._describe(metric, keys.iloc[i], periods[j], x[i, j], scored, i, j))
+
+        anomalies.sort(key=lambda a: (SEVERITY_ORDER[a['severity']], -a['z_score']))
+        return anomalies
+
+    def _describe(self, metric, key, period, value, scored, i, j) -> Dict[str, Any]:
+        z = float(scored['z'][i, j])
+        baseline = float(scored['baseline'][i, j])
+        change_pct = float((value - baseline) / abs(baseline) * 100) if baseline else 0.0
+        severity = 'critical' if z >= self.z_threshold + 2 else ('warning' if z >= self.z_threshold + 1 else 'info')
+        scope = " / ".join(str(key[d]) for d in self.dimensions)
+        starting = period.start_time.strftime('%Y-%m-%d')
+        return {
+            'metric': metric,
+            **{d: key[d] for d in self.dimensions},
+            'period': starting, # First day of the period
+            'value': round(float(value), 1),
+            'baseline': round(baseline, 1),
+            'change_pct': round(change_pct, 1),
+            'z_score': round(z, 2),
+            'method': scored['methods'][scored['method'][i, j]],
+            'severity': severity,
+            'message': f"{scope}: {value:.1f} vs baseline {baseline:.1f} ({change_pct:+.1f}%) in the period from {starting}"
+        }
+
+# Per-claim observations the streaming detector tracks (claim-level means of these are the KPIs)
+STREAM_METRICS = ['denial_rate', 'charge_lag']
+
+def claim_observations(claims: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """One value per claim and stream metric (NaN when a claim does not report it)."""
+    observations = {}
+    if 'claim_status' in claims.columns:
+        status = claims['claim_status']
+        observations['denial_rate'] = np.where(status.isna(), np.nan, np.where(status == 'Denied', 100.0, 0.0))
+    if 'charge_entry_date' in claims.columns and 'service_date' in claims.columns:
+        lag = pd.to_datetime(claims['charge_entry_date']) - pd.to_datetime(claims['service_date']).dt.floor('D')
+        observations['charge_lag'] = lag.dt.days.to_numpy(dtype=np.float64, na_value=np.nan)
+    return observations
+
+class SeriesStats:
+    """Running state of one stream series: Welford mean/variance, EWMA level and one-sided CUSUM."""
+    __slots__ = ('n', 'mean', 'm2', 'ewma', 'cusum', 'alarm')
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0 # Sum of squared deviations from the mean
+        self.ewma = 0.0
+        self.cusum = 0.0
+        self.alarm = False # Set on an alert, cleared once the level is back near the baseline
+
+    def update(self, x: float):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, n: int, mean: float, m2: float):
+        """Folds in the statistics of another batch of observations (Chan et al.)."""
+        total = self.n + n
+        delta = mean - self.mean
+        self.m2 += m2 + delta ** 2 * self.n * n / total
+        self.mean += delta * n / total
+        self.n = total
+        self.ewma = self.mean
+
+    @property
+    def std(self) -> float:
+        return (self.m2 / (self.n - 1)) ** 0.5 if self.n > 1 else 0.0
+
+class StreamingAnomalyDetector:
+    """
+    Online counterpart of AnomalyDetector: claims are consumed as they arrive
+    and alerts are emitted on the claim that trips a threshold, so a spike is
+    caught the same day rather than at the next batch scan.
+
+    Each (metric, dimension values) series keeps O(1) state (SeriesStats).
+    Every claim is compared with the series' long-run Welford baseline before
+    being folded into it:
+    - CUSUM accumulates adverse standardized deviations beyond `cusum_k` and
+      alerts above `cusum_h` (quick on sustained shifts)
+    - the EWMA level alerts when it sits `ewma_limit` of its own standard
+      errors from the baseline
+    After an alert the series stays quiet until its EWMA returns to within
+    one standard error of the baseline. Series start alerting once they have
+    `min_observations` claims (see warm_up to seed them from history).
+
+    Per-claim denial indicators are far from normal, so the limits are wider
+    than textbook values: at a 4% denial rate the defaults give about one
+    false alert per 14,000 claims and catch a jump to 20% within ~30 claims.
+    """
+
+    def __init__(
+        self,
+        dimensions: Sequence[str] = ('payer_name',),
+        metrics: Optional[List[str]] = None,
+        ewma_alpha: float = 0.02,
+        ewma_limit: float = 4.0,
+        cusum_k: float = 1.0,
+        cusum_h: float = 20.0,
+        min_observations: int = 100
+    ):
+        self.dimensions = list(dimensions)
+        self.metrics = [m for m in (metrics or STREAM_METRICS) if m in STREAM_METRICS] or list(STREAM_METRICS)
+        self.ewma_alpha = ewma_alpha
+        self.ewma_limit = ewma_limit
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.min_observations = min_observations
+        self.series: Dict[Tuple, SeriesStats] = {} # (metric, *dimension values) -> state
+        self._ewma_scale = (ewma_alpha / (2 - ewma_alpha)) ** 0.5 # EWMA std / observation std
+
+    def warm_up(self, history: pd.DataFrame) -> 'StreamingAnomalyDetector':
+        """Seeds the series statistics from past claims in one grouped pass (no alerts)."""
+        if history.empty:
+            return self
+        keys = history[self.dimensions].astype(object)
+        for metric, values in claim_observations(history).items():
+            if metric not in self.metrics:
+                continue
+            work = keys.assign(x=values).dropna(subset=['x'])
+            grouped = work.groupby(self.dimensions, dropna=False)['x']
+            stats = pd.DataFrame({'n': grouped.count(), 'mean': grouped.mean(), 'var': grouped.var(ddof=0)})
+            for key, row in stats.iterrows():
+                key = key if isinstance(key, tuple) else (key,)
+                state = self.series.setdefault((metric,) + key, SeriesStats())
+                state.merge(int(row['n']), row['mean'], row['var'] * row['n'])
+        return self
+
+    def ingest(self, claims: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Consumes a batch of claims in arrival order; returns the alerts it tripped, in order."""
+        if claims.empty:
+            return []
+        keys = list(zip(*(claims[d].astype(object) for d in self.dimensions)))
+        dates = pd.to_datetime(claims['service_date']).to_numpy() if 'service_date' in claims.columns else None
+        tracked = [(m, v.tolist(), 1.0 if KPI_METADATA[m]['is_inverse'] else -1.0)
+                   for m, v in claim_observations(claims).items() if m in self.metrics]
+        alerts = []
+        for i, key in enumerate(keys):
+            for metric, values, direction in tracked:
+                x = values[i]
+                if x != x: # NaN
+                    continue
+                alert = self._observe(metric, key, x, direction)
+                if alert is not None:
+                    alerts.append(self._describe(metric, key, alert, dates[i] if dates is not None else None))
+        return alerts
+
+    def run(self, stream: Iterable[pd.DataFrame]) -> Iterator[Dict[str, Any]]:
+        """Consumes batches from a generator, yielding each batch's alerts before reading the next."""
+        for batch in stream:
+            yield from self.ingest(batch)
+
+    def _observe(self, metric: str, key: Tuple, x: float, direction: float) -> Optional[Tuple[str, float, float, float]]:
+        state = self.series.get((metric,) + key)
+        if state is None:
+            state = self.series[(metric,) + key] = SeriesStats()
+            state.ewma = x
+
+        alert = None
+        if state.n >= self.min_observations:
+            # Floor the spread so a near-constant history does not alert on tiny moves
+            sigma = max(state.std, 0.01 * abs(state.mean) + 1e-9)
+            z = direction * (x - state.mean) / sigma
+            state.cusum = max(0.0, state.cusum + z - self.cusum_k)
+            state.ewma += self.ewma_alpha * (x - state.ewma)
+            ewma_z = direction * (state.ewma - state.mean) / (sigma * self._ewma_scale)
+            if state.alarm:
+                state.alarm = ewma_z >= 1.0
+            elif state.cusum > self.cusum_h or ewma_z >= self.ewma_limit:
+                method = 'cusum' if state.cusum > self.cusum_h else 'ewma'
+                alert = (method, state.ewma, state.mean, ewma_z)
+                state.alarm = True
+                state.cusum = 0.0
+        else:
+            state.ewma += self.ewma_alpha * (x - state.ewma)
+        state.update(x)
+        return alert
+
+    def _describe(self, metric: str, key: Tuple, alert: Tuple[str, float, float, float], service_date) -> Dict[str, Any]:
+        method, value, baseline, z = alert
+        change_pct = (value - baseline) / abs(baseline) * 100 if baseline else 0.0
+        day = pd.Timestamp(service_date).strftime('%Y-%m-%d') if service_date is not None and pd.notna(service_date) else None
+        scope = " / ".join(str(k) for k in key)
+        return {
+            'metric': metric,
+            **dict(zip(self.dimensions, key)),
+            'period': day, # Service date of the claim that tripped the alert
+            'value': round(value, 1),
+            'baseline': round(baseline, 1),
+            'change_pct': round(change_pct, 1),
+            'z_score': round(z, 2),
+            'method': method,
+            'severity': 'critical' if z >= self.ewma_limit + 2 else 'warning',
+            'message': f"{scope}: running {value:.1f} vs baseline {baseline:.1f} ({change_pct:+.1f}%)" + (f" as of {day}" if day else "")
+        }
@@ -1,45 +1,224 @@
-from typing import Dict, Any, Optional
+import os
+import json
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional, List, Tuple
+from config.constants import KPI_METADATA
+
+BENCHMARK_PROFILES_PATH = os.path.join(os.path.dirname(__file__), 'benchmark_profiles.json')
+
+# Benchmark anchors, in the order percentile ranks are interpolated between
+PERCENTILE_KEYS = ['25th', '50th', '75th', '90th']
+PERCENTILES = np.array([25.0, 50.0, 75.0, 90.0])
+
+# Status by number of anchors met (below 25th, 25th, 50th, 75th, 90th)
+STATUS_BY_ANCHORS = np.array(["🔴", "🔴", "⚠️", "✅", "🌟"])
+
+# Bed bands and the first bed count of each
+BED_BANDS = ['1-99', '100-249', '250-499', '500+']
+BED_BAND_STARTS = np.array([1, 100, 250, 500])
+
+PROFILE_KEYS = ['hospital_type', 'bed_band', 'region', 'year']
+DEFAULT_HOSPITAL_TYPE = 'community'
+DEFAULT_REGION = 'Global'
+
+def bed_band(bed_count: int) -> str:
+    """Maps a bed count to its band label ("100-249", ...)."""
+    return BED_BANDS[max(int(np.searchsorted(BED_BAND_STARTS, bed_count, side='right')) - 1, 0)]
+
+def interpolate_percentiles(values: np.ndarray, anchors: np.ndarray, inverse: np.ndarray) -> np.ndarray:
+    """
+    Interpolated percentile (1-99) of KPI values against 25/50/75/90th anchors.
+
+    values (..., metrics) and anchors (..., metrics, 4) broadcast against each
+    other, so one call ranks a table against one profile or one set of KPIs
+    against many profiles. Inverse KPIs are sign-flipped so higher is always
+    better; ranks are linear between anchors and extrapolate along the outer
+    segments. NaN values stay NaN.
+    """
+    sign = np.where(inverse, -1.0, 1.0)
+    x = np.asarray(values, dtype=np.float64) * sign
+    oriented = np.asarray(anchors, dtype=np.float64) * sign[:, None]
+
+    # Segment between anchors i-1 and i, with the outer segments extended
+    upper = np.clip((x[..., None] >= oriented).sum(axis=-1), 1, 3)
+    oriented = np.broadcast_to(oriented, upper.shape + (4,))
+    low = np.take_along_axis(oriented, (upper - 1)[..., None], axis=-1)[..., 0]
+    high = np.take_along_axis(oriented, upper[..., None], axis=-1)[..., 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ranks = PERCENTILES[upper - 1] + (x - low) / (high - low) * (PERCENTILES[upper] - PERCENTILES[upper - 1])
+    return np.clip(ranks, 1.0, 99.0)
+
+class BenchmarkStore:
+    """
+    Every benchmark profile (hospital type x bed band x region x year) from
+    the versioned profiles file, as one (profiles x metrics x anchors) array.
+
+    The file is read lazily on first use and kept for the life of the
+    process; all sessions share the module-level `benchmark_store`. Profiles
+    are indexed by key for O(1) lookup, and by (type, band, region) for the
+    nearest-profile fallback when an exact combination is not published.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or BENCHMARK_PROFILES_PATH
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.version: Optional[str] = None
+        self.source: Optional[str] = None # Provenance note for the file
+        self.metrics: List[str] = []
+        self.profiles = pd.DataFrame(columns=PROFILE_KEYS)
+        self.anchors = np.zeros((0, 0, 4))
+        self.inverse = np.zeros(0, dtype=bool) # Per metric: lower is better
+        self._index: Dict[Tuple, int] = {}
+        self._sources: List[Optional[str]] = [] # Per profile; None for illustrative (unpublished) profiles
+        self._years: Dict[Tuple[str, str, str], List[int]] = {}
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load()
+                self._loaded = True
+
+    def _load(self):
+        with open(self.path) as f:
+            doc = json.load(f)
+        if doc['anchors'] != PERCENTILE_KEYS:
+            raise ValueError(f"Benchmark file {self.path} has anchors {doc['anchors']}, expected {PERCENTILE_KEYS}")
+        self.version = doc['version']
+        self.source = doc.get('source')
+        self._sources = [p.get('source') for p in doc['profiles']]
+        self.metrics = list(doc['metrics'])
+        self.profiles = pd.DataFrame([{k: p[k] for k in PROFILE_KEYS} for p in doc['profiles']], columns=PROFILE_KEYS)
+        self.anchors = np.array([p['values'] for p in doc['profiles']], dtype=np.float64).reshape(len(self.profiles), len(self.metrics), 4)
+        self.inverse = np.array([KPI_METADATA[m]['is_inverse'] for m in self.metrics])
+
+        self._index = {key: i for i, key in enumerate(self.profiles.itertuples(index=False, name=None))}
+        years: Dict[Tuple[str, str, str], List[int]] = {}
+        for hospital_type, band, region, year in self._index:
+            years.setdefault((hospital_type, band, region), []).append(year)
+        self._years = {group: sorted(found) for group, found in years.items()}
+
+    def resolve(
+        self,
+        hospital_type: str = DEFAULT_HOSPITAL_TYPE,
+        bed_count: Optional[int] = None,
+        region: str = DEFAULT_REGION,
+        year: Optional[int] = None,
+        band: Optional[str] = None
+    ) -> Tuple[str, str, str, int]:
+        """
+        Returns the key of the requested profile, or of the nearest published
+        one: the closest year (latest when none is given), then the Global
+        region, then the nearest bed band, then community hospitals.
+        """
+        self._ensure_loaded()
+        hospital_type = (hospital_type or DEFAULT_HOSPITAL_TYPE).lower()
+        band = band or (bed_band(bed_count) if bed_count is not None else BED_BANDS[1])
+        position = BED_BANDS.index(band)
+        bands = sorted(BED_BANDS, key=lambda b: abs(BED_BANDS.index(b) - position))
+
+        for candidate_type in dict.fromkeys([hospital_type, DEFAULT_HOSPITAL_TYPE]):
+            for candidate_band in bands:
+                for candidate_region in dict.fromkeys([region or DEFAULT_REGION, DEFAULT_REGION]):
+                    years = self._years.get((candidate_type, candidate_band, candidate_region))
+                    if years:
+                        chosen = years[-1] if year is None else min(reversed(years), key=lambda y: abs(y - year))
+                        return candidate_type, candidate_band, candidate_region, chosen
+        raise KeyError(f"No benchmark profile for {hospital_type} / {band} / {region}")
+
+    def years(self) -> List[int]:
+        """Published benchmark years, latest first."""
+        self._ensure_loaded()
+        return sorted({year for _, _, _, year in self._index}, reverse=True)
+
+    def index_of(self, profile: Tuple[str, str, str, int]) -> int:
+        """Row of a profile key (as returned by resolve) in `profiles` and `anchors`."""
+        self._ensure_loaded()
+        return self._index[profile]
+
+    def profile_source(self, profile: Tuple[str, str, str, int]) -> Optional[str]:
+        """Published source of a profile, or None when its values are illustrative."""
+        return self._sources[self.index_of(profile)]
+
+    def get_benchmarks(self, profile: Tuple[str, str, str, int]) -> Dict[str, Dict[str, float]]:
+        """Anchors of one profile as {metric: {'25th': .., '50th': .., '75th': .., '90th': ..}}."""
+        anchors = self.anchors[self.index_of(profile)]
+        return {m: dict(zip(PERCENTILE_KEYS, anchors[j].tolist())) for j, m in enumerate(self.metrics)}
+
+    def compare_all(self, kpis: Dict[str, float]) -> pd.DataFrame:
+        """
+        Percentile rank of one set of KPI values against every profile at once,
+        for peer-group analysis: one row per profile (indexed by PROFILE_KEYS),
+        one column per benchmarked KPI present in `kpis`.
+        """
+        self._ensure_loaded()
+        columns = [j for j, m in enumerate(self.metrics) if m in kpis]
+        values = np.array([kpis[self.metrics[j]] for j in columns], dtype=np.float64)
+        ranks = interpolate_percentiles(values, self.anchors[:, columns], self.inverse[columns])
+        return pd.DataFrame(ranks, index=pd.MultiIndex.from_frame(self.profiles), columns=[self.metrics[j] for j in columns])
+
+# Shared by all sessions; the profiles file is read on first use
+benchmark_store = BenchmarkStore()
 
 class BenchmarkData:
-    """Provides industry benchmark data for revenue cycle KPIs."""
-
-    def __init__(self):
-        # HFMA 2024 medians for community hospitals (100-249 beds)
-        # From TRD Appendix B
-        self.benchmarks = {
-            'net_collection_rate': {'25th': 94.5, '50th': 96.0, '75th': 97.8, '90th': 98.5},
-            'gross_collection_rate': {'25th': 40.0, '50th': 48.0, '75th': 55.0, '90th': 60.0},
-            'days_in_ar': {'25th': 48.0, '50th': 42.0, '75th': 36.0, '90th': 32.0},
-            'clean_claim_rate': {'25th': 88.0, '50th': 92.0, '75th': 95.5, '90th': 97.0},
-            'denial_rate': {'25th': 12.0, '50th': 9.5, '75th': 7.0, '90th': 5.5},
-            'cost_to_collect': {'25th': 0.060, '50th': 0.045, '75th': 0.038, '90th': 0.032},
-            'ar_over_90_pct': {'25th': 25.0, '50th': 20.0, '75th': 15.0, '90th': 12.0},
-            'charge_lag': {'25th': 4.5, '50th': 3.0, '75th': 2.0, '90th': 1.5},
-            'bad_debt_rate': {'25th': 5.0, '50th': 3.5, '75th': 2.0, '90th': 1.2},
-            'pos_collection_rate': {'25th': 50.0, '50th': 65.0, '75th': 75.0, '90th': 85.0}
-        }
-
-    def get_benchmarks(self, hospital_type: str = "community", bed_count: int = 200) -> Dict[str, Any]:
-        """Returns benchmark comparison for given hospital profile."""
-        # For now, we only have one set of benchmarks. In V2, we can add more profiles.
-        return self.benchmarks
+    """Provides industry benchmark data for revenue cycle KPIs, for one hospital profile."""
+
+    def __init__(
+        self,
+        hospital_type: str = DEFAULT_HOSPITAL_TYPE,
+        bed_count: int = 200,
+        region: str = DEFAULT_REGION,
+        year: Optional[int] = None,
+        band: Optional[str] = None,
+        store: Optional[BenchmarkStore] = None
+    ):
+        # Defaults are HFMA 2024 medians for community hospitals (100-249 beds), TRD Appendix B
+        self.store = store or benchmark_store
+        self.profile = self.store.resolve(hospital_type, bed_count, region, year, band)
+        self._anchors = self.store.anchors[self.store.index_of(self.profile)]
+        self.benchmarks = self.store.get_benchmarks(self.profile)
+
+    def get_benchmarks(
+        self,
+        hospital_type: str = DEFAULT_HOSPITAL_TYPE,
+        bed_count: int = 200,
+        region: str = DEFAULT_REGION,
+        year: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Returns benchmark anchors for the given hospital profile (or its nearest published one)."""
+        return self.store.get_benchmarks(self.store.resolve(hospital_type, bed_count, region, year))
+
+    def _columns(self, metrics: List[str]) -> List[int]:
+        return [self.store.metrics.index(m) for m in metrics]
+
+    def percentile_ranks(self, kpis: pd.DataFrame) -> pd.DataFrame:
+        """
+        Interpolated benchmark percentile (1-99) for every cell of a KPI table:
+        rows are any grouping (payers, facilities, months, ...), columns are KPI
+        slugs. Columns without benchmarks are dropped; missing values stay NaN.
+        """
+        metrics = [m for m in kpis.columns if m in self.benchmarks]
+        columns = self._columns(metrics)
+        values = kpis[metrics].to_numpy(dtype=np.float64, na_value=np.nan)
+        ranks = interpolate_percentiles(values, self._anchors[columns], self.store.inverse[columns])
+        return pd.DataFrame(ranks, index=kpis.index, columns=metrics)
+
+    def percentile_rank(self, metric: str, value: float) -> Optional[float]:
+        """Interpolated benchmark percentile of one KPI value, or None without a benchmark."""
+        if metric not in self.benchmarks:
+            return None
+        rank = self.percentile_ranks(pd.DataFrame({metric: [value]}))[metric].iloc[0]
+        return None if np.isnan(rank) else float(rank)
 
     def get_benchmark_status(self, metric: str, value: float) -> str:
         """Compares value against benchmark and returns status emoji."""
-        b = self.benchmarks.get(metric)
-        if not b:
-             return "⚪"
-             
-        # "Good" direction is up for some, down for others
-        inverse_metrics = ['denial_rate', 'days_in_ar', 'cost_to_collect', 'ar_over_90_pct', 'charge_lag', 'bad_debt_rate']
-        
-        if metric in inverse_metrics:
-            if value <= b['90th']: return "🌟"
-            if value <= b['75th']: return "✅"
-            if value <= b['50th']: return "⚠️"
-            return "🔴"
-        else:
-            if value >= b['90th']: return "🌟"
-            if value >= b['75th']: return "✅"
-            if value >= b['50th']: return "⚠️"
-            return "🔴"
+        if metric not in self.benchmarks:
+            return "⚪"
+        j = self.store.metrics.index(metric)
+        sign = -1.0 if self.store.inverse[j] else 1.0
+        met = int((value * sign >= self._anchors[j] * sign).sum())
+        return str(STATUS_BY_ANCHORS[met])
@@ -2,30 +2,82 @@ import sqlite3
 import json
 import hashlib
 import os
-from datetime import datetime, timedelta
-from typing import Optional, Any
+import time
+import logging
+import copy
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Any, Dict, Tuple
+
+logger = logging.getLogger(__name__)
 
 class QueryCache:
-    """SQLite-based query result cache with TTL."""
+    """
+    SQLite-based query result cache with TTL.
+
+    Each thread keeps one pooled connection (WAL journal, relaxed fsync), rows
+    carry an absolute `expires_at` so reads never delete, and a background
+    sweeper removes expired rows with a single indexed range delete.
+    """
 
-    def __init__(self, db_path: Optional[str] = None):
+    PRAGMAS = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-8000", # ~8 MB page cache per connection
+    ]
+
+    def __init__(self, db_path: Optional[str] = None, expiry_interval: Optional[float] = 60.0):
+        """expiry_interval: seconds between background expiry sweeps (None disables the sweeper)."""
         if db_path is None:
             db_path = os.path.join(os.path.dirname(__file__), 'query_cache.db')
         self.db_path = db_path
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
         self._init_db()
 
+        self._stop = threading.Event()
+        self._sweeper = None
+        if expiry_interval:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, args=(expiry_interval,), name="query-cache-expiry", daemon=True
+            )
+            self._sweeper.start()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Returns this thread's pooled connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+
     def _init_db(self):
         """Initializes the database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS query_cache (
-                    id TEXT PRIMARY KEY,
-                    query_text TEXT NOT NULL,
-                    result_json TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    ttl_seconds INTEGER DEFAULT 900
-                )
-            """)
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS query_cache (
+                id TEXT PRIMARY KEY,
+                query_text TEXT NOT NULL,
+                result_json TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                ttl_seconds INTEGER DEFAULT 900,
+                expires_at REAL NOT NULL DEFAULT 0
+            )
+        """)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(query_cache)")}
+        if 'expires_at' not in columns:
+            # Caches written before expires_at existed are simply treated as expired
+            conn.execute("ALTER TABLE query_cache ADD COLUMN expires_at REAL NOT NULL DEFAULT 0")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_query_cache_expires_at ON query_cache (expires_at)")
+
+    def _count(self, stat: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[stat] += n
 
     def _generate_id(self, query_text: str, filters: dict) -> str:
         """Generates a SHA256 hash for a query and its filters."""
@@ -34,41 +86,156 @@ class QueryCache:
 
     def get(self, query_text: str, filters: dict) -> Optional[Any]:
         """Retrieves a cached result if valid and not expired."""
-        cache_id = self._generate_id(query_text, filters)
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT result_json, created_at, ttl_seconds 
-                FROM query_cache 
-                WHERE id = ?
-            """, (cache_id,))
-            row = cursor.fetchone()
-            
-            if row:
-                result_json, created_at, ttl_seconds = row
-                created_dt = datetime.fromisoformat(created_at)
-                if datetime.now() < created_dt + timedelta(seconds=ttl_seconds):
-                    return json.loads(result_json)
-                else:
-                    self.delete(cache_id)
+        entry = self.get_entry(self._generate_id(query_text, filters))
+        return entry[0] if entry else None
+
+    def get_entry(self, cache_id: str) -> Optional[Tuple[Any, float, int]]:
+        """Returns (result, expires_at, size in bytes) for a live entry, or None."""
+        row = self._connection().execute(
+            "SELECT result_json, expires_at FROM query_cache WHERE id = ? AND expires_at > ?",
+            (cache_id, time.time())
+        ).fetchone()
+        if row:
+            self._count('hits')
+            return json.loads(row[0]), row[1], len(row[0])
+        self._count('misses')
         return None
 
-    def set(self, query_text: str, filters: dict, result: Any, ttl_seconds: int = 900):
-        """Stores a result in the cache."""
+    def set(self, query_text: str, filters: dict, result: Any, ttl_seconds: int = 900) -> Tuple[float, int]:
+        """Stores a result in the cache. Returns (expires_at, size in bytes)."""
         cache_id = self._generate_id(query_text, filters)
         result_json = json.dumps(result)
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO query_cache (id, query_text, result_json, created_at, ttl_seconds)
-                VALUES (?, ?, ?, ?, ?)
-            """, (cache_id, query_text, result_json, datetime.now().isoformat(), ttl_seconds))
+        expires_at = time.time() + ttl_seconds
+        self._connection().execute("""
+            INSERT OR REPLACE INTO query_cache (id, query_text, result_json, created_at, ttl_seconds, expires_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (cache_id, query_text, result_json, datetime.now().isoformat(), ttl_seconds, expires_at))
+        return expires_at, len(result_json)
 
     def delete(self, cache_id: str):
         """Deletes an entry from the cache."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM query_cache WHERE id = ?", (cache_id,))
+        self._connection().execute("DELETE FROM query_cache WHERE id = ?", (cache_id,))
 
     def clear(self):
         """Clears the entire cache."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM query_cache")
+        self._connection().execute("DELETE FROM query_cache")
+
+    def purge_expired(self) -> int:
+        """Deletes every expired row in one range delete. Returns the number removed."""
+        removed = self._connection().execute(
+            "DELETE FROM query_cache WHERE expires_at <= ?", (time.time(),)
+        ).rowcount
+        if removed:
+            self._count('evictions', removed)
+        return removed
+
+    def _sweep_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.purge_expired()
+            except sqlite3.Error as e:
+                logger.warning(f"Query cache expiry sweep failed: {str(e)}")
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss/eviction counters since this cache was created."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def close(self):
+        """Stops the expiry sweeper and closes the calling thread's connection."""
+        self._stop.set()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+class TieredQueryCache:
+    """
+    Two-tier query cache: a byte-bounded in-process LRU in front of QueryCache.
+
+    Hot entries are served from memory without a SQLite round-trip or JSON
+    decode. set() writes through to both tiers, SQLite hits are promoted into
+    memory with their original expiry, and delete()/clear() invalidate both.
+    Callers get a copy of the cached value, so mutating it is safe.
+    """
+
+    def __init__(self, store: Optional[QueryCache] = None, max_bytes: int = 8 * 1024 * 1024):
+        """max_bytes: budget for the memory tier, measured as JSON-encoded result size."""
+        self.store = store or QueryCache()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict() # id -> (result, expires_at, size)
+        self._bytes = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    def _remember(self, cache_id: str, result: Any, expires_at: float, size: int):
+        """Inserts into the memory tier and evicts least recently used entries over budget. Caller holds the lock."""
+        # Drop any previous value first, so an oversized overwrite is not shadowed by the stale one
+        self._forget(cache_id)
+        if size > self.max_bytes:
+            return
+        self._entries[cache_id] = (result, expires_at, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self._stats['evictions'] += 1
+
+    def _forget(self, cache_id: str):
+        entry = self._entries.pop(cache_id, None)
+        if entry:
+            self._bytes -= entry[2]
+
+    def get(self, query_text: str, filters: dict) -> Optional[Any]:
+        """Retrieves a cached result from memory, falling back to (and promoting from) SQLite."""
+        cache_id = self.store._generate_id(query_text, filters)
+        with self._lock:
+            entry = self._entries.get(cache_id)
+            if entry is not None:
+                if entry[1] > time.time():
+                    self._entries.move_to_end(cache_id)
+                    self._stats['hits'] += 1
+                    return copy.deepcopy(entry[0])
+                self._forget(cache_id)
+                self._stats['expirations'] += 1
+            self._stats['misses'] += 1
+
+        entry = self.store.get_entry(cache_id)
+        if entry is None:
+            return None
+        result, expires_at, size = entry
+        with self._lock:
+            self._remember(cache_id, result, expires_at, size)
+        return copy.deepcopy(result)
+
+    def set(self, query_text: str, filters: dict, result: Any, ttl_seconds: int = 900):
+        """Writes through to SQLite and the memory tier."""
+        expires_at, size = self.store.set(query_text, filters, result, ttl_seconds)
+        cache_id = self.store._generate_id(query_text, filters)
+        with self._lock:
+            self._remember(cache_id, copy.deepcopy(result), expires_at, size)
+
+    def delete(self, cache_id: str):
+        """Deletes an entry from both tiers."""
+        with self._lock:
+            self._forget(cache_id)
+        self.store.delete(cache_id)
+
+    def clear(self):
+        """Clears both tiers."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        self.store.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns counters per tier plus memory-tier occupancy."""
+        with self._lock:
+            memory = {**self._stats, 'entries': len(self._entries), 'bytes': self._bytes}
+        return {'memory': memory, 'sqlite': self.store.stats()}
+
+    def close(self):
+        self.store.close()
@@ -1,131 +1,177 @@
 import pandas as pd
 import numpy as np
 from datetime import date, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Union
+
+# Per-row inputs each KPI is derived from (see KPICalculator._totals)
+KPI_INPUTS = {
+    'net_collection_rate': ['payments', 'allowed_amount'],
+    'gross_collection_rate': ['payments', 'charges'],
+    'days_in_ar': ['charges', 'payments', 'adjustments'],
+    'clean_claim_rate': ['denied'],
+    'denial_rate': ['denied'],
+    'denial_overturn_rate': ['denied'],
+    'cost_to_collect': [],
+    'charge_lag': ['lag'],
+    'ar_over_90_pct': ['aged'],
+    'cash_as_pct_nr': ['payments', 'allowed_amount'],
+    'bad_debt_rate': ['adjustments', 'allowed_amount'],
+    'pos_collection_rate': ['pos_collections', 'patient_responsibility']
+}
+
+def _as_datetime(series: pd.Series) -> pd.Series:
+    """Returns a datetime64 view of a date column without re-parsing typed columns."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    return pd.to_datetime(series)
+
+def kpi_arrays(totals: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Applies the KPI formulas to arrays of totals of any shape (one element per
+    group), returning unrounded float64 arrays of the same shape.
+
+    Ratios are 0 when the denominator is not positive; inputs absent from
+    `totals` count as 0 (charge lag falls back to 0 as well).
+    """
+    claims = np.asarray(totals['claims'], dtype=np.float64)
+    zeros = np.zeros_like(claims)
+
+    def col(name):
+        return np.asarray(totals[name], dtype=np.float64) if name in totals else zeros
+
+    def ratio(num, den, scale=100):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(den > 0, num / den * scale, 0.0)
+
+    payments, allowed, charges = col('payments'), col('allowed_amount'), col('charges')
+    adjustments, denied = col('adjustments'), col('denied')
+    avg_daily_revenue = np.where(charges > 0, charges / 365, 0.0) # Simplified
+
+    return {
+        'net_collection_rate': ratio(payments, allowed),
+        'gross_collection_rate': ratio(payments, charges),
+        'days_in_ar': ratio(charges - payments - adjustments, avg_daily_revenue, scale=1),
+        'clean_claim_rate': ratio(claims - denied, claims),
+        'denial_rate': ratio(denied, claims),
+        'denial_overturn_rate': ratio(denied * 0.44, denied), # Mocked constant
+        'cost_to_collect': np.full_like(claims, 0.042), # Mocked constant per TRD
+        'charge_lag': col('lag'),
+        'ar_over_90_pct': ratio(col('aged'), claims),
+        'cash_as_pct_nr': ratio(payments, allowed),
+        'bad_debt_rate': ratio(adjustments * 0.05, allowed), # Mocked as portion of adjustments
+        'pos_collection_rate': ratio(col('pos_collections'), col('patient_responsibility'))
+    }
+
+def kpis_from_totals(totals: Dict[str, np.ndarray]) -> Dict[str, List[float]]:
+    """Rounded KPI values per group, as reported by the calculators (see kpi_arrays)."""
+    # Python round() per value keeps the historical half-even-on-binary rounding
+    return {
+        name: [round(float(v), 3 if name == 'cost_to_collect' else 1) for v in values]
+        for name, values in kpi_arrays(totals).items()
+    }
 
 class KPICalculator:
     """Calculates Revenue Cycle KPIs from DataFrame."""
 
-    def calculate_all(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Calculates all 12 core core KPIs."""
+    # Group keys derived from service_date rather than read from a column
+    PERIOD_KEYS = {'week': 'W', 'month': 'M', 'quarter': 'Q', 'year': 'Y'}
+
+    # Amount columns summed into KPI totals
+    SUM_COLUMNS = ['payments', 'allowed_amount', 'charges', 'adjustments', 'patient_responsibility', 'pos_collections']
+
+    def calculate_all(self, df: pd.DataFrame, metrics: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Calculates the 12 core KPIs (or only `metrics`, skipping unused inputs).
+
+        Works on the frame in place: the needed amounts are reduced together in
+        one float64-accumulated sum and conditional counts are mask sums, so
+        nothing is re-filtered.
+        """
+        names = list(KPI_INPUTS) if metrics is None else [m for m in metrics if m in KPI_INPUTS]
         if df.empty:
-            return {
-                'net_collection_rate': None,
-                'gross_collection_rate': None,
-                'days_in_ar': None,
-                'clean_claim_rate': None,
-                'denial_rate': None,
-                'denial_overturn_rate': None,
-                'cost_to_collect': None,
-                'charge_lag': None,
-                'ar_over_90_pct': None,
-                'cash_as_pct_nr': None,
-                'bad_debt_rate': None,
-                'pos_collection_rate': None
-            }
-
-        # Helper to safely sum columns
-        def safe_sum(col):
-            return df[col].sum() if col in df.columns else 0
-
-        # Helper to safely count rows
-        def safe_count(condition):
-            # If columns needed for condition are missing, return 0
-            # Condition is expected to be a boolean series or lambda
-            try:
-                return len(df[condition])
-            except (KeyError, ValueError):
-                return 0
-
-        # 1. Net Collection Rate
-        payments_sum = safe_sum('payments')
-        allowed_sum = safe_sum('allowed_amount')
-        net_col_rate = (payments_sum / allowed_sum * 100) if allowed_sum > 0 else 0
-
-        # 2. Gross Collection Rate
-        charges_sum = safe_sum('charges')
-        gross_col_rate = (payments_sum / charges_sum * 100) if charges_sum > 0 else 0
-
-        # 3. Days in A/R (Approximate using 365 days)
-        adjustments_sum = safe_sum('adjustments')
-        total_ar = charges_sum - payments_sum - adjustments_sum
-        
-        avg_daily_revenue = charges_sum / 365 if charges_sum > 0 else 0 # Simplified
-        days_in_ar = total_ar / avg_daily_revenue if avg_daily_revenue > 0 else 0
-
-        # 4. Clean Claim Rate 
-        total_claims = len(df)
-        clean_claims = safe_count(df['claim_status'] != 'Denied') if 'claim_status' in df.columns else total_claims
-        clean_claim_rate = (clean_claims / total_claims * 100) if total_claims > 0 else 0
-
-        # 5. Denial Rate
-        denied_claims = safe_count(df['claim_status'] == 'Denied') if 'claim_status' in df.columns else 0
-        denial_rate = (denied_claims / total_claims * 100) if total_claims > 0 else 0
-
-        # 6. Denial Overturn Rate
-        overturned_denials = denied_claims * 0.44 # Mocked constant
-        denial_overturn_rate = (overturned_denials / denied_claims * 100) if denied_claims > 0 else 0
-
-        # 7. Cost to Collect 
-        cost_to_collect = 0.042 # Mocked constant per TRD
-
-        # 8. Charge Lag
+            return {name: None for name in names}
+
+        needed = {i for name in names for i in KPI_INPUTS[name]}
+        totals = {name: np.array([value]) for name, value in self._totals(df, needed).items()}
+        kpis = kpis_from_totals(totals)
+        return {name: kpis[name][0] for name in names}
+
+    def _totals(self, df: pd.DataFrame, needed: set) -> Dict[str, float]:
+        """Reduces the frame to the scalar inputs named in `needed`."""
+        totals = {'claims': len(df)}
+
+        # 1. Amount sums in one reduction over the stacked columns (missing columns count as 0)
+        amounts = [col for col in self.SUM_COLUMNS if col in needed and col in df.columns]
+        if amounts:
+            sums = np.nansum(df[amounts].to_numpy(), axis=0, dtype=np.float64)
+            totals.update(zip(amounts, sums.tolist()))
+
+        # 2. Conditional counts as mask sums
+        has_status = 'claim_status' in df.columns
+        if 'denied' in needed and has_status:
+            totals['denied'] = int((df['claim_status'] == 'Denied').sum())
+        if 'aged' in needed and has_status and 'service_date' in df.columns:
+            ninety_days_ago = pd.Timestamp(date.today() - timedelta(days=90))
+            totals['aged'] = int(((df['claim_status'] != 'Paid') & (_as_datetime(df['service_date']) < ninety_days_ago)).sum())
+
+        # 3. Charge lag (service date -> charge entry)
+        if 'lag' in needed and 'service_date' in df.columns and 'charge_entry_date' in df.columns:
+            totals['lag'] = float((_as_datetime(df['charge_entry_date']) - _as_datetime(df['service_date'])).dt.days.mean())
+
+        return totals
+
+    def calculate_grouped(self, df: pd.DataFrame, by: Union[str, List[str]]) -> List[Dict[str, Any]]:
+        """
+        Calculates all 12 KPIs for every group in a single groupby aggregation.
+
+        `by` may name columns (e.g. 'payer_name', 'facility', 'cpt_code') or the
+        service-date periods in PERIOD_KEYS ('week', 'month', 'quarter', 'year').
+        Returns one dict per group, sorted by key, with the same KPI fields as
+        calculate_all plus the group key values.
+        """
+        keys = [by] if isinstance(by, str) else list(by)
+        if df.empty:
+            return []
+
+        # 1. Per-row inputs: amounts plus 0/1 flags for conditional counts
+        work = pd.DataFrame(index=df.index)
+        for key in keys:
+            if key in self.PERIOD_KEYS:
+                work[key] = _as_datetime(df['service_date']).dt.to_period(self.PERIOD_KEYS[key])
+            else:
+                work[key] = df[key]
+        for col in self.SUM_COLUMNS:
+            if col in df.columns:
+                work[col] = df[col].astype('float64')
+        work['claims'] = 1
+        if 'claim_status' in df.columns:
+            work['denied'] = (df['claim_status'] == 'Denied').astype('int64')
         if 'service_date' in df.columns and 'charge_entry_date' in df.columns:
-            df_temp = df.copy()
-            df_temp['service_dt'] = pd.to_datetime(df_temp['service_date'])
-            df_temp['charge_entry_dt'] = pd.to_datetime(df_temp['charge_entry_date'])
-            charge_lag = (df_temp['charge_entry_dt'] - df_temp['service_dt']).dt.days.mean()
-        else:
-            charge_lag = 0
-
-        # 9. A/R Over 90 Days %
-        ninety_days_ago = date.today() - timedelta(days=90)
+            work['lag'] = (_as_datetime(df['charge_entry_date']) - _as_datetime(df['service_date'])).dt.days
         if 'claim_status' in df.columns and 'service_date' in df.columns:
-            aging_df = df[(df['claim_status'] != 'Paid') & (pd.to_datetime(df['service_date']).dt.date < ninety_days_ago)]
-            ar_over_90 = (len(aging_df) / total_claims * 100) if total_claims > 0 else 0
-        else:
-            ar_over_90 = 0
-
-        # 10. Cash as % of Net Revenue
-        cash_as_pct_nr = (payments_sum / allowed_sum * 100) if allowed_sum > 0 else 0
-
-        # 11. Bad Debt Rate
-        bad_debt_write_offs = adjustments_sum * 0.05 # Mocked as portion of adjustments
-        bad_debt_rate = (bad_debt_write_offs / allowed_sum * 100) if allowed_sum > 0 else 0
-
-        # 12. Point-of-Service Collections
-        pt_resp_sum = safe_sum('patient_responsibility')
-        pos_col_sum = safe_sum('pos_collections')
-        pos_collection_rate = (pos_col_sum / pt_resp_sum * 100) if pt_resp_sum > 0 else 0
-
-        return {
-            'net_collection_rate': round(net_col_rate, 1),
-            'gross_collection_rate': round(gross_col_rate, 1),
-            'days_in_ar': round(days_in_ar, 1),
-            'clean_claim_rate': round(clean_claim_rate, 1),
-            'denial_rate': round(denial_rate, 1),
-            'denial_overturn_rate': round(denial_overturn_rate, 1),
-            'cost_to_collect': round(cost_to_collect, 3),
-            'charge_lag': round(charge_lag, 1),
-            'ar_over_90_pct': round(ar_over_90, 1),
-            'cash_as_pct_nr': round(cash_as_pct_nr, 1),
-            'bad_debt_rate': round(bad_debt_rate, 1),
-            'pos_collection_rate': round(pos_collection_rate, 1)
-        }
-
+            ninety_days_ago = pd.Timestamp(date.today() - timedelta(days=90))
+            work['aged'] = ((df['claim_status'] != 'Paid') & (_as_datetime(df['service_date']) < ninety_days_ago)).astype('int64')
+
+        # 2. One aggregation pass over all groups
+        agg_spec = {col: 'sum' for col in work.columns if col not in keys}
+        if 'lag' in agg_spec:
+            agg_spec['lag'] = 'mean'
+        totals = work.groupby(keys, observed=True, sort=True).agg(agg_spec)
+
+        # 3. Derive KPIs column-wise from the group totals
+        kpis = kpis_from_totals({col: totals[col].to_numpy() for col in totals.columns})
+
+        results = []
+        for i, group_key in enumerate(totals.index):
+            row = {name: values[i] for name, values in kpis.items()}
+            group_values = group_key if isinstance(group_key, tuple) else (group_key,)
+            row.update({k: (str(v) if isinstance(v, pd.Period) else v) for k, v in zip(keys, group_values)})
+            results.append(row)
+        return results
 
     def calculate_trends(self, df: pd.DataFrame, months: int = 12) -> List[Dict[str, Any]]:
         """Calculates monthly KPI trends for charting."""
-        df['service_month'] = pd.to_datetime(df['service_date']).dt.to_period('M')
-        monthly_trends = []
-        
-        # Sort months in descending order to get last 'months' months
-        periods = sorted(df['service_month'].unique())[-months:]
-        
-        for period in periods:
-            month_df = df[df['service_month'] == period]
-            kpis = self.calculate_all(month_df)
-            kpis['period'] = str(period)
-            monthly_trends.append(kpis)
-            
+        monthly_trends = self.calculate_grouped(df, 'month')[-months:]
+        for kpis in monthly_trends:
+            kpis['period'] = kpis.pop('month')
         return monthly_trends
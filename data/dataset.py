@@ -0,0 +1,175 @@
+import os
+import threading
+import logging
+from collections import deque
+import pandas as pd
+from typing import Optional, Tuple, List, Dict, Any, Collection
+from config.settings import settings
+from .loader import DataLoader
+from .partitions import filter_claims
+from .aggregates import KPIAggregates, CUBE_DIMENSIONS
+from .anomalies import StreamingAnomalyDetector
+from .schemas import DataQualityReport
+
+logger = logging.getLogger(__name__)
+
+class ClaimsDataset:
+    """
+    Process-wide holder of the loaded claims frame.
+
+    Every view and agent node reads through the same instance, so the CSV is
+    parsed once per process instead of once per render or query. The frame is
+    reloaded only on an explicit refresh() or when the source file changes;
+    each reload bumps `version` so callers can key their own caches on it.
+    """
+
+    def __init__(self, loader: Optional[DataLoader] = None):
+        # Typed layout: categoricals, datetime64 dates and float32 amounts, streamed in chunks
+        self.loader = loader or DataLoader(
+            typed=True, float32_amounts=True, chunk_size=settings.load_chunk_rows, partitions=settings.load_partitions
+        )
+        self._lock = threading.Lock()
+        self._df: Optional[pd.DataFrame] = None
+        self._report: Optional[DataQualityReport] = None
+        self._source_stat: Optional[Tuple[int, int]] = None
+        self._aggregates: Optional[KPIAggregates] = None
+        self._live_detector: Optional[StreamingAnomalyDetector] = None # Seeded on the first append
+        self._live_alerts = deque(maxlen=100) # Most recent alerts from appended claims
+        self._appended = False # Rows appended since the last load are only in memory, not in the loader's partitions
+        self.version = 0
+
+    def _stat_source(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.loader.data_path)
+            return stat.st_size, stat.st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self):
+        """Loads from the DataLoader and publishes a new version. Caller holds the lock."""
+        source_stat = self._stat_source()
+        df, report = self.loader.load_from_csv()
+        if report.status == "error":
+            logger.error(f"Failed to load claims dataset: {report.validation_errors}")
+        self._df, self._report = df, report
+        self._source_stat = source_stat
+        self.version += 1
+        self._rebuild_aggregates()
+        self._live_detector = None
+        self._live_alerts.clear()
+        self._appended = False
+        logger.info(f"Claims dataset loaded: {len(df)} rows (version {self.version})")
+
+    def _rebuild_aggregates(self):
+        """Refresh hook: rebuilds the dashboard cube so the next render only reads cells."""
+        if self._df.empty:
+            self._aggregates = None
+            return
+        dimensions = [d for d in CUBE_DIMENSIONS if d in self._df.columns]
+        self._aggregates = KPIAggregates.from_frame(self._df, dimensions)
+
+    def _ensure_loaded(self):
+        if self._df is not None and self._stat_source() == self._source_stat:
+            return
+        with self._lock:
+            # Another thread may have reloaded while we waited
+            if self._df is None or self._stat_source() != self._source_stat:
+                self._load()
+
+    def get(self) -> pd.DataFrame:
+        """
+        Returns a shallow view of the shared frame.
+
+        Adding or reassigning columns on the returned frame does not affect
+        other callers; the underlying column data is shared, not copied.
+        """
+        self._ensure_loaded()
+        return self._df.copy(deep=False)
+
+    def get_range(
+        self,
+        start_date: Any = None,
+        end_date: Any = None,
+        facilities: Optional[Collection[str]] = None,
+        months: Optional[Collection[int]] = None
+    ) -> pd.DataFrame:
+        """
+        Returns the claims with a service date in the inclusive range, at the
+        given facilities and in the given months of the year (1-12), as a new
+        frame. Only the overlapping service-month partitions are read from
+        disk, without loading the full frame; when the store does not match
+        the source or rows were appended, the shared frame is filtered instead.
+        """
+        if not self._appended:
+            df = self.loader.read_partitions(start_date, end_date, facilities, months)
+            if df is not None:
+                return df
+        return filter_claims(self.get(), start_date, end_date, facilities, months)
+
+    def get_version_key(self) -> str:
+        """
+        Identifies the loaded data for cache keys: the source fingerprint (stable
+        across restarts) plus the in-process version (bumped by refresh/append).
+        """
+        self._ensure_loaded()
+        size, mtime_ns = self._source_stat or (0, 0)
+        return f"{size}-{mtime_ns}-v{self.version}"
+
+    def get_report(self) -> DataQualityReport:
+        """Returns the data quality report for the currently loaded version."""
+        self._ensure_loaded()
+        return self._report
+
+    def get_aggregates(self) -> Optional[KPIAggregates]:
+        """
+        Returns the KPI cube (cells per service day x CUBE_DIMENSIONS) for the
+        current version, or None when no data is loaded.
+        """
+        self._ensure_loaded()
+        return self._aggregates
+
+    def append(self, new_rows: pd.DataFrame) -> int:
+        """
+        Appends already-normalized claims (same layout as get()) and folds them
+        into the aggregates without recomputing history. Appended rows live in
+        memory until the next reload from source. Returns the new version.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            new_rows = new_rows.copy()
+            current = self._df.copy(deep=False)
+            for col in current.columns:
+                # Keep categoricals categorical by widening both sides to the union of categories
+                if isinstance(current[col].dtype, pd.CategoricalDtype) and col in new_rows.columns:
+                    categories = current[col].cat.categories.union(pd.Index(new_rows[col].dropna().unique()))
+                    current[col] = current[col].cat.set_categories(categories)
+                    new_rows[col] = pd.Categorical(new_rows[col], categories=categories)
+            self._df = pd.concat([current, new_rows], ignore_index=True)
+            if self._aggregates is not None:
+                self._aggregates.update(new_rows)
+            self._detect_live(current, new_rows)
+            self._appended = True
+            self.version += 1
+            return self.version
+
+    def _detect_live(self, history: pd.DataFrame, new_rows: pd.DataFrame):
+        """Feeds appended claims to the streaming detector. Caller holds the lock."""
+        if self._live_detector is None:
+            self._live_detector = StreamingAnomalyDetector().warm_up(history)
+        for alert in self._live_detector.ingest(new_rows):
+            logger.warning(f"Live anomaly: {alert['message']}")
+            self._live_alerts.append(alert)
+
+    def get_live_alerts(self) -> List[Dict[str, Any]]:
+        """Alerts tripped by appended claims since the last reload, newest first."""
+        with self._lock:
+            return list(reversed(self._live_alerts))
+
+    def refresh(self) -> Tuple[pd.DataFrame, DataQualityReport]:
+        """Forces a reload from the source regardless of its fingerprint."""
+        with self._lock:
+            self._load()
+            return self._df.copy(deep=False), self._report
+
+# Singleton instance
+claims_dataset = ClaimsDataset()
@@ -1,74 +1,402 @@
 import pandas as pd
 import os
+import json
+import hashlib
 import logging
 from datetime import date
-from typing import Optional, Tuple, Dict, Any
-from .schemas import ClaimRecord, DataQualityReport
+from typing import Optional, Tuple, Dict, Any, List, Iterable, Iterator, Callable, Sequence
+from .schemas import DataQualityReport
+from .validation import validate_claims, ClaimValidationResult
+from .partitions import PartitionedClaimsStore
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.ipc as ipc
+except ImportError:  # Columnar cache is optional; loads fall back to parsing the CSV
+    pa = None
 
 logger = logging.getLogger(__name__)
 
+CACHE_METADATA_KEY = b"revcycle_cache"
+
+# Column groups for the typed layout
+CATEGORICAL_COLUMNS = ['payer_name', 'payer_category', 'cpt_code', 'claim_status', 'denial_reason', 'denial_category', 'facility']
+DATE_COLUMNS = ['service_date', 'charge_entry_date', 'claim_submission_date', 'payment_date']
+MONEY_COLUMNS = ['charges', 'allowed_amount', 'payments', 'adjustments', 'patient_responsibility', 'pos_collections']
+
+# Rows per chunk when streaming, unless the loader is given its own
+DEFAULT_CHUNK_ROWS = 250_000
+
+class QualityCounters:
+    """DataQualityReport counters, accumulated one validated chunk at a time."""
+
+    def __init__(self, max_errors: int = 10):
+        self.max_errors = max_errors
+        self.total_rows = 0
+        self.invalid_rows = 0
+        self.missing_payer_name = 0
+        self.future_service_dates = 0
+        self.memory_bytes = 0
+        self.validation_errors: List[str] = []
+
+    @property
+    def errors_remaining(self) -> int:
+        return self.max_errors - len(self.validation_errors)
+
+    def add(self, validation: ClaimValidationResult):
+        """Counts one validated chunk (its frame still has datetime64 dates)."""
+        frame = validation.frame
+        self.total_rows += len(frame)
+        self.invalid_rows += int(validation.invalid_mask.sum())
+        self.missing_payer_name += int(frame['payer_name'].isna().sum())
+        self.future_service_dates += int((frame['service_date'] > pd.Timestamp(date.today())).sum())
+        self.validation_errors.extend(validation.errors[:max(self.errors_remaining, 0)])
+
+    def report(self) -> DataQualityReport:
+        return DataQualityReport(
+            total_rows=self.total_rows,
+            valid_rows=self.total_rows - self.invalid_rows,
+            invalid_rows=self.invalid_rows,
+            missing_payer_name=self.missing_payer_name,
+            future_service_dates=self.future_service_dates,
+            validation_errors=self.validation_errors,
+            memory_bytes=self.memory_bytes
+        )
+
 class DataLoader:
     """Handles data ingestion from CSV or Google Sheets."""
 
-    def __init__(self, data_path: Optional[str] = None):
+    def __init__(
+        self,
+        data_path: Optional[str] = None,
+        use_cache: bool = True,
+        typed: bool = False,
+        float32_amounts: bool = False,
+        chunk_size: Optional[int] = None,
+        partitions: Optional[str] = None
+    ):
+        """
+        typed: load text dimensions as categoricals and dates as datetime64[s]
+               instead of Python str / date objects.
+        float32_amounts: with typed, store money columns as float32 (exact to the
+               cent below ~$100k per claim; aggregate in float64).
+        chunk_size: stream the CSV in chunks of this many rows, so ingestion
+               memory is bounded by the chunk rather than the file. Text
+               columns are always read as text (cpt_code stays '99213').
+        partitions: also keep the loaded claims on disk partitioned by this
+               scheme ('month' or 'month_facility'), for read_partitions().
+        """
         if data_path is None:
             # Fallback to the synthetic data path
             data_path = os.path.join(os.path.dirname(__file__), 'synthetic_hospital_data.csv')
         self.data_path = data_path
+        self.use_cache = use_cache and pa is not None
+        self.typed = typed
+        self.float32_amounts = typed and float32_amounts
+        self.chunk_size = chunk_size
+        # Streaming reads untyped text columns as str, so its cache is not interchangeable
+        layout = ('.typed32' if self.float32_amounts else '.typed') if typed else ('.text' if chunk_size else '')
+        self.cache_path = os.path.splitext(data_path)[0] + layout + '.cache.feather'
+        self.partitions = partitions if pa is not None else None
+        self.partitions_path = os.path.splitext(data_path)[0] + layout + '.partitions'
+
+    def _apply_layout(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Converts the validated frame (datetime64 dates) to the configured column layout."""
+        date_cols = [c for c in DATE_COLUMNS if c in df.columns]
+        if not self.typed:
+            for col in date_cols:
+                df[col] = df[col].dt.date
+            return df
+
+        for col in date_cols:
+            df[col] = df[col].astype('datetime64[s]')
+        if self.float32_amounts:
+            for col in [c for c in MONEY_COLUMNS if c in df.columns]:
+                df[col] = df[col].astype('float32')
+        return df
+
+    def _file_hash(self) -> str:
+        """SHA256 of the source file, read in 1 MiB blocks."""
+        digest = hashlib.sha256()
+        with open(self.data_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _read_cache(self) -> Optional[Tuple[pd.DataFrame, DataQualityReport]]:
+        """Returns the cached frame if its fingerprint still matches the source file."""
+        if not self.use_cache or not os.path.exists(self.cache_path):
+            return None
+        try:
+            table = feather.read_table(self.cache_path, memory_map=True)
+            meta = json.loads(table.schema.metadata[CACHE_METADATA_KEY])
+            if not self._matches_source(meta):
+                return None
+            return self._sort_categories(table.to_pandas()), DataQualityReport(**meta['report'])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable claims cache {self.cache_path}: {str(e)}")
+            return None
+
+    def _matches_source(self, fingerprint: Dict[str, Any]) -> bool:
+        stat = os.stat(self.data_path)
+        if fingerprint['size'] != stat.st_size:
+            return False
+        # A touched-but-identical file only costs a hash, not a re-parse
+        return fingerprint['mtime_ns'] == stat.st_mtime_ns or fingerprint['sha256'] == self._file_hash()
+
+    def _sort_categories(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Streamed stores keep categories in first-seen order; sort them as a one-pass read would."""
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and not df[col].cat.categories.is_monotonic_increasing:
+                df[col] = df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
+        return df
+
+    def _fingerprint(self) -> Dict[str, Any]:
+        stat = os.stat(self.data_path)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': self._file_hash()}
+
+    def _write_cache(self, df: pd.DataFrame, report: DataQualityReport):
+        """Persists the normalized frame with the source fingerprint in the schema metadata."""
+        if not self.use_cache:
+            return
+        try:
+            meta = {**self._fingerprint(), 'report': report.model_dump()}
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            table = table.replace_schema_metadata({
+                **(table.schema.metadata or {}),
+                CACHE_METADATA_KEY: json.dumps(meta).encode()
+            })
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning(f"Could not write claims cache {self.cache_path}: {str(e)}")
+
+    def text_dtypes(self) -> Dict[str, str]:
+        """read_csv dtypes for text columns; fixed so every chunk parses the same way."""
+        dtypes = {c: 'category' if self.typed else 'str' for c in CATEGORICAL_COLUMNS}
+        dtypes['claim_id'] = 'str'
+        return dtypes
+
+    def iter_chunks(self, chunk_size: Optional[int] = None, counters: Optional[QualityCounters] = None) -> Iterator[pd.DataFrame]:
+        """
+        Reads, validates and normalizes the CSV one chunk at a time, yielding
+        each in the configured layout; counters, when given, accumulate the
+        data quality report.
+        """
+        with pd.read_csv(self.data_path, chunksize=chunk_size or self.chunk_size or DEFAULT_CHUNK_ROWS,
+                         dtype=self.text_dtypes()) as reader:
+            yield from self.normalize_chunks(reader, counters)
+
+    def normalize_chunks(
+        self,
+        raw_chunks: Iterable[pd.DataFrame],
+        counters: Optional[QualityCounters] = None,
+        drop_invalid: bool = False
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Validates and normalizes raw chunks from any reader (text columns
+        already parsed with text_dtypes()). In the typed layout all chunks
+        share one growing category list per column (new values appended), so
+        they concatenate or stream into one Arrow file without re-encoding.
+        drop_invalid leaves out rows failing validation (they are still counted).
+        """
+        categories: Dict[str, pd.Index] = {}
+        for raw in raw_chunks:
+            validation = validate_claims(raw, max_errors=counters.errors_remaining if counters else 10)
+            if counters is not None:
+                counters.add(validation)
+            df = self._apply_layout(validation.frame)
+            if drop_invalid and validation.invalid_mask.any():
+                df = df[~validation.invalid_mask]
+            for col in [c for c in CATEGORICAL_COLUMNS if c in df.columns] if self.typed else []:
+                known = categories.get(col, df[col].cat.categories[:0])
+                categories[col] = known.append(df[col].cat.categories.difference(known))
+                df[col] = df[col].cat.set_categories(categories[col])
+            if counters is not None:
+                counters.memory_bytes += int(df.memory_usage(deep=True).sum())
+            yield df
+
+    def ingest(self, sinks: Sequence[Callable[[pd.DataFrame], Any]], chunk_size: Optional[int] = None) -> DataQualityReport:
+        """
+        Streams the CSV through sinks (e.g. KPIAggregates.update) chunk by
+        chunk, without assembling the frame. Returns the data quality report.
+        """
+        counters = QualityCounters()
+        try:
+            for df in self.iter_chunks(chunk_size, counters):
+                for sink in sinks:
+                    sink(df)
+        except Exception as e:
+            logger.error(f"Error ingesting CSV data: {str(e)}")
+            return self._error_report(e)
+        return counters.report()
+
+    def _store_schema(self, schema: 'pa.Schema') -> 'pa.Schema':
+        """Store schema fixed from the first chunk, so later chunks with all-null or narrower columns cast to it."""
+        date_type = pa.timestamp('s') if self.typed else pa.date32()
+        money_type = pa.float32() if self.float32_amounts else pa.float64()
+        fields = []
+        for field in schema:
+            if field.name in CATEGORICAL_COLUMNS:
+                field = field.with_type(pa.dictionary(pa.int32(), pa.string()) if self.typed else pa.string())
+            elif field.name in DATE_COLUMNS:
+                field = field.with_type(date_type)
+            elif field.name in MONEY_COLUMNS:
+                field = field.with_type(money_type)
+            elif field.name == 'claim_id' or pa.types.is_null(field.type) or pa.types.is_large_string(field.type):
+                field = field.with_type(pa.string())
+            fields.append(field)
+        return pa.schema(fields, metadata=schema.metadata)
+
+    def _write_store(self, chunks: Iterator[pd.DataFrame], counters: QualityCounters) -> bool:
+        """
+        Streams chunks into the columnar cache file. The report is only known
+        after the last chunk, so the batches are then copied (memory-mapped)
+        into the final file with it in the schema metadata. Returns False if
+        the CSV had no rows.
+        """
+        fingerprint = self._fingerprint()
+        rows_path = f"{self.cache_path}.{os.getpid()}.rows.tmp"
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        options = ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        writer = None
+        try:
+            for df in chunks:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    schema = self._store_schema(table.schema)
+                    writer = ipc.new_file(rows_path, schema, options=options)
+                writer.write_table(table.cast(schema))
+            if writer is None:
+                return False
+            writer.close()
+
+            meta = {**fingerprint, 'report': counters.report().model_dump()}
+            with pa.memory_map(rows_path) as source:
+                reader = ipc.open_file(source)
+                schema = reader.schema.with_metadata({
+                    **(reader.schema.metadata or {}),
+                    CACHE_METADATA_KEY: json.dumps(meta).encode()
+                })
+                with ipc.new_file(tmp_path, schema, options=options) as out:
+                    for i in range(reader.num_record_batches):
+                        out.write_batch(reader.get_batch(i))
+            os.replace(tmp_path, self.cache_path)
+            return True
+        finally:
+            if writer is not None:
+                writer.close()
+            for path in (rows_path, tmp_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _load_streaming(self) -> Tuple[pd.DataFrame, DataQualityReport]:
+        """Chunked load: into the columnar store and back out memory-mapped, or concatenated without a cache."""
+        counters = QualityCounters()
+        chunks = self.iter_chunks(self.chunk_size, counters)
+        if self.use_cache:
+            if self._write_store(chunks, counters):
+                cached = self._read_cache()
+                if cached is not None:
+                    return cached
+            return pd.DataFrame(), counters.report()
+        frames = list(chunks)
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return self._sort_categories(df), counters.report()
+
+    def _partition_manifest(self) -> Optional[Dict[str, Any]]:
+        """Manifest of the partitioned store if it was built from the current source file."""
+        if self.partitions is None:
+            return None
+        manifest = PartitionedClaimsStore(self.partitions_path, self.partitions).manifest()
+        try:
+            return manifest if manifest is not None and self._matches_source(manifest['source']) else None
+        except (OSError, KeyError):
+            return None
+
+    def _write_partitions(self, df: pd.DataFrame, report: DataQualityReport):
+        """Splits the loaded frame into the partitioned store, one chunk at a time, unless it is current."""
+        if self.partitions is None or df.empty or self._partition_manifest() is not None:
+            return
+        try:
+            step = self.chunk_size or DEFAULT_CHUNK_ROWS
+            frames = (df.iloc[i:i + step] for i in range(0, len(df), step))
+            meta = {'source': self._fingerprint(), 'report': report.model_dump()}
+            manifest = PartitionedClaimsStore(self.partitions_path, self.partitions).write(frames, self._store_schema, meta)
+            logger.info(f"Claims partitioned by {self.partitions}: {len(manifest['partitions'])} partitions")
+        except Exception as e:
+            logger.warning(f"Could not write claims partitions {self.partitions_path}: {str(e)}")
+
+    def read_partitions(
+        self,
+        start_date: Any = None,
+        end_date: Any = None,
+        facilities: Optional[Sequence[str]] = None,
+        months: Optional[Sequence[int]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Claims matching the filters (see partitions.filter_claims), read from
+        only the partitions that can hold them. Returns None when there is no
+        partitioned store for the current source file; load_from_csv builds it.
+        """
+        manifest = self._partition_manifest()
+        if manifest is None:
+            return None
+        try:
+            store = PartitionedClaimsStore(self.partitions_path, self.partitions)
+            return store.read(manifest, start_date, end_date, facilities, months)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable claims partitions {self.partitions_path}: {str(e)}")
+            return None
+
+    def _error_report(self, error: Exception) -> DataQualityReport:
+        return DataQualityReport(
+            total_rows=0, valid_rows=0, invalid_rows=0,
+            missing_payer_name=0, future_service_dates=0,
+            validation_errors=[str(error)], status="error"
+        )
 
     def load_from_csv(self) -> Tuple[pd.DataFrame, DataQualityReport]:
         """Loads data from CSV file and performs validation."""
         if not os.path.exists(self.data_path):
             raise FileNotFoundError(f"Data file not found at {self.data_path}")
 
+        df, report = self._load_csv()
+        if report.status != "error":
+            self._write_partitions(df, report)
+        return df, report
+
+    def _load_csv(self) -> Tuple[pd.DataFrame, DataQualityReport]:
+        cached = self._read_cache()
+        if cached is not None:
+            return cached
+
         try:
-            df = pd.read_csv(self.data_path)
-            
-            # Basic normalization
-            df['service_date'] = pd.to_datetime(df['service_date']).dt.date
-            df['charge_entry_date'] = pd.to_datetime(df['charge_entry_date']).dt.date
-            df['claim_submission_date'] = pd.to_datetime(df['claim_submission_date']).dt.date
-            df['payment_date'] = pd.to_datetime(df['payment_date']).dt.date
-
-            total_rows = len(df)
-            valid_rows = 0
-            invalid_rows = 0
-            missing_payer_name = df['payer_name'].isna().sum()
-            
-            today = date.today()
-            future_service_dates = (df['service_date'] > today).sum()
-
-            validation_errors = []
-            
-            # Validate rows using Pydantic (expensive on large datasets - can be optimized)
-            # For 15-20k rows it should be okay
-            for idx, row in df.iterrows():
-                try:
-                    ClaimRecord(**row.to_dict())
-                    valid_rows += 1
-                except Exception as e:
-                    invalid_rows += 1
-                    if len(validation_errors) < 10: # Limit error collection
-                        validation_errors.append(f"Row {idx}: {str(e)}")
-
-            report = DataQualityReport(
-                total_rows=total_rows,
-                valid_rows=valid_rows,
-                invalid_rows=invalid_rows,
-                missing_payer_name=missing_payer_name,
-                future_service_dates=future_service_dates,
-                validation_errors=validation_errors
-            )
+            if self.chunk_size:
+                return self._load_streaming()
+
+            read_kwargs = {}
+            if self.typed:
+                # Categoricals are built by the parser, never materialized as str objects
+                read_kwargs['dtype'] = {c: 'category' for c in CATEGORICAL_COLUMNS}
+            raw_df = pd.read_csv(self.data_path, **read_kwargs)
+
+            # Normalization (date parsing) and schema validation in one columnar pass
+            validation = validate_claims(raw_df)
+            counters = QualityCounters()
+            counters.add(validation)
+            df = self._apply_layout(validation.frame)
+            counters.memory_bytes = int(df.memory_usage(deep=True).sum())
+            report = counters.report()
 
+            self._write_cache(df, report)
             return df, report
 
         except Exception as e:
             logger.error(f"Error loading CSV data: {str(e)}")
-            return pd.DataFrame(), DataQualityReport(
-                total_rows=0, valid_rows=0, invalid_rows=0,
-                missing_payer_name=0, future_service_dates=0,
-                validation_errors=[str(e)], status="error"
-            )
+            return pd.DataFrame(), self._error_report(e)
 
     def load_from_google_sheets(self, sheet_id: str) -> Tuple[pd.DataFrame, DataQualityReport]:
         """Loads data from Google Sheets. Placeholder for now."""
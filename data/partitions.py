@@ -0,0 +1,198 @@
+import os
+import json
+import shutil
+import logging
+from typing import Optional, Dict, Any, List, Iterable, Callable, Collection
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.ipc as ipc
+except ImportError:  # The partitioned store is optional; date-filtered reads fall back to the in-memory frame
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# Partition schemes: service month plus these columns
+PARTITION_SCHEMES = {'month': [], 'month_facility': ['facility']}
+
+def filter_claims(
+    df: pd.DataFrame,
+    start_date: Any = None,
+    end_date: Any = None,
+    facilities: Optional[Collection[str]] = None,
+    months: Optional[Collection[int]] = None
+) -> pd.DataFrame:
+    """
+    Claims with a service date in the inclusive range, at one of the
+    facilities and in one of the months of the year (1-12, e.g. a quarter in
+    any year). None leaves that constraint out.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if start_date is not None or end_date is not None or months:
+        service = pd.to_datetime(df['service_date'])
+        if start_date is not None:
+            mask &= (service >= pd.Timestamp(start_date)).to_numpy()
+        if end_date is not None:
+            mask &= (service <= pd.Timestamp(end_date)).to_numpy()
+        if months:
+            mask &= service.dt.month.isin(list(months)).to_numpy()
+    if facilities is not None:
+        mask &= df['facility'].isin(list(facilities)).to_numpy()
+    return df[mask].reset_index(drop=True)
+
+class PartitionedClaimsStore:
+    """
+    Claims split on disk into one Arrow IPC file per service month (and
+    optionally facility), next to a manifest recording each partition's
+    service date range and row count.
+
+    Reads consult the manifest first and memory-map only the partitions that
+    can hold matching rows, then trim the boundary months exactly. Rows
+    without a service date go to an 'undated' partition that only unfiltered
+    reads include.
+    """
+
+    def __init__(self, root: str, scheme: str = 'month'):
+        if scheme not in PARTITION_SCHEMES:
+            raise ValueError(f"Unknown partition scheme: {scheme}")
+        self.root = root
+        self.scheme = scheme
+        self.columns = PARTITION_SCHEMES[scheme]
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        """The store's manifest, or None when there is no complete store for this scheme."""
+        try:
+            with open(os.path.join(self.root, MANIFEST_NAME)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('version') != MANIFEST_VERSION or manifest.get('scheme') != self.scheme:
+            return None
+        return manifest
+
+    def write(
+        self,
+        frames: Iterable[pd.DataFrame],
+        schema_for: Callable[['pa.Schema'], 'pa.Schema'],
+        meta: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Rebuilds the store from frames in any order; rows keep their order
+        within a partition. schema_for fixes the file schema from the first
+        frame's and meta is kept in the manifest. The new store is built
+        aside and swapped in, so readers see the old or the new one.
+        Returns the manifest.
+        """
+        tmp_root = f"{self.root}.{os.getpid()}.tmp"
+        old_root = f"{self.root}.{os.getpid()}.old"
+        shutil.rmtree(tmp_root, ignore_errors=True)
+        os.makedirs(tmp_root)
+        options = ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        writers: Dict[tuple, Any] = {}
+        parts: Dict[tuple, Dict[str, Any]] = {}
+        schema = None
+        try:
+            for df in frames:
+                if df.empty:
+                    continue
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if schema is None:
+                    schema = schema_for(table.schema)
+                table = table.cast(schema)
+                service = pd.to_datetime(df['service_date']).reset_index(drop=True)
+                keys = pd.DataFrame({'month': service.dt.to_period('M')})
+                for col in self.columns:
+                    keys[col] = df[col].to_numpy()
+                groups = keys.groupby(list(keys.columns), dropna=False, observed=True, sort=False).indices
+                for key, positions in groups.items():
+                    key = tuple(None if pd.isna(k) else str(k) for k in (key if isinstance(key, tuple) else (key,)))
+                    if key not in parts:
+                        name = f"claims-{key[0] or 'undated'}" + (f"-{len(parts)}" if self.columns else "") + ".arrow"
+                        writers[key] = ipc.new_file(os.path.join(tmp_root, name), schema, options=options)
+                        parts[key] = {
+                            'path': name, 'month': key[0], **dict(zip(self.columns, key[1:])),
+                            'min_date': None, 'max_date': None, 'rows': 0
+                        }
+                    writers[key].write_table(table.take(positions))
+                    dates = service.iloc[positions].dropna()
+                    part = parts[key]
+                    part['rows'] += len(positions)
+                    if not dates.empty:
+                        low, high = dates.min().date().isoformat(), dates.max().date().isoformat()
+                        part['min_date'] = min(part['min_date'] or low, low)
+                        part['max_date'] = max(part['max_date'] or high, high)
+            for writer in writers.values():
+                writer.close()
+
+            manifest = {
+                'version': MANIFEST_VERSION,
+                'scheme': self.scheme,
+                **meta,
+                'rows': sum(p['rows'] for p in parts.values()),
+                'partitions': sorted(parts.values(), key=lambda p: (p['month'] or '9999', *(p[c] or '' for c in self.columns)))
+            }
+            with open(os.path.join(tmp_root, MANIFEST_NAME), 'w') as f:
+                json.dump(manifest, f, indent=1)
+
+            if os.path.exists(self.root):
+                os.replace(self.root, old_root)
+            os.replace(tmp_root, self.root)
+            return manifest
+        finally:
+            for writer in writers.values():
+                writer.close()
+            shutil.rmtree(tmp_root, ignore_errors=True)
+            shutil.rmtree(old_root, ignore_errors=True)
+
+    def select(
+        self,
+        manifest: Dict[str, Any],
+        start_date: Any = None,
+        end_date: Any = None,
+        facilities: Optional[Collection[str]] = None,
+        months: Optional[Collection[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Manifest entries of the partitions that can hold rows matching the filters."""
+        start = pd.Timestamp(start_date) if start_date is not None else None
+        end = pd.Timestamp(end_date) if end_date is not None else None
+        selected = []
+        for part in manifest['partitions']:
+            if part['min_date'] is None:
+                if start is None and end is None and not months:
+                    selected.append(part)
+                continue
+            if start is not None and pd.Timestamp(part['max_date']) < start:
+                continue
+            if end is not None and pd.Timestamp(part['min_date']) > end:
+                continue
+            if months and int(part['month'][5:7]) not in months:
+                continue
+            if facilities is not None and 'facility' in self.columns and part['facility'] not in facilities:
+                continue
+            selected.append(part)
+        return selected
+
+    def read(
+        self,
+        manifest: Dict[str, Any],
+        start_date: Any = None,
+        end_date: Any = None,
+        facilities: Optional[Collection[str]] = None,
+        months: Optional[Collection[int]] = None
+    ) -> pd.DataFrame:
+        """Loads the matching claims from the selected partitions only."""
+        parts = self.select(manifest, start_date, end_date, facilities, months)
+        if not parts:
+            if not manifest['partitions']:
+                return pd.DataFrame()
+            # Nothing matches; an empty frame in the store's layout
+            parts, start_date = manifest['partitions'][:1], pd.Timestamp.max
+        tables = [feather.read_table(os.path.join(self.root, p['path']), memory_map=True) for p in parts]
+        df = pa.concat_tables(tables).to_pandas()
+        return filter_claims(df, start_date, end_date, facilities, months)
@@ -36,4 +36,5 @@ class DataQualityReport(BaseModel):
     missing_payer_name: int
     future_service_dates: int
     validation_errors: List[str]
+    memory_bytes: int = 0 # Deep memory usage of the loaded frame
     status: str = "success"
@@ -1,124 +1,435 @@
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
+"""
+Synthetic hospital claims for demos, tests and load testing.
+
+Every column is drawn as a whole array from a seeded np.random.Generator, so a
+million claims take about a second. Large extracts are written in chunks, so
+memory stays bounded by the chunk size rather than the row count.
+
+Extracts are planned as partitions (fixed row ranges or service months), each
+drawn from its own stream spawned from one SeedSequence. Partitions can be
+written to separate files by a process pool, and the output for a seed is the
+same whatever the number of workers.
+
+Usage:
+    python -m data.synthetic_generator                                   # bundled 15k-row CSV
+    python -m data.synthetic_generator --rows 20000000 --output /tmp/claims.parquet
+    python -m data.synthetic_generator --claims-per-day 20000 --start-date 2021-01-01 --end-date 2026-01-01 \
+        --facilities 12 --payers 20 --partition-by month --workers 8 --output /tmp/claims/
+"""
+import argparse
 import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional, List, Dict, Any
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # CSV falls back to pandas; Parquet output needs pyarrow
+    pa = None
+
+DEFAULT_OUTPUT_PATH = os.path.join(os.path.dirname(__file__), 'synthetic_hospital_data.csv')
+
+# Payers and their characteristics
+PAYERS = {
+    'UnitedHealthcare': {'weight': 0.25, 'category': 'Commercial', 'denial_rate': 0.12, 'payment_lag_avg': 45},
+    'Aetna': {'weight': 0.15, 'category': 'Commercial', 'denial_rate': 0.11, 'payment_lag_avg': 50},
+    'BCBS': {'weight': 0.20, 'category': 'Commercial', 'denial_rate': 0.09, 'payment_lag_avg': 40},
+    'Medicare': {'weight': 0.20, 'category': 'Medicare', 'denial_rate': 0.05, 'payment_lag_avg': 20},
+    'Medicaid': {'weight': 0.10, 'category': 'Medicaid', 'denial_rate': 0.08, 'payment_lag_avg': 60},
+    'Self-Pay': {'weight': 0.10, 'category': 'Self-Pay', 'denial_rate': 0.15, 'payment_lag_avg': 90}
+}
+
+DENIAL_REASONS = {
+    'Prior Auth': 0.30,
+    'Medical Necessity': 0.25,
+    'Coding Error': 0.20,
+    'Timely Filing': 0.10,
+    'Missing Info': 0.15
+}
+TECHNICAL_DENIALS = ['Timely Filing', 'Missing Info']
+
+# Regional commercial plans added beyond the national payers, cycling through these parameters
+REGIONAL_PLAN_WEIGHT = 0.05
+REGIONAL_PLAN_DENIAL_RATES = [0.08, 0.10, 0.12, 0.14]
+REGIONAL_PLAN_LAGS = [35, 45, 55]
+
+CPT_CODES = ['99213', '99214', '99215', '45378', '45385', '70450', '71046']
+FACILITIES = ['Main Campus', 'East Wing']
+# Main Campus sees this many claims for each one at any other facility (80% with two facilities)
+MAIN_CAMPUS_WEIGHT = 4.0
+
+# Payer categories whose patients may pay part of their balance at the point of service
+POS_CATEGORIES = ['Commercial', 'Self-Pay']
+
+FIRST_CLAIM_NUMBER = 100000
+
+COLUMNS = [
+    'claim_id', 'service_date', 'payer_name', 'payer_category', 'cpt_code', 'charges', 'allowed_amount',
+    'payments', 'adjustments', 'patient_responsibility', 'pos_collections', 'claim_status', 'denial_reason',
+    'denial_category', 'charge_entry_date', 'claim_submission_date', 'payment_date', 'facility'
+]
+DATE_COLUMNS = ['service_date', 'charge_entry_date', 'claim_submission_date', 'payment_date']
+
+PARTITION_SCHEMES = ['rows', 'month']
+
+def _categorical(codes: np.ndarray, categories: list) -> pd.Categorical:
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+def payer_table(num_payers: int = len(PAYERS)) -> pd.DataFrame:
+    """
+    Payer mix for num_payers payers, one row each (weight, category,
+    denial_rate, payment_lag_avg). Up to six these are the national payers in
+    PAYERS order; beyond that regional commercial plans are added. Weights
+    are renormalized to sum to 1.
+    """
+    if num_payers < 1:
+        raise ValueError("num_payers must be at least 1")
+    table = pd.DataFrame.from_dict(PAYERS, orient='index').iloc[:num_payers]
+    regional = pd.DataFrame([
+        {
+            'weight': REGIONAL_PLAN_WEIGHT,
+            'category': 'Commercial',
+            'denial_rate': REGIONAL_PLAN_DENIAL_RATES[i % len(REGIONAL_PLAN_DENIAL_RATES)],
+            'payment_lag_avg': REGIONAL_PLAN_LAGS[i % len(REGIONAL_PLAN_LAGS)]
+        }
+        for i in range(num_payers - len(table))
+    ], index=[f'Regional Plan {i + 1}' for i in range(num_payers - len(table))], columns=table.columns)
+    table = pd.concat([table, regional]) if len(regional) else table
+    table['weight'] = table['weight'] / table['weight'].sum()
+    return table
+
+def facility_weights(num_facilities: int = len(FACILITIES)) -> pd.Series:
+    """Share of claims per facility: Main Campus, East Wing, then outpatient clinics."""
+    if num_facilities < 1:
+        raise ValueError("num_facilities must be at least 1")
+    names = (FACILITIES + [f'Clinic {i}' for i in range(1, num_facilities - len(FACILITIES) + 1)])[:num_facilities]
+    weights = pd.Series(1.0, index=names)
+    weights.iloc[0] = MAIN_CAMPUS_WEIGHT
+    return weights / weights.sum()
+
+def generate_claims(
+    num_rows: int,
+    start_date: str = '2024-01-01',
+    end_date: str = '2025-12-31',
+    rng: Optional[np.random.Generator] = None,
+    first_id: int = 0,
+    payers: Optional[pd.DataFrame] = None,
+    facilities: Optional[pd.Series] = None
+) -> pd.DataFrame:
+    """
+    One frame of synthetic claims, every column drawn as an array.
+
+    Service dates fall in [start_date, end_date). Text columns are
+    categoricals and dates are datetime64[s] (NaT for unpaid claims), as in
+    DataLoader's typed layout. Claim ids run from CLM-{100000 + first_id}, so
+    consecutive chunks get unique ids. payers and facilities default to
+    payer_table() and facility_weights().
+    """
+    rng = rng if rng is not None else np.random.default_rng(42)
+    payer_info = payers if payers is not None else payer_table()
+    facilities = facilities if facilities is not None else facility_weights()
+    payer_names = list(payer_info.index)
+    categories = list(dict.fromkeys(payer_info['category']))
+    reasons = list(DENIAL_REASONS)
+
+    # Payer and its per-payer parameters, looked up by code
+    payer = rng.choice(len(payer_names), size=num_rows, p=payer_info['weight'].to_numpy())
+    category = np.array([categories.index(c) for c in payer_info['category']])[payer]
+    denial_rate = payer_info['denial_rate'].to_numpy()[payer]
+    lag_avg = payer_info['payment_lag_avg'].to_numpy()[payer]
 
-def generate_synthetic_data(num_rows=15000, start_date='2024-01-01', end_date='2025-12-31'):
-    """Generates synthetic hospital financial data for testing."""
-    np.random.seed(42)  # For reproducibility
-
-    # Payers and their characteristics
-    payers = {
-        'UnitedHealthcare': {'weight': 0.25, 'category': 'Commercial', 'denial_rate': 0.12, 'payment_lag_avg': 45},
-        'Aetna': {'weight': 0.15, 'category': 'Commercial', 'denial_rate': 0.11, 'payment_lag_avg': 50},
-        'BCBS': {'weight': 0.20, 'category': 'Commercial', 'denial_rate': 0.09, 'payment_lag_avg': 40},
-        'Medicare': {'weight': 0.20, 'category': 'Medicare', 'denial_rate': 0.05, 'payment_lag_avg': 20},
-        'Medicaid': {'weight': 0.10, 'category': 'Medicaid', 'denial_rate': 0.08, 'payment_lag_avg': 60},
-        'Self-Pay': {'weight': 0.10, 'category': 'Self-Pay', 'denial_rate': 0.15, 'payment_lag_avg': 90}
-    }
-
-    payer_names = list(payers.keys())
-    payer_weights = [p['weight'] for p in payers.values()]
-
-    # Denial Reasons
-    denial_reasons = {
-        'Prior Auth': 0.30,
-        'Medical Necessity': 0.25,
-        'Coding Error': 0.20,
-        'Timely Filing': 0.10,
-        'Missing Info': 0.15
-    }
-    reasons = list(denial_reasons.keys())
-    reason_weights = list(denial_reasons.values())
-
-    # Generate dates
-    start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-    end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-    delta_days = (end_dt - start_dt).days
-    
-    # Pre-generate random values
-    claims_payer = np.random.choice(payer_names, size=num_rows, p=payer_weights)
-    claims_service_date = [start_dt + timedelta(days=np.random.randint(0, delta_days)) for _ in range(num_rows)]
-    
-    data = []
-    for i in range(num_rows):
-        payer_name = claims_payer[i]
-        payer_info = payers[payer_name]
-        service_date = claims_service_date[i]
-        
-        # Charges: weighted toward 500-5000
-        if np.random.random() < 0.8:
-            charges = np.random.uniform(500, 5000)
-        else:
-            charges = np.random.uniform(5000, 45000)
-            
-        # Allowed Amount: usually 40-70% of charges
-        allowed_pct = np.random.uniform(0.4, 0.7)
-        allowed_amount = charges * allowed_pct
-        
-        # Denial logic
-        is_denied = np.random.random() < payer_info['denial_rate']
-        
-        # Claim Status
-        if is_denied:
-            claim_status = 'Denied'
-            denial_reason = np.random.choice(reasons, p=reason_weights)
-            denial_category = 'Technical' if denial_reason in ['Timely Filing', 'Missing Info'] else 'Clinical'
-            payments = 0
-            patient_responsibility = 0
-            payment_date = None
-        else:
-            claim_status = 'Paid'
-            denial_reason = None
-            denial_category = None
-            # Payments: 70-90% of allowed
-            payments = allowed_amount * np.random.uniform(0.7, 0.9)
-            patient_responsibility = allowed_amount - payments
-            
-            # Payment Date
-            lag = np.random.normal(payer_info['payment_lag_avg'], 10)
-            lag = max(1, int(lag))
-            payment_date = service_date + timedelta(days=lag)
-
-        # POS Collections: 10-30% of patient responsibility for some
-        pos_collections = 0
-        if payer_info['category'] == 'Commercial' or payer_info['category'] == 'Self-Pay':
-             if np.random.random() < 0.6: # 60% chance they pay something at POS
-                pos_collections = patient_responsibility * np.random.uniform(0.1, 0.5)
-
-        # Charge entry date: 1-5 days after service date
-        charge_entry_date = service_date + timedelta(days=np.random.randint(1, 5))
-        
-        # Claim submission date: 1-3 days after charge entry
-        claim_submission_date = charge_entry_date + timedelta(days=np.random.randint(1, 3))
-
-        data.append({
-            'claim_id': f'CLM-{100000 + i}',
-            'service_date': service_date.strftime('%Y-%m-%d'),
-            'payer_name': payer_name,
-            'payer_category': payer_info['category'],
-            'cpt_code': np.random.choice(['99213', '99214', '99215', '45378', '45385', '70450', '71046']),
-            'charges': round(charges, 2),
-            'allowed_amount': round(allowed_amount, 2),
-            'payments': round(payments, 2),
-            'adjustments': round(charges - allowed_amount, 2),
-            'patient_responsibility': round(patient_responsibility, 2),
-            'pos_collections': round(pos_collections, 2),
-            'claim_status': claim_status,
-            'denial_reason': denial_reason,
-            'denial_category': denial_category,
-            'charge_entry_date': charge_entry_date.strftime('%Y-%m-%d'),
-            'claim_submission_date': claim_submission_date.strftime('%Y-%m-%d'),
-            'payment_date': payment_date.strftime('%Y-%m-%d') if payment_date else None,
-            'facility': 'Main Campus' if np.random.random() < 0.8 else 'East Wing'
-        })
-
-    df = pd.DataFrame(data)
-    
-    # Save to CSV
-    output_path = os.path.join(os.path.dirname(__file__), 'synthetic_hospital_data.csv')
-    df.to_csv(output_path, index=False)
+    # Charges: weighted toward 500-5000; allowed is usually 40-70% of charges
+    charges = np.where(rng.random(num_rows) < 0.8, rng.uniform(500, 5000, num_rows), rng.uniform(5000, 45000, num_rows))
+    allowed = charges * rng.uniform(0.4, 0.7, num_rows)
+
+    denied = rng.random(num_rows) < denial_rate
+    reason = np.where(denied, rng.choice(len(reasons), size=num_rows, p=list(DENIAL_REASONS.values())), -1)
+    technical = np.isin(reason, [reasons.index(r) for r in TECHNICAL_DENIALS])
+
+    # Paid claims: 70-90% of allowed, the rest is the patient's
+    payments = np.where(denied, 0.0, allowed * rng.uniform(0.7, 0.9, num_rows))
+    patient_responsibility = np.where(denied, 0.0, allowed - payments)
+    pos_eligible = payer_info['category'].isin(POS_CATEGORIES).to_numpy()[payer]
+    pays_at_pos = pos_eligible & (rng.random(num_rows) < 0.6)
+    pos_collections = np.where(pays_at_pos, patient_responsibility * rng.uniform(0.1, 0.5, num_rows), 0.0)
+
+    # Dates as day offsets; bounds are exclusive as in np.random.randint
+    start = np.datetime64(start_date, 'D')
+    delta_days = int((np.datetime64(end_date, 'D') - start).astype(np.int64))
+    service = start + rng.integers(0, delta_days, num_rows)
+    charge_entry = service + rng.integers(1, 5, num_rows)
+    submission = charge_entry + rng.integers(1, 3, num_rows)
+    lag = np.maximum(1, np.trunc(rng.normal(lag_avg, 10)).astype(np.int64))
+    payment = np.where(denied, np.datetime64('NaT', 'D'), service + lag)
+
+    claim_numbers = pd.RangeIndex(FIRST_CLAIM_NUMBER + first_id, FIRST_CLAIM_NUMBER + first_id + num_rows)
+    df = pd.DataFrame({
+        'claim_id': 'CLM-' + claim_numbers.astype(str),
+        'service_date': service.astype('datetime64[s]'),
+        'payer_name': _categorical(payer, payer_names),
+        'payer_category': _categorical(category, categories),
+        'cpt_code': _categorical(rng.integers(0, len(CPT_CODES), num_rows), CPT_CODES),
+        'charges': charges.round(2),
+        'allowed_amount': allowed.round(2),
+        'payments': payments.round(2),
+        'adjustments': (charges - allowed).round(2),
+        'patient_responsibility': patient_responsibility.round(2),
+        'pos_collections': pos_collections.round(2),
+        'claim_status': _categorical(np.where(denied, 0, 1), ['Denied', 'Paid']),
+        'denial_reason': _categorical(reason, reasons),
+        'denial_category': _categorical(np.where(denied, np.where(technical, 0, 1), -1), ['Technical', 'Clinical']),
+        'charge_entry_date': charge_entry.astype('datetime64[s]'),
+        'claim_submission_date': submission.astype('datetime64[s]'),
+        'payment_date': payment.astype('datetime64[s]'),
+        'facility': _categorical(rng.choice(len(facilities), size=num_rows, p=facilities.to_numpy()), list(facilities.index))
+    })
+    return df
+
+def _days(start_date: str, end_date: str) -> int:
+    return int((np.datetime64(end_date, 'D') - np.datetime64(start_date, 'D')).astype(np.int64))
+
+def plan_partitions(
+    num_rows: int,
+    start_date: str = '2024-01-01',
+    end_date: str = '2025-12-31',
+    chunk_size: int = 1_000_000,
+    partition_by: str = 'rows'
+) -> List[Dict[str, Any]]:
+    """
+    Splits an extract into partitions: 'rows' gives chunk_size-row slices of
+    the whole date range, 'month' one partition per service month with rows
+    in proportion to its days. Each is {label, start_date, end_date,
+    num_rows, first_id}; the plan depends only on its arguments.
+    """
+    if partition_by not in PARTITION_SCHEMES:
+        raise ValueError(f"Unsupported partition scheme: {partition_by}")
+    if partition_by == 'rows':
+        return [
+            {'label': f'part-{i:05d}', 'start_date': start_date, 'end_date': end_date,
+             'num_rows': min(chunk_size, num_rows - first_id), 'first_id': first_id}
+            for i, first_id in enumerate(range(0, num_rows, chunk_size))
+        ]
+
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    bounds = [start] + [m for m in pd.date_range(start, end, freq='MS') if start < m < end] + [end]
+    days = np.array([(b - a).days for a, b in zip(bounds[:-1], bounds[1:])])
+    first_ids = np.round(num_rows * np.r_[0, days.cumsum()] / days.sum()).astype(np.int64)
+    partitions = [
+        {'label': a.strftime('%Y-%m'), 'start_date': a.strftime('%Y-%m-%d'), 'end_date': b.strftime('%Y-%m-%d'),
+         'num_rows': int(first_ids[i + 1] - first_ids[i]), 'first_id': int(first_ids[i])}
+        for i, (a, b) in enumerate(zip(bounds[:-1], bounds[1:]))
+    ]
+    return [p for p in partitions if p['num_rows'] > 0]
+
+def partition_frames(
+    partition: Dict[str, Any],
+    seed_sequence: np.random.SeedSequence,
+    chunk_size: int = 1_000_000,
+    payers: Optional[pd.DataFrame] = None,
+    facilities: Optional[pd.Series] = None
+) -> Iterator[pd.DataFrame]:
+    """Yields one partition's claims in frames of at most chunk_size rows, drawn from its own stream."""
+    rng = np.random.default_rng(seed_sequence)
+    for offset in range(0, partition['num_rows'], chunk_size):
+        yield generate_claims(
+            min(chunk_size, partition['num_rows'] - offset), partition['start_date'], partition['end_date'],
+            rng, partition['first_id'] + offset, payers, facilities
+        )
+
+def iter_claim_chunks(
+    num_rows: int,
+    chunk_size: int = 1_000_000,
+    start_date: str = '2024-01-01',
+    end_date: str = '2025-12-31',
+    seed: int = 42,
+    partition_by: str = 'rows',
+    payers: Optional[pd.DataFrame] = None,
+    facilities: Optional[pd.Series] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Yields num_rows claims as frames of at most chunk_size rows, partition by
+    partition. Partition i draws from SeedSequence(seed).spawn()[i], so the
+    frames match what write_partitioned_data writes for the same arguments.
+    """
+    plan = plan_partitions(num_rows, start_date, end_date, chunk_size, partition_by)
+    for partition, seed_sequence in zip(plan, np.random.SeedSequence(seed).spawn(len(plan))):
+        yield from partition_frames(partition, seed_sequence, chunk_size, payers, facilities)
+
+def _arrow_table(df: pd.DataFrame, text_dictionaries: bool) -> 'pa.Table':
+    """Dates become date32; categoricals stay dictionary-encoded for Parquet and become plain strings for CSV."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema = pa.schema([
+        pa.field(f.name, pa.date32()) if f.name in DATE_COLUMNS
+        else pa.field(f.name, pa.string()) if pa.types.is_dictionary(f.type) and not text_dictionaries
+        else f
+        for f in table.schema
+    ])
+    return table.cast(schema)
+
+def _file_format(output_path: str, file_format: Optional[str]) -> str:
+    file_format = file_format or ('parquet' if output_path.endswith('.parquet') else 'csv')
+    if file_format not in ('csv', 'parquet'):
+        raise ValueError(f"Unsupported output format: {file_format}")
+    if file_format == 'parquet' and pa is None:
+        raise ImportError("Parquet output requires pyarrow")
+    return file_format
+
+def _write_frames(output_path: str, frames: Iterator[pd.DataFrame], file_format: str) -> int:
+    """Writes frames to one file as they arrive; returns the row count."""
+    rows = 0
+    if pa is None:
+        for i, chunk in enumerate(frames):
+            chunk.to_csv(output_path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+            rows += len(chunk)
+        return rows
+
+    writer = None
+    try:
+        for chunk in frames:
+            table = _arrow_table(chunk, text_dictionaries=file_format == 'parquet')
+            if writer is None:
+                if file_format == 'parquet':
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                else:
+                    writer = pa_csv.CSVWriter(output_path, table.schema, write_options=pa_csv.WriteOptions(quoting_style='needed'))
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+def write_synthetic_data(
+    output_path: str,
+    num_rows: int,
+    chunk_size: int = 1_000_000,
+    start_date: str = '2024-01-01',
+    end_date: str = '2025-12-31',
+    seed: int = 42,
+    file_format: Optional[str] = None,
+    num_payers: int = len(PAYERS),
+    num_facilities: int = len(FACILITIES)
+) -> str:
+    """
+    Writes num_rows synthetic claims to CSV or Parquet, one chunk at a time.
+
+    file_format defaults to the output extension ('.parquet' or '.csv'). Only
+    one chunk is held in memory; the output for a given seed and chunk_size
+    is identical from run to run.
+    """
+    file_format = _file_format(output_path, file_format)
+    frames = iter_claim_chunks(
+        num_rows, chunk_size, start_date, end_date, seed,
+        payers=payer_table(num_payers), facilities=facility_weights(num_facilities)
+    )
+    _write_frames(output_path, frames, file_format)
+    return output_path
+
+def _write_partition(path, partition, seed_sequence, chunk_size, payers, facilities, file_format) -> str:
+    """Process pool task: generates and writes one partition file."""
+    _write_frames(path, partition_frames(partition, seed_sequence, chunk_size, payers, facilities), file_format)
+    return path
+
+def write_partitioned_data(
+    output_dir: str,
+    num_rows: int,
+    chunk_size: int = 1_000_000,
+    start_date: str = '2024-01-01',
+    end_date: str = '2025-12-31',
+    seed: int = 42,
+    file_format: str = 'parquet',
+    partition_by: str = 'rows',
+    workers: Optional[int] = None,
+    num_payers: int = len(PAYERS),
+    num_facilities: int = len(FACILITIES)
+) -> List[str]:
+    """
+    Writes num_rows synthetic claims as one file per partition
+    (claims-<label>.<format> in output_dir), generated in parallel by up to
+    `workers` processes (default: one per CPU; 1 runs in this process).
+
+    Each partition has its own seed stream, so files are identical for any
+    worker count, and concatenated in plan order they equal
+    iter_claim_chunks() with the same arguments. Returns the paths in plan
+    order.
+    """
+    file_format = _file_format('', file_format)
+    os.makedirs(output_dir, exist_ok=True)
+    plan = plan_partitions(num_rows, start_date, end_date, chunk_size, partition_by)
+    tasks = [
+        (os.path.join(output_dir, f"claims-{partition['label']}.{file_format}"), partition, seed_sequence,
+         chunk_size, payer_table(num_payers), facility_weights(num_facilities), file_format)
+        for partition, seed_sequence in zip(plan, np.random.SeedSequence(seed).spawn(len(plan)))
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(tasks)) or 1
+    if workers == 1:
+        return [_write_partition(*task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_write_partition, *zip(*tasks)))
+
+def generate_synthetic_data(
+    num_rows=15000,
+    start_date='2024-01-01',
+    end_date='2025-12-31',
+    output_path=None,
+    seed=42,
+    claims_per_day=None,
+    num_payers=len(PAYERS),
+    num_facilities=len(FACILITIES),
+    partition_by=None,
+    workers=1,
+    file_format=None,
+    chunk_size=1_000_000
+):
+    """
+    Generates synthetic hospital financial data for testing.
+
+    claims_per_day, when given, sets the volume instead of num_rows. With
+    partition_by ('rows' or 'month') or more than one worker, output_path is
+    a directory of partition files written in parallel (workers=None: one
+    per CPU).
+    """
+    output_path = output_path or DEFAULT_OUTPUT_PATH
+    if claims_per_day:
+        num_rows = claims_per_day * _days(start_date, end_date)
+    if partition_by or workers != 1:
+        paths = write_partitioned_data(
+            output_path, num_rows, chunk_size, start_date, end_date, seed,
+            file_format=file_format or 'parquet', partition_by=partition_by or 'rows', workers=workers,
+            num_payers=num_payers, num_facilities=num_facilities
+        )
+        print(f"Generated {num_rows} rows of synthetic data in {len(paths)} files under {output_path}")
+        return paths
+    write_synthetic_data(
+        output_path, num_rows, chunk_size, start_date, end_date, seed, file_format=file_format,
+        num_payers=num_payers, num_facilities=num_facilities
+    )
     print(f"Generated {num_rows} rows of synthetic data at {output_path}")
+    return output_path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=15000)
+    parser.add_argument('--claims-per-day', type=int, help="Volume per service day (overrides --rows)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_PATH, help="Destination .csv/.parquet file, or directory when partitioned")
+    parser.add_argument('--format', choices=['csv', 'parquet'], help="Defaults to the output extension (Parquet when partitioned)")
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    parser.add_argument('--start-date', default='2024-01-01')
+    parser.add_argument('--end-date', default='2025-12-31')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--payers', type=int, default=len(PAYERS))
+    parser.add_argument('--facilities', type=int, default=len(FACILITIES))
+    parser.add_argument('--partition-by', choices=PARTITION_SCHEMES)
+    parser.add_argument('--workers', type=int, default=1, help="Processes for partitioned output (0: one per CPU)")
+    args = parser.parse_args()
+
+    generate_synthetic_data(
+        args.rows, args.start_date, args.end_date, args.output, args.seed, args.claims_per_day,
+        args.payers, args.facilities, args.partition_by, args.workers or None, args.format, args.chunk_size
+    )
 
 if __name__ == "__main__":
-    generate_synthetic_data()
+    main()
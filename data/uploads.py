@@ -0,0 +1,134 @@
+import os
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from itertools import islice
+from typing import Optional, Iterator, BinaryIO
+import pandas as pd
+from .loader import DataLoader, QualityCounters
+from .dataset import ClaimsDataset, claims_dataset
+from .schemas import DataQualityReport
+
+try:
+    import openpyxl
+except ImportError:  # Only XLSX uploads need it
+    openpyxl = None
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_FORMATS = ['csv', 'xlsx']
+
+class UploadJob:
+    """
+    One uploaded file moving through the pipeline. The worker thread updates
+    the progress fields; UI sessions only read them.
+    """
+
+    def __init__(self, filename: str, size: int):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.size = size
+        self.status = "queued" # queued -> running -> appending -> done | error
+        self.progress = 0.0 # Fraction of the file read
+        self.rows_read = 0
+        self.report: Optional[DataQualityReport] = None
+        self.version: Optional[int] = None # Dataset version that includes the appended rows
+        self.error: Optional[str] = None
+        self.future: Optional[Future] = None
+
+    def done(self) -> bool:
+        return self.status in ("done", "error")
+
+class UploadProcessor:
+    """
+    Background worker pool, shared by every UI session, that ingests uploaded
+    claims files into the shared dataset.
+
+    A file is streamed in chunks through the loader's validation and
+    normalization (in the dataset's layout); rows failing validation are
+    counted in the job's report and left out. The valid rows are appended to
+    the dataset in one step once the whole file has been read, so a failed
+    upload leaves the dataset untouched. At most max_workers files are
+    processed at once; the rest queue. The script thread only submits and
+    polls, so a large upload never blocks a render.
+    """
+
+    def __init__(self, dataset: Optional[ClaimsDataset] = None, max_workers: int = 2, chunk_size: int = 100_000):
+        self.dataset = dataset if dataset is not None else claims_dataset
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="upload")
+            return self._executor
+
+    def submit(self, source: BinaryIO, filename: str) -> UploadJob:
+        """Queues a CSV/XLSX file object for ingestion and returns its job. The file must stay open until the job is done."""
+        file_format = os.path.splitext(filename)[1].lower().lstrip('.')
+        if file_format not in UPLOAD_FORMATS:
+            raise ValueError(f"Unsupported upload format: {filename}")
+        size = getattr(source, 'size', None)
+        if size is None:
+            size = source.seek(0, os.SEEK_END)
+        source.seek(0)
+        job = UploadJob(filename, size)
+        job.future = self._ensure_executor().submit(self._run, job, source, file_format)
+        return job
+
+    def _run(self, job: UploadJob, source: BinaryIO, file_format: str) -> UploadJob:
+        job.status = "running"
+        try:
+            loader = self.dataset.loader
+            counters = QualityCounters()
+            raw_chunks = self._csv_chunks(job, source, loader) if file_format == 'csv' else self._xlsx_chunks(job, source, loader)
+            frames = [df for df in loader.normalize_chunks(raw_chunks, counters, drop_invalid=True) if not df.empty]
+            job.report = counters.report()
+            job.progress = 1.0
+
+            job.status = "appending"
+            if frames:
+                job.version = self.dataset.append(pd.concat(frames, ignore_index=True))
+            job.status = "done"
+            logger.info(f"Upload {job.filename}: {job.report.valid_rows} rows appended, {job.report.invalid_rows} rejected")
+        except Exception as e:
+            logger.error(f"Error processing upload {job.filename}: {str(e)}")
+            job.error = str(e)
+            job.status = "error"
+        return job
+
+    def _csv_chunks(self, job: UploadJob, source: BinaryIO, loader: DataLoader) -> Iterator[pd.DataFrame]:
+        with pd.read_csv(source, chunksize=self.chunk_size, dtype=loader.text_dtypes()) as reader:
+            for raw in reader:
+                job.rows_read += len(raw)
+                job.progress = min(source.tell() / job.size, 1.0) if job.size else 0.0
+                yield raw
+
+    def _xlsx_chunks(self, job: UploadJob, source: BinaryIO, loader: DataLoader) -> Iterator[pd.DataFrame]:
+        """Reads the first sheet row by row (read-only mode), so the workbook is never fully loaded."""
+        if openpyxl is None:
+            raise ImportError("XLSX uploads require openpyxl")
+        workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+        try:
+            sheet = workbook.active
+            rows = sheet.iter_rows(values_only=True)
+            header = [str(name) for name in next(rows, ())]
+            total = max((sheet.max_row or 0) - 1, 1)
+            text_dtypes = {c: dtype for c, dtype in loader.text_dtypes().items() if c in header}
+            while batch := list(islice(rows, self.chunk_size)):
+                raw = pd.DataFrame(batch, columns=header)
+                for col, dtype in text_dtypes.items():
+                    # Cells keep their Excel types (cpt codes as numbers); convert only filled ones so blanks stay missing
+                    raw[col] = raw[col].where(raw[col].isna(), raw[col].astype(str)).astype(dtype)
+                job.rows_read += len(raw)
+                job.progress = min(job.rows_read / total, 1.0)
+                yield raw
+        finally:
+            workbook.close()
+
+# Shared by all UI sessions
+upload_processor = UploadProcessor()
@@ -0,0 +1,82 @@
+import pandas as pd
+import numpy as np
+from datetime import date
+from typing import Dict, List, NamedTuple, Union, get_args, get_origin
+from annotated_types import Ge
+from .schemas import ClaimRecord
+
+class ClaimValidationResult(NamedTuple):
+    """Outcome of validating a claims frame column by column."""
+    frame: pd.DataFrame # Normalized frame (date fields parsed to datetime64)
+    failures: Dict[str, pd.Series] # Per-field boolean failure masks, aligned to frame.index
+    invalid_mask: pd.Series # True where any field failed
+    errors: List[str] # First-N human readable messages
+
+def _is_optional(annotation) -> bool:
+    return get_origin(annotation) is Union and type(None) in get_args(annotation)
+
+def _base_type(annotation):
+    if _is_optional(annotation):
+        return next(a for a in get_args(annotation) if a is not type(None))
+    return annotation
+
+def validate_claims(df: pd.DataFrame, max_errors: int = 10) -> ClaimValidationResult:
+    """
+    Validates a raw claims frame against the rules declared on ClaimRecord using
+    whole-column masks instead of constructing one model per row.
+
+    Rules (read from ClaimRecord.model_fields):
+    - required fields must be present and non-null
+    - non-optional fields with defaults may be absent, but not null when present
+    - date fields must parse as ISO dates
+    - numeric fields must be numeric and satisfy their `ge` bounds
+    """
+    frame = df.copy()
+    failures: Dict[str, pd.Series] = {}
+    messages: Dict[str, str] = {}
+
+    for name, field in ClaimRecord.model_fields.items():
+        nullable = _is_optional(field.annotation)
+        base = _base_type(field.annotation)
+
+        if name not in frame.columns:
+            if field.is_required():
+                failures[name] = pd.Series(True, index=frame.index)
+                messages[name] = "field required"
+            continue
+
+        col = frame[name]
+        raw_null = col.isna()
+        mask = pd.Series(False, index=frame.index) if nullable else raw_null.copy()
+        reason = "must not be null"
+
+        if base is date:
+            parsed = pd.to_datetime(col, errors='coerce')
+            mask |= parsed.isna() & ~raw_null
+            frame[name] = parsed
+            reason = "invalid or missing date"
+        elif base is float:
+            numeric = pd.to_numeric(col, errors='coerce')
+            mask |= numeric.isna() & ~raw_null
+            for constraint in field.metadata:
+                if isinstance(constraint, Ge):
+                    mask |= ~(numeric >= constraint.ge) & ~raw_null
+                    reason = f"must be a number >= {constraint.ge}"
+
+        if mask.any():
+            failures[name] = mask
+            messages[name] = reason
+
+    if failures:
+        invalid_mask = np.logical_or.reduce([m.to_numpy() for m in failures.values()])
+        invalid_mask = pd.Series(invalid_mask, index=frame.index)
+    else:
+        invalid_mask = pd.Series(False, index=frame.index)
+
+    # Only the first few invalid rows get a message, so build them lazily
+    errors = []
+    for pos in np.flatnonzero(invalid_mask.to_numpy())[:max_errors]:
+        failed = [f"{name}: {messages[name]}" for name, m in failures.items() if m.iat[pos]]
+        errors.append(f"Row {frame.index[pos]}: {'; '.join(failed)}")
+
+    return ClaimValidationResult(frame, failures, invalid_mask, errors)
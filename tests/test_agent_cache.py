@@ -0,0 +1,50 @@
+import pytest
+from data.cache import QueryCache, TieredQueryCache
+from agent.nodes import query_cache as cache_nodes
+from agent.nodes.query_cache import normalize_query
+from agent.intent_index import SemanticIntentIndex
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    from config.settings import settings
+    from agent.orchestrator import run_agent
+    monkeypatch.setattr(settings, "anthropic_api_key", None)
+    store = QueryCache(str(tmp_path / "cache.db"), expiry_interval=None)
+    monkeypatch.setattr(cache_nodes, "query_cache", TieredQueryCache(store))
+    monkeypatch.setattr(cache_nodes, "intent_index", SemanticIntentIndex())
+    yield run_agent
+    store.close()
+
+def test_normalize_query():
+    """Case, whitespace and trailing punctuation do not change the intent key."""
+    assert normalize_query("  What's our  Denial rate?? ") == "what's our denial rate"
+
+def test_repeat_question_skips_parser_and_analysis(agent, monkeypatch):
+    """A repeated question is answered from both cache levels without running the nodes."""
+    first = agent("What's our denial rate for Aetna?")
+    assert first["cache_hits"] == []
+
+    def fail(state):
+        raise AssertionError("node should have been skipped")
+    monkeypatch.setattr(cache_nodes.claims_dataset, "get", fail)
+
+    second = agent("what's our denial rate for aetna")
+    assert second["cache_hits"] == ["intent", "result"]
+    assert second["data_result"] == first["data_result"]
+    assert second["answer"] == first["answer"]
+
+def test_dataset_version_invalidates_results(agent, monkeypatch):
+    """Results cached for an older data version are not reused."""
+    agent("What's our denial rate for Aetna?")
+    monkeypatch.setattr(cache_nodes.claims_dataset, "get_version_key", lambda: "new-version")
+
+    result = agent("What's our denial rate for Aetna?")
+    assert result["cache_hits"] == ["intent"]
+
+def test_paraphrase_reuses_intent(agent):
+    """A reworded question with the same entities skips the parser via the semantic index."""
+    first = agent("What's our denial rate for Aetna?")
+
+    second = agent("Show me the denial rate for Aetna")
+    assert second["cache_hits"] == ["semantic_intent", "result"]
+    assert second["data_result"] == first["data_result"]
@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+from datetime import date
+from data.calculator import KPICalculator
+from data.aggregates import KPIAggregates
+
+def _claims_frame():
+    return pd.DataFrame({
+        'service_date': ['2025-01-03', '2025-01-20', '2025-02-11', '2025-02-14', '2025-03-02', '2025-03-02'],
+        'charge_entry_date': ['2025-01-05', '2025-01-21', '2025-02-15', '2025-02-16', '2025-03-03', '2025-03-06'],
+        'payer_name': ['Aetna', 'Medicare', 'Aetna', 'Aetna', 'Medicare', 'Aetna'],
+        'facility': ['Main Campus', 'Main Campus', 'East Wing', 'Main Campus', 'East Wing', 'Main Campus'],
+        'claim_status': ['Paid', 'Denied', 'Paid', 'Denied', 'Paid', 'Pending'],
+        'charges': [1000.0, 2000.0, 1500.0, 800.0, 1200.0, 900.0],
+        'allowed_amount': [600.0, 1100.0, 900.0, 500.0, 700.0, 450.0],
+        'payments': [500.0, 0.0, 800.0, 0.0, 650.0, 0.0],
+        'adjustments': [400.0, 900.0, 600.0, 300.0, 500.0, 450.0],
+        'patient_responsibility': [100.0, 0.0, 100.0, 0.0, 50.0, 0.0],
+        'pos_collections': [20.0, 0.0, 50.0, 0.0, 0.0, 0.0]
+    })
+
+def test_incremental_update_matches_full_build():
+    """Appending a batch gives the same KPIs as aggregating everything at once."""
+    df = _claims_frame()
+    incremental = KPIAggregates.from_frame(df.iloc[:4]).update(df.iloc[4:])
+    full = KPIAggregates.from_frame(df)
+
+    assert incremental.calculate() == full.calculate()
+    assert incremental.calculate() == KPICalculator().calculate_all(df)
+
+def test_batches_add_into_existing_cells_and_append_new_ones():
+    """Repeated batches over old, new and missing keys keep one cell per key."""
+    df = _claims_frame()
+    df.loc[5, 'facility'] = None
+    aggregates = KPIAggregates.from_frame(df.iloc[:3])
+    for batch in (df.iloc[3:5], df.iloc[5:], df.iloc[:2], df.iloc[5:]):
+        aggregates.update(batch)
+    full = KPIAggregates.from_frame(pd.concat([df, df.iloc[:2], df.iloc[5:]], ignore_index=True))
+
+    assert len(aggregates.cells) == len(full.cells) == len(aggregates.cells.drop_duplicates(aggregates.keys))
+    assert aggregates.calculate() == full.calculate()
+    assert aggregates.calculate_grouped('facility') == full.calculate_grouped('facility')
+
+def test_filters_match_calculate_all_on_slice():
+    """Date range and dimension filters are answered from cells alone."""
+    df = _claims_frame()
+    aggregates = KPIAggregates.from_frame(df)
+    result = aggregates.calculate(start_date=date(2025, 2, 1), end_date=date(2025, 3, 31), payer_name=['Aetna'])
+
+    expected = KPICalculator().calculate_all(df.iloc[[2, 3, 5]])
+    assert result == expected
+
+def test_merge_requires_same_dimensions():
+    """Merging states built over different dimensions is rejected."""
+    df = _claims_frame()
+    with pytest.raises(ValueError):
+        KPIAggregates.from_frame(df).merge(KPIAggregates.from_frame(df, dimensions=['payer_name']))
+
+def test_cube_trends_and_counts_match_raw_frame():
+    """Cube trends and dimension counts agree with scanning the raw rows."""
+    df = _claims_frame()
+    df['cpt_code'] = '99213'
+    cube = KPIAggregates.from_frame(df, dimensions=['payer_name', 'facility', 'claim_status', 'cpt_code'])
+
+    assert cube.calculate_trends(months=2) == KPICalculator().calculate_trends(df, months=2)
+    denials = cube.count('payer_name', claim_status='Denied')
+    assert denials.to_dict() == {'Aetna': 1, 'Medicare': 1}
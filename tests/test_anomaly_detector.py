@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.aggregates import KPIAggregates
+from data.anomalies import AnomalyDetector, StreamingAnomalyDetector
+
+def _weekly_claims(weeks=20, per_week=40, spike=None, seed=7):
+    """Stable claims for 3 payers x 2 facilities; `spike` = (payer, facility) denies half of its last week."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    start = pd.Timestamp('2025-01-06') # A Monday
+    for payer in ('Aetna', 'Medicare', 'Cigna'):
+        for facility in ('Main Campus', 'East Wing'):
+            for week in range(weeks):
+                denial_p = 0.5 if spike == (payer, facility) and week == weeks - 1 else 0.05
+                days = rng.integers(0, 7, per_week)
+                denied = rng.random(per_week) < denial_p
+                charges = rng.normal(1000, 50, per_week)
+                for day, is_denied, charge in zip(days, denied, charges):
+                    service = start + pd.Timedelta(weeks=week, days=int(day))
+                    rows.append({
+                        'service_date': service,
+                        'charge_entry_date': service + pd.Timedelta(days=2),
+                        'payer_name': payer,
+                        'facility': facility,
+                        'claim_status': 'Denied' if is_denied else 'Paid',
+                        'charges': charge,
+                        'allowed_amount': charge * 0.6,
+                        'payments': 0.0 if is_denied else charge * 0.55,
+                        'adjustments': charge * 0.4,
+                        'patient_responsibility': 50.0,
+                        'pos_collections': 10.0
+                    })
+    return pd.DataFrame(rows)
+
+def test_injected_spike_is_flagged():
+    df = _weekly_claims(spike=('Medicare', 'East Wing'))
+    anomalies = AnomalyDetector(metrics=['denial_rate']).detect(df)
+
+    assert [(a['payer_name'], a['facility']) for a in anomalies] == [('Medicare', 'East Wing')]
+    alert = anomalies[0]
+    assert alert['metric'] == 'denial_rate'
+    assert alert['value'] > alert['baseline']
+    assert alert['z_score'] >= 3.5
+    assert alert['period'] == '2025-05-19' # First day of the last week
+
+def test_stable_series_are_quiet():
+    assert AnomalyDetector().detect(_weekly_claims(), lookback=10) == []
+
+def test_cube_and_claims_give_same_result():
+    df = _weekly_claims(spike=('Aetna', 'Main Campus'))
+    detector = AnomalyDetector()
+    cube = KPIAggregates.from_frame(df, ('payer_name', 'facility', 'claim_status'))
+    assert detector.detect(cube) == detector.detect(df)
+
+def test_dimension_filters_narrow_series():
+    df = _weekly_claims(spike=('Aetna', 'Main Campus'))
+    detector = AnomalyDetector(metrics=['denial_rate'])
+    assert detector.detect(df, payer_name='Medicare') == []
+    assert len(detector.detect(df, payer_name=['Aetna', 'Cigna'])) == 1
+    with pytest.raises(KeyError):
+        detector.detect(df, cpt_code='99213')
+
+def test_rolling_baseline_excludes_current_point():
+    detector = AnomalyDetector(window=3, min_periods=2)
+    x = np.array([[1.0, 2.0, 3.0, 4.0, 100.0]])
+    mean, std = detector._rolling_baseline(x)
+    assert np.isnan(mean[0, :2]).all()
+    np.testing.assert_allclose(mean[0, 2:], [1.5, 2.0, 3.0])
+    np.testing.assert_allclose(std[0, 4], 1.0)
+
+def test_thin_periods_are_not_scored():
+    df = _weekly_claims(per_week=10, spike=('Aetna', 'Main Campus'))
+    assert AnomalyDetector(min_claims=20).detect(df) == []
+
+def _claim_stream(n, denial_p, seed, start='2025-03-01', payer='Aetna'):
+    rng = np.random.default_rng(seed)
+    service = pd.Timestamp(start) + pd.to_timedelta(np.arange(n) // 20, unit='D') # 20 claims a day
+    return pd.DataFrame({
+        'claim_id': [f"{payer}-{seed}-{i}" for i in range(n)],
+        'service_date': service,
+        'charge_entry_date': service + pd.to_timedelta(rng.integers(1, 4, n), unit='D'),
+        'payer_name': payer,
+        'claim_status': np.where(rng.random(n) < denial_p, 'Denied', 'Paid'),
+        'charges': 1000.0
+    })
+
+def test_stream_catches_denial_spike_same_day():
+    detector = StreamingAnomalyDetector().warm_up(_claim_stream(2000, 0.05, seed=1))
+    assert detector.ingest(_claim_stream(2000, 0.05, seed=2)) == []
+
+    alerts = list(detector.run(_claim_stream(20, 0.5, seed=3 + day, start=f'2025-06-{day:02d}') for day in (1, 2)))
+    assert alerts and alerts[0]['period'] == '2025-06-01'
+    assert alerts[0]['metric'] == 'denial_rate' and alerts[0]['payer_name'] == 'Aetna'
+    assert alerts[0]['value'] > alerts[0]['baseline']
+    assert len(alerts) == 1 # The series stays quiet while it is still elevated
+
+def test_alert_without_service_date_omits_the_day():
+    detector = StreamingAnomalyDetector().warm_up(_claim_stream(2000, 0.05, seed=1))
+    alerts = detector.ingest(_claim_stream(20, 0.5, seed=3, start='2025-06-01').drop(columns=['service_date']))
+    assert alerts and alerts[0]['period'] is None
+    assert "as of" not in alerts[0]['message'] and "None" not in alerts[0]['message']
+
+def test_warm_up_matches_sequential_statistics():
+    history = _claim_stream(500, 0.1, seed=4)
+    seeded = StreamingAnomalyDetector(min_observations=10**9).warm_up(history.iloc[:200]).warm_up(history.iloc[200:])
+    sequential = StreamingAnomalyDetector(min_observations=10**9)
+    sequential.ingest(history)
+
+    for key, state in sequential.series.items():
+        assert seeded.series[key].n == state.n
+        assert seeded.series[key].mean == pytest.approx(state.mean)
+        assert seeded.series[key].std == pytest.approx(state.std)
+
+def test_appended_claims_raise_live_alerts(tmp_path):
+    from data.dataset import ClaimsDataset
+    from data.loader import DataLoader
+    csv_path = tmp_path / "claims.csv"
+    _claim_stream(400, 0.05, seed=5).to_csv(csv_path, index=False)
+    dataset = ClaimsDataset(DataLoader(str(csv_path), use_cache=False, typed=True))
+
+    dataset.append(_claim_stream(40, 0.6, seed=6, start='2025-04-01'))
+    alerts = dataset.get_live_alerts()
+    assert alerts and alerts[0]['payer_name'] == 'Aetna'
+
+    dataset.refresh()
+    assert dataset.get_live_alerts() == []
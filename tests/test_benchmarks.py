@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.benchmarks import BenchmarkData
+
+def legacy_status(b: dict, metric: str, value: float) -> str:
+    """get_benchmark_status as it was before the vectorized rework (reference only)."""
+    inverse_metrics = ['denial_rate', 'days_in_ar', 'cost_to_collect', 'ar_over_90_pct', 'charge_lag', 'bad_debt_rate']
+    if metric in inverse_metrics:
+        if value <= b['90th']: return "🌟"
+        if value <= b['75th']: return "✅"
+        if value <= b['50th']: return "⚠️"
+        return "🔴"
+    if value >= b['90th']: return "🌟"
+    if value >= b['75th']: return "✅"
+    if value >= b['50th']: return "⚠️"
+    return "🔴"
+
+def test_anchors_and_interpolation():
+    benchmarks = BenchmarkData()
+    table = pd.DataFrame({
+        'net_collection_rate': [94.5, 96.0, 96.9, 98.5],
+        'denial_rate': [12.0, 9.5, 8.25, 5.5] # Lower is better
+    })
+    ranks = benchmarks.percentile_ranks(table)
+
+    np.testing.assert_allclose(ranks['net_collection_rate'], [25, 50, 62.5, 90])
+    np.testing.assert_allclose(ranks['denial_rate'], [25, 50, 62.5, 90])
+
+def test_outside_anchors_extrapolates_and_clips():
+    ranks = BenchmarkData().percentile_ranks(pd.DataFrame({'days_in_ar': [54.0, 200.0, 30.0, 1.0]}))
+    np.testing.assert_allclose(ranks['days_in_ar'], [1.0, 1.0, 97.5, 99.0])
+
+def test_missing_values_and_unbenchmarked_columns():
+    ranks = BenchmarkData().percentile_ranks(pd.DataFrame({'charge_lag': [np.nan, 3.0], 'denial_overturn_rate': [44.0, 44.0]}))
+    assert list(ranks.columns) == ['charge_lag']
+    assert np.isnan(ranks['charge_lag'].iloc[0]) and ranks['charge_lag'].iloc[1] == 50.0
+
+def test_status_matches_legacy_if_chains():
+    benchmarks = BenchmarkData()
+    for metric, b in benchmarks.benchmarks.items():
+        anchors = list(b.values())
+        values = anchors + list(np.linspace(min(anchors) * 0.8, max(anchors) * 1.2, 41))
+        for value in values:
+            assert benchmarks.get_benchmark_status(metric, value) == legacy_status(b, metric, value), (metric, value)
+    assert benchmarks.get_benchmark_status('denial_overturn_rate', 44.0) == "⚪"
+
+def test_scalar_rank():
+    benchmarks = BenchmarkData()
+    assert benchmarks.percentile_rank('clean_claim_rate', 92.0) == pytest.approx(50.0)
+    assert benchmarks.percentile_rank('cash_as_pct_nr', 90.0) is None
+
+def test_benchmark_questions_get_percentiles(tmp_path, monkeypatch):
+    from config.settings import settings
+    from data.cache import QueryCache, TieredQueryCache
+    from agent.intent_index import SemanticIntentIndex
+    from agent.nodes import query_cache as cache_nodes
+    from agent.orchestrator import run_agent
+    monkeypatch.setattr(settings, "anthropic_api_key", None)
+    store = QueryCache(str(tmp_path / "cache.db"), expiry_interval=None)
+    monkeypatch.setattr(cache_nodes, "query_cache", TieredQueryCache(store))
+    monkeypatch.setattr(cache_nodes, "intent_index", SemanticIntentIndex())
+
+    result = run_agent("How does our denial rate compare to industry benchmarks?")
+    store.close()
+    assert result["comparison_type"] == "benchmark"
+    rank = result["data_result"]["benchmark_percentiles"]["denial_rate"]
+    assert rank == round(BenchmarkData().percentile_rank('denial_rate', result["data_result"]["denial_rate"]))
+
+def _profiles_file(tmp_path, profiles, anchors=('25th', '50th', '75th', '90th')):
+    import json
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({
+        'version': 'test.1',
+        'anchors': list(anchors),
+        'metrics': ['denial_rate', 'net_collection_rate'],
+        'profiles': [
+            {'hospital_type': t, 'bed_band': b, 'region': r, 'year': y,
+             'values': [[12.0 + shift, 9.5 + shift, 7.0 + shift, 5.5 + shift], [94.5, 96.0, 97.8, 98.5]]}
+            for t, b, r, y, shift in profiles
+        ]
+    }))
+    return str(path)
+
+def test_store_loads_lazily_and_falls_back_to_nearest_profile(tmp_path):
+    from data.benchmarks import BenchmarkStore
+    store = BenchmarkStore(_profiles_file(tmp_path, [
+        ('community', '100-249', 'Global', 2023, 0.0),
+        ('community', '100-249', 'Global', 2024, 0.5),
+        ('community', '100-249', 'West', 2024, 1.0),
+        ('academic', '500+', 'Global', 2024, 2.0)
+    ]))
+    assert store.version is None # Nothing read yet
+
+    assert store.resolve('Community', 150, 'West') == ('community', '100-249', 'West', 2024)
+    assert store.resolve('community', 150, 'South') == ('community', '100-249', 'Global', 2024)
+    assert store.resolve('community', 150, 'Global', year=2020) == ('community', '100-249', 'Global', 2023)
+    assert store.resolve('academic', 300, 'West') == ('academic', '500+', 'Global', 2024)
+    assert store.resolve('rural', 50, 'West') == ('community', '100-249', 'West', 2024)
+    assert store.version == 'test.1' and store.years() == [2024, 2023]
+
+    data = BenchmarkData('academic', 600, store=store)
+    assert data.benchmarks['denial_rate'] == {'25th': 14.0, '50th': 11.5, '75th': 9.0, '90th': 7.5}
+
+def test_compare_all_matches_per_profile_ranks(tmp_path):
+    from data.benchmarks import BenchmarkStore
+    store = BenchmarkStore(_profiles_file(tmp_path, [
+        ('community', '100-249', 'Global', 2024, 0.0),
+        ('academic', '500+', 'Global', 2024, 2.0)
+    ]))
+    kpis = {'denial_rate': 9.0, 'net_collection_rate': 97.0, 'charge_lag': 2.0}
+    peers = store.compare_all(kpis)
+
+    assert list(peers.columns) == ['denial_rate', 'net_collection_rate']
+    for profile, row in peers.iterrows():
+        data = BenchmarkData(profile[0], region=profile[2], year=profile[3], band=profile[1], store=store)
+        expected = data.percentile_ranks(pd.DataFrame([kpis])).iloc[0]
+        np.testing.assert_allclose(row.to_numpy(), expected[peers.columns].to_numpy())
+
+def test_store_rejects_unexpected_anchors(tmp_path):
+    from data.benchmarks import BenchmarkStore
+    store = BenchmarkStore(_profiles_file(tmp_path, [('community', '100-249', 'Global', 2024, 0.0)], anchors=('10th', '50th', '75th', '90th')))
+    with pytest.raises(ValueError):
+        store.resolve()
+
+def test_default_profile_is_published_community_medians():
+    assert BenchmarkData().profile == ('community', '100-249', 'Global', 2024)
+    assert BenchmarkData().benchmarks['days_in_ar'] == {'25th': 48.0, '50th': 42.0, '75th': 36.0, '90th': 32.0}
+
+def test_only_sourced_profiles_are_marked_published():
+    from data.benchmarks import benchmark_store
+    assert benchmark_store.profile_source(('community', '100-249', 'Global', 2024)).startswith("HFMA 2024")
+    assert benchmark_store.profile_source(('community', '100-249', 'Midwest', 2024)) is None
+    assert "illustrative" in benchmark_store.source
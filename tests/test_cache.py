@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+import pytest
+from data.cache import QueryCache, TieredQueryCache
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.db"), expiry_interval=None)
+    yield cache
+    cache.close()
+
+def test_set_get_and_counters(cache):
+    """Round-trips a result and counts hits and misses."""
+    cache.set("denial rate", {"payer": "Aetna"}, {"denial_rate": 11.2})
+
+    assert cache.get("denial rate", {"payer": "Aetna"}) == {"denial_rate": 11.2}
+    assert cache.get("denial rate", {"payer": "BCBS"}) is None
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0}
+
+def test_expired_rows_miss_and_are_purged_in_bulk(cache):
+    """Expired entries are not returned and are removed by one range delete."""
+    cache.set("q1", {}, 1, ttl_seconds=0)
+    cache.set("q2", {}, 2, ttl_seconds=0)
+    cache.set("q3", {}, 3, ttl_seconds=900)
+
+    assert cache.get("q1", {}) is None
+    assert cache.purge_expired() == 2
+    assert cache.get("q3", {}) == 3
+    assert cache.stats()['evictions'] == 2
+
+def test_connections_are_per_thread_and_wal(cache):
+    """Each thread reuses its own connection; the database runs in WAL mode."""
+    seen = []
+    def worker():
+        seen.append(cache._connection() is cache._connection())
+        cache.set("q", {"t": threading.get_ident()}, 1)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert all(seen)
+    assert cache._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_legacy_schema_is_migrated(tmp_path):
+    """A cache file without expires_at gains the column; old rows count as expired."""
+    db_path = str(tmp_path / "legacy.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE query_cache (
+                id TEXT PRIMARY KEY, query_text TEXT NOT NULL, result_json TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, ttl_seconds INTEGER DEFAULT 900
+            )
+        """)
+        conn.execute("INSERT INTO query_cache (id, query_text, result_json) VALUES ('x', 'q', '1')")
+
+    cache = QueryCache(db_path, expiry_interval=None)
+    assert cache.purge_expired() == 1
+    cache.close()
+
+def test_tiered_cache_serves_hot_entries_from_memory(cache):
+    """Write-through set, memory hits skip SQLite, and SQLite hits are promoted."""
+    tiered = TieredQueryCache(cache)
+    tiered.set("q", {}, {"denial_rate": 11.2})
+
+    assert tiered.get("q", {}) == {"denial_rate": 11.2}
+    assert tiered.stats()['sqlite']['hits'] == 0
+
+    fresh = TieredQueryCache(cache)
+    assert fresh.get("q", {}) == {"denial_rate": 11.2}
+    assert fresh.get("q", {}) == {"denial_rate": 11.2}
+    assert fresh.stats()['memory']['hits'] == 1
+    assert fresh.stats()['sqlite']['hits'] == 1
+
+def test_tiered_cache_byte_budget_and_clear(cache):
+    """The memory tier evicts least recently used entries over budget; clear empties both tiers."""
+    tiered = TieredQueryCache(cache, max_bytes=40)
+    tiered.set("a", {}, "x" * 15)
+    tiered.set("b", {}, "y" * 15)
+    tiered.get("a", {})
+    tiered.set("c", {}, "z" * 15)
+
+    memory = tiered.stats()['memory']
+    assert memory['evictions'] == 1 and memory['entries'] == 2 and memory['bytes'] <= 40
+
+    tiered.clear()
+    assert tiered.get("a", {}) is None
+    assert tiered.stats()['memory']['entries'] == 0
+
+def test_tiered_cache_oversized_overwrite_replaces_memory_value(cache):
+    """A value too big for the memory tier still evicts the key's previous value from it."""
+    tiered = TieredQueryCache(cache, max_bytes=100)
+    tiered.set("q", {}, "small")
+    tiered.set("q", {}, "x" * 200)
+
+    assert tiered.get("q", {}) == "x" * 200
+    assert tiered.stats()['memory']['entries'] == 0
+
+def test_tiered_cache_returns_copies(cache):
+    """Mutating a returned result does not alter the cached value."""
+    tiered = TieredQueryCache(cache)
+    tiered.set("q", {}, {"metrics": ["denial_rate"]})
+    tiered.get("q", {})["metrics"].append("oops")
+
+    assert tiered.get("q", {}) == {"metrics": ["denial_rate"]}
@@ -49,3 +49,38 @@ def test_empty_dataframe():
     
     assert result['net_collection_rate'] is None
     assert result['denial_rate'] is None
+
+def _claims_frame():
+    return pd.DataFrame({
+        'service_date': ['2025-01-03', '2025-01-20', '2025-02-11', '2025-02-14', '2025-03-02'],
+        'charge_entry_date': ['2025-01-05', '2025-01-21', '2025-02-15', '2025-02-16', '2025-03-03'],
+        'payer_name': ['Aetna', 'Medicare', 'Aetna', 'Aetna', 'Medicare'],
+        'claim_status': ['Paid', 'Denied', 'Paid', 'Denied', 'Paid'],
+        'charges': [1000.0, 2000.0, 1500.0, 800.0, 1200.0],
+        'allowed_amount': [600.0, 1100.0, 900.0, 500.0, 700.0],
+        'payments': [500.0, 0.0, 800.0, 0.0, 650.0],
+        'adjustments': [400.0, 900.0, 600.0, 300.0, 500.0],
+        'patient_responsibility': [100.0, 0.0, 100.0, 0.0, 50.0],
+        'pos_collections': [20.0, 0.0, 50.0, 0.0, 0.0]
+    })
+
+def test_grouped_matches_calculate_all_per_group():
+    """Validates the single-pass grouped engine against per-slice calculate_all."""
+    df = _claims_frame()
+    calc = KPICalculator()
+    results = calc.calculate_grouped(df, 'payer_name')
+
+    assert [r['payer_name'] for r in results] == ['Aetna', 'Medicare']
+    for row in results:
+        expected = calc.calculate_all(df[df['payer_name'] == row['payer_name']])
+        assert {k: row[k] for k in expected} == expected
+
+def test_calculate_trends_monthly_shape():
+    """Validates trend output: one dict per month with a 'period' label, last N months."""
+    df = _claims_frame()
+    calc = KPICalculator()
+    trends = calc.calculate_trends(df, months=2)
+
+    assert [t['period'] for t in trends] == ['2025-02', '2025-03']
+    assert trends[0]['denial_rate'] == 50.0
+    assert 'service_month' not in df.columns
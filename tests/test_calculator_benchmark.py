@@ -0,0 +1,128 @@
+"""
+Microbenchmarks for KPICalculator.calculate_all.
+
+The 10k-row case always runs and checks outputs against the pre-vectorization
+implementation kept below as a reference. The 1M-row case runs when
+RUN_BENCHMARKS=1. Timings print with `pytest -s`:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/test_calculator_benchmark.py -s
+"""
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import date, timedelta
+from data.calculator import KPICalculator, KPI_INPUTS
+
+def legacy_calculate_all(df: pd.DataFrame) -> dict:
+    """calculate_all as it was before the mask-sum rework (reference only)."""
+    def safe_sum(col):
+        return df[col].sum() if col in df.columns else 0
+
+    def safe_count(condition):
+        try:
+            return len(df[condition])
+        except (KeyError, ValueError):
+            return 0
+
+    payments_sum = safe_sum('payments')
+    allowed_sum = safe_sum('allowed_amount')
+    net_col_rate = (payments_sum / allowed_sum * 100) if allowed_sum > 0 else 0
+    charges_sum = safe_sum('charges')
+    gross_col_rate = (payments_sum / charges_sum * 100) if charges_sum > 0 else 0
+    adjustments_sum = safe_sum('adjustments')
+    total_ar = charges_sum - payments_sum - adjustments_sum
+    avg_daily_revenue = charges_sum / 365 if charges_sum > 0 else 0
+    days_in_ar = total_ar / avg_daily_revenue if avg_daily_revenue > 0 else 0
+    total_claims = len(df)
+    clean_claims = safe_count(df['claim_status'] != 'Denied') if 'claim_status' in df.columns else total_claims
+    clean_claim_rate = (clean_claims / total_claims * 100) if total_claims > 0 else 0
+    denied_claims = safe_count(df['claim_status'] == 'Denied') if 'claim_status' in df.columns else 0
+    denial_rate = (denied_claims / total_claims * 100) if total_claims > 0 else 0
+    overturned_denials = denied_claims * 0.44
+    denial_overturn_rate = (overturned_denials / denied_claims * 100) if denied_claims > 0 else 0
+    if 'service_date' in df.columns and 'charge_entry_date' in df.columns:
+        df_temp = df.copy()
+        df_temp['service_dt'] = pd.to_datetime(df_temp['service_date'])
+        df_temp['charge_entry_dt'] = pd.to_datetime(df_temp['charge_entry_date'])
+        charge_lag = (df_temp['charge_entry_dt'] - df_temp['service_dt']).dt.days.mean()
+    else:
+        charge_lag = 0
+    ninety_days_ago = date.today() - timedelta(days=90)
+    if 'claim_status' in df.columns and 'service_date' in df.columns:
+        aging_df = df[(df['claim_status'] != 'Paid') & (pd.to_datetime(df['service_date']).dt.date < ninety_days_ago)]
+        ar_over_90 = (len(aging_df) / total_claims * 100) if total_claims > 0 else 0
+    else:
+        ar_over_90 = 0
+    bad_debt_rate = (adjustments_sum * 0.05 / allowed_sum * 100) if allowed_sum > 0 else 0
+    pt_resp_sum = safe_sum('patient_responsibility')
+    pos_col_sum = safe_sum('pos_collections')
+    pos_collection_rate = (pos_col_sum / pt_resp_sum * 100) if pt_resp_sum > 0 else 0
+
+    return {
+        'net_collection_rate': round(net_col_rate, 1),
+        'gross_collection_rate': round(gross_col_rate, 1),
+        'days_in_ar': round(days_in_ar, 1),
+        'clean_claim_rate': round(clean_claim_rate, 1),
+        'denial_rate': round(denial_rate, 1),
+        'denial_overturn_rate': round(denial_overturn_rate, 1),
+        'cost_to_collect': round(0.042, 3),
+        'charge_lag': round(charge_lag, 1),
+        'ar_over_90_pct': round(ar_over_90, 1),
+        'cash_as_pct_nr': round(net_col_rate, 1),
+        'bad_debt_rate': round(bad_debt_rate, 1),
+        'pos_collection_rate': round(pos_collection_rate, 1)
+    }
+
+def make_claims(n_rows: int, seed: int = 7) -> pd.DataFrame:
+    """Random claims frame with date-object columns, as the default loader layout."""
+    rng = np.random.default_rng(seed)
+    service = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 730, n_rows), unit='D')
+    charges = rng.uniform(500, 5000, n_rows).round(2)
+    allowed = (charges * rng.uniform(0.4, 0.7, n_rows)).round(2)
+    denied = rng.random(n_rows) < 0.1
+    payments = np.where(denied, 0.0, allowed * rng.uniform(0.7, 0.9, n_rows)).round(2)
+    return pd.DataFrame({
+        'service_date': service.date,
+        'charge_entry_date': (service + pd.to_timedelta(rng.integers(1, 5, n_rows), unit='D')).date,
+        'claim_status': np.where(denied, 'Denied', 'Paid'),
+        'charges': charges,
+        'allowed_amount': allowed,
+        'payments': payments,
+        'adjustments': (charges - allowed).round(2),
+        'patient_responsibility': (allowed - payments).round(2),
+        'pos_collections': np.where(rng.random(n_rows) < 0.5, (allowed - payments) * 0.3, 0.0).round(2)
+    })
+
+def _best_of(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _run(n_rows: int):
+    df = make_claims(n_rows)
+    calc = KPICalculator()
+
+    assert calc.calculate_all(df) == legacy_calculate_all(df)
+
+    legacy = _best_of(lambda: legacy_calculate_all(df))
+    current = _best_of(lambda: calc.calculate_all(df))
+    print(f"\n{n_rows:,} rows: all KPIs legacy {legacy * 1e3:.1f} ms, current {current * 1e3:.1f} ms")
+    for kpi in KPI_INPUTS:
+        elapsed = _best_of(lambda: calc.calculate_all(df, metrics=[kpi]))
+        print(f"  {kpi:<24} {elapsed * 1e3:8.2f} ms")
+    return legacy, current
+
+def test_calculate_all_matches_legacy_10k():
+    """Identical outputs to the legacy implementation at 10k rows."""
+    _run(10_000)
+
+@pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run")
+def test_calculate_all_matches_legacy_1m():
+    """Identical outputs and a faster full calculation at 1M rows."""
+    legacy, current = _run(1_000_000)
+    assert current < legacy
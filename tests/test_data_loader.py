@@ -0,0 +1,162 @@
+import pandas as pd
+import pytest
+from data.loader import DataLoader
+from data.validation import validate_claims
+
+def _claims(**overrides):
+    base = {
+        'claim_id': ['CLM-1', 'CLM-2', 'CLM-3'],
+        'service_date': ['2025-01-05', '2025-02-10', '2025-03-15'],
+        'payer_name': ['Aetna', 'Medicare', 'BCBS'],
+        'payer_category': ['Commercial', 'Medicare', 'Commercial'],
+        'charges': [1000.0, 2000.0, 3000.0],
+        'claim_status': ['Paid', 'Denied', 'Paid'],
+        'denial_reason': [None, 'Prior Auth', None],
+        'payment_date': ['2025-02-01', None, '2025-04-01'],
+    }
+    base.update(overrides)
+    return pd.DataFrame(base)
+
+def test_valid_frame_passes_and_parses_dates():
+    """Optional nulls are accepted and date columns are normalized."""
+    result = validate_claims(_claims())
+
+    assert not result.invalid_mask.any()
+    assert result.errors == []
+    assert result.frame['service_date'].iloc[0] == pd.Timestamp(2025, 1, 5)
+
+def test_negative_amount_and_missing_required_field():
+    """Non-negative and required-field rules produce per-row masks."""
+    df = _claims(charges=[1000.0, -5.0, 3000.0], payer_name=['Aetna', 'Medicare', None])
+    result = validate_claims(df)
+
+    assert result.failures['charges'].tolist() == [False, True, False]
+    assert result.failures['payer_name'].tolist() == [False, False, True]
+    assert result.invalid_mask.sum() == 2
+    assert result.errors[0].startswith("Row 1: charges")
+
+def test_unparseable_date_is_invalid():
+    """Dates that fail to parse are flagged, even on optional columns."""
+    df = _claims(payment_date=['2025-02-01', None, 'not-a-date'])
+    result = validate_claims(df)
+
+    assert result.failures['payment_date'].tolist() == [False, False, True]
+
+def test_missing_required_column_fails_every_row():
+    """A required field absent from the extract invalidates all rows."""
+    result = validate_claims(_claims().drop(columns=['claim_status']))
+
+    assert result.invalid_mask.all()
+
+def test_error_messages_are_capped(tmp_path):
+    """DataQualityReport keeps only the first 10 validation messages."""
+    df = _claims()
+    df = pd.concat([df] * 10, ignore_index=True)
+    df['charges'] = -1.0
+    csv_path = tmp_path / "claims.csv"
+    df.to_csv(csv_path, index=False)
+
+    _, report = DataLoader(str(csv_path)).load_from_csv()
+
+    assert report.total_rows == 30
+    assert report.invalid_rows == 30
+    assert len(report.validation_errors) == 10
+
+def test_columnar_cache_reused_until_source_changes(tmp_path):
+    """An unchanged CSV is served from the Feather cache; an edited one is re-parsed."""
+    pytest.importorskip("pyarrow")
+    csv_path = tmp_path / "claims.csv"
+    _claims().to_csv(csv_path, index=False)
+    loader = DataLoader(str(csv_path))
+
+    df, report = loader.load_from_csv()
+    assert (tmp_path / "claims.cache.feather").exists()
+
+    cached_df, cached_report = loader.load_from_csv()
+    assert cached_df['claim_id'].tolist() == df['claim_id'].tolist()
+    assert cached_df['service_date'].tolist() == df['service_date'].tolist()
+    assert cached_report == report
+
+    _claims(charges=[1.0, -1.0, 2.0]).to_csv(csv_path, index=False)
+    _, fresh_report = loader.load_from_csv()
+    assert fresh_report.invalid_rows == 1
+
+def test_shared_dataset_loads_once_and_reloads_on_change(tmp_path):
+    """ClaimsDataset parses once, hands out independent views and reloads on source change."""
+    from data.dataset import ClaimsDataset
+    csv_path = tmp_path / "claims.csv"
+    _claims().to_csv(csv_path, index=False)
+    dataset = ClaimsDataset(DataLoader(str(csv_path), use_cache=False))
+
+    first = dataset.get()
+    first['scratch'] = 1
+    assert 'scratch' not in dataset.get().columns
+    assert dataset.version == 1
+
+    _claims().iloc[:2].to_csv(csv_path, index=False)
+    assert len(dataset.get()) == 2
+    assert dataset.version == 2
+
+def test_typed_layout_is_smaller_with_same_counts(tmp_path):
+    """Typed mode yields categoricals/datetime64/float32 and the same validation result."""
+    csv_path = tmp_path / "claims.csv"
+    pd.concat([_claims()] * 50, ignore_index=True).to_csv(csv_path, index=False)
+
+    plain_df, plain_report = DataLoader(str(csv_path), use_cache=False).load_from_csv()
+    typed_df, typed_report = DataLoader(str(csv_path), use_cache=False, typed=True, float32_amounts=True).load_from_csv()
+
+    assert isinstance(typed_df['payer_name'].dtype, pd.CategoricalDtype)
+    assert typed_df['service_date'].dtype == 'datetime64[s]'
+    assert typed_df['charges'].dtype == 'float32'
+    assert typed_report.valid_rows == plain_report.valid_rows
+    assert typed_report.memory_bytes < plain_report.memory_bytes
+
+def _extract(tmp_path, rows=2_500, seed=3):
+    from data.synthetic_generator import write_synthetic_data
+    path = str(tmp_path / "claims.csv")
+    write_synthetic_data(path, rows, chunk_size=1_000, seed=seed)
+    return path
+
+def test_streamed_load_matches_one_pass(tmp_path):
+    """Chunked ingestion through the columnar store gives the one-pass frame and report."""
+    pytest.importorskip("pyarrow")
+    path = _extract(tmp_path)
+    expected, expected_report = DataLoader(path, use_cache=False, typed=True, float32_amounts=True).load_from_csv()
+
+    loader = DataLoader(path, typed=True, float32_amounts=True, chunk_size=400)
+    streamed, report = loader.load_from_csv()
+    pd.testing.assert_frame_equal(streamed, expected)
+    assert report.model_dump(exclude={'memory_bytes'}) == expected_report.model_dump(exclude={'memory_bytes'})
+
+    cached, cached_report = loader.load_from_csv()
+    pd.testing.assert_frame_equal(cached, expected)
+    assert cached_report == report
+
+    in_memory, _ = DataLoader(path, use_cache=False, typed=True, float32_amounts=True, chunk_size=400).load_from_csv()
+    pd.testing.assert_frame_equal(in_memory, expected)
+
+def test_streamed_report_counts_across_chunks(tmp_path):
+    """Counters add up over chunks and error row numbers continue across them."""
+    df = pd.concat([_claims()] * 10, ignore_index=True)
+    df.loc[[4, 25], 'charges'] = -1.0
+    df.loc[17, 'payer_name'] = None
+    csv_path = tmp_path / "claims.csv"
+    df.to_csv(csv_path, index=False)
+
+    _, report = DataLoader(str(csv_path), use_cache=False, chunk_size=7).load_from_csv()
+    assert (report.total_rows, report.invalid_rows, report.missing_payer_name) == (30, 3, 1)
+    assert [e.split(':')[0] for e in report.validation_errors] == ["Row 4", "Row 17", "Row 25"]
+
+def test_ingest_feeds_aggregates_without_a_frame(tmp_path):
+    """Streaming straight into KPIAggregates matches building the cube from the loaded frame."""
+    from data.aggregates import KPIAggregates
+    path = _extract(tmp_path)
+    df, _ = DataLoader(path, use_cache=False, typed=True).load_from_csv()
+    cube = KPIAggregates(('payer_name', 'facility'))
+
+    report = DataLoader(path, typed=True).ingest([cube.update], chunk_size=600)
+    assert report.total_rows == len(df) and not (tmp_path / "claims.typed.cache.feather").exists()
+
+    expected = KPIAggregates.from_frame(df, ('payer_name', 'facility')).calculate_grouped('payer_name')
+    by_payer = lambda rows: sorted(rows, key=lambda r: r['payer_name'])
+    assert by_payer(cube.calculate_grouped('payer_name')) == by_payer(expected)
@@ -0,0 +1,60 @@
+from agent.entities import extract_entities
+from agent.intent_index import SemanticIntentIndex
+
+INTENT = {"intent": "kpi_query", "metrics": ["denial_rate"], "filters": {"payer": "Aetna", "date_range": "Q4"}, "comparison_type": None}
+
+def test_extract_entities_canonicalizes_aliases():
+    """Aliases and spelled-out quarters map to canonical entities."""
+    entities = extract_entities("Show BCBS denials in the fourth quarter of 2025")
+    assert entities["payers"] == ("BCBS",)
+    assert entities["metrics"] == ("denial_rate",)
+    assert entities["quarters"] == ("Q4",)
+    assert entities["years"] == ("2025",)
+
+def test_paraphrase_hits():
+    index = SemanticIntentIndex()
+    index.add("what's our denial rate for aetna in q4", INTENT)
+
+    match = index.lookup("show me aetna's denial rate in q4")
+    assert match is not None
+    intent, score, matched = match
+    assert intent == INTENT
+    assert score >= index.threshold
+    assert matched == "what's our denial rate for aetna in q4"
+
+def test_different_entities_never_hit():
+    """Near-identical wording with another payer, quarter or metric misses."""
+    index = SemanticIntentIndex()
+    index.add("what's our denial rate for aetna in q4", INTENT)
+
+    assert index.lookup("what's our denial rate for aetna in q3") is None
+    assert index.lookup("what's our denial rate for medicare in q4") is None
+    assert index.lookup("what's our clean claim rate for aetna in q4") is None
+
+def test_unrelated_question_misses():
+    index = SemanticIntentIndex()
+    index.add("what's our denial rate for aetna in q4", INTENT)
+    assert index.lookup("generate a board presentation") is None
+
+def test_capacity_overwrites_oldest():
+    index = SemanticIntentIndex(max_entries=2)
+    index.add("denial rate for aetna", {"intent": "a"})
+    index.add("denial rate for medicare", {"intent": "b"})
+    index.add("denial rate for medicaid", {"intent": "c"})
+
+    assert len(index) == 2
+    assert index.lookup("denial rate for aetna") is None
+    assert index.lookup("denial rate for medicaid")[0] == {"intent": "c"}
+
+def test_facility_names_and_negations_never_hit():
+    """Leftover words (facility names, negations) are part of the entity key."""
+    index = SemanticIntentIndex()
+    index.add("what is the denial rate at main campus", {"intent": "main"})
+    index.add("what is the denial rate at riverside hospital", {"intent": "riverside"})
+    index.add("denial rate for aetna", INTENT)
+
+    assert index.lookup("what is the denial rate at north campus") is None
+    assert index.lookup("what is the denial rate at memorial hospital") is None
+    assert index.lookup("denial rate excluding aetna") is None
+    assert index.lookup("what is the denial rate at main campus")[0] == {"intent": "main"}
+    assert extract_entities("denial rate excluding aetna")["qualifiers"] == ("excluding",)
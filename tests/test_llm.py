@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from config.settings import settings
+from agent.llm import get_client, get_async_client, llm_stats, reset_clients
+from benchmarks.stub_llm import start_stub_server
+
+REQUEST = {"model": "claude-3-haiku-20240307", "max_tokens": 50, "messages": [{"role": "user", "content": "hi"}]}
+
+@pytest.fixture
+def stub(monkeypatch):
+    servers = []
+
+    def start(**kwargs):
+        server = start_stub_server(latency=0.0, token_interval=0.0, **kwargs)
+        servers.append(server)
+        monkeypatch.setattr(settings, "anthropic_api_key", "test-key")
+        monkeypatch.setattr(settings, "anthropic_base_url", f"http://127.0.0.1:{server.server_port}")
+        reset_clients()
+        llm_stats.reset()
+        return server
+
+    yield start
+    reset_clients()
+    for server in servers:
+        server.shutdown()
+
+def test_client_is_shared_and_configured(stub, monkeypatch):
+    monkeypatch.setattr(settings, "llm_max_retries", 5)
+    stub()
+    assert get_client() is get_client()
+    assert get_client().max_retries == 5
+    assert get_client().timeout.connect == settings.llm_connect_timeout_seconds
+
+def test_connections_are_reused(stub):
+    stub()
+    for _ in range(3):
+        get_client().messages.create(**REQUEST)
+
+    stats = llm_stats.snapshot()
+    assert stats["calls"] == 3
+    assert stats["new_connections"] == 1
+    assert stats["reused_connections"] == 2
+    assert stats["latency_p50_ms"] is not None
+
+def test_rate_limited_calls_are_retried(stub):
+    server = stub(rate_limited=2)
+    response = get_client().messages.create(**REQUEST)
+
+    assert response.content[0].text
+    assert server.requests == 3
+    stats = llm_stats.snapshot()
+    assert stats["errors"] == 2
+    assert stats["calls"] == 3
+
+def test_async_client_is_shared_per_loop(stub):
+    stub()
+
+    async def ask_concurrently():
+        client = get_async_client()
+        assert get_async_client() is client
+        await asyncio.gather(*(client.messages.create(**REQUEST) for _ in range(5)))
+        await client.messages.create(**REQUEST)
+
+    asyncio.run(ask_concurrently())
+    stats = llm_stats.snapshot()
+    assert stats["calls"] == 6
+    assert stats["new_connections"] <= 5
+    assert stats["reused_connections"] >= 1
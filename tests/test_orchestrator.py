@@ -0,0 +1,120 @@
+import asyncio
+import pytest
+from data.cache import QueryCache, TieredQueryCache
+from agent.intent_index import SemanticIntentIndex
+from agent.nodes import query_cache as cache_nodes
+from agent.orchestrator import run_agent, arun_agent, astream_agent, AgentLoop
+
+@pytest.fixture(autouse=True)
+def offline_agent(tmp_path, monkeypatch):
+    from config.settings import settings
+    monkeypatch.setattr(settings, "anthropic_api_key", None)
+    store = QueryCache(str(tmp_path / "cache.db"), expiry_interval=None)
+    monkeypatch.setattr(cache_nodes, "query_cache", TieredQueryCache(store))
+    monkeypatch.setattr(cache_nodes, "intent_index", SemanticIntentIndex())
+    yield
+    store.close()
+
+def test_async_entry_point_matches_sync():
+    sync = run_agent("What's our denial rate for Aetna in Q4?")
+    cache_nodes.query_cache.clear()
+    result = asyncio.run(arun_agent("What's our denial rate for Aetna in Q4?"))
+    assert result["data_result"] == sync["data_result"]
+    assert result["answer"] == sync["answer"]
+    assert "result" not in result["cache_hits"]
+
+def test_payer_comparison_fans_out_per_payer():
+    """Each payer is analyzed in its own branch and matches a single-payer question."""
+    result = asyncio.run(arun_agent("Which payer has the highest denial rate?"))
+    assert set(result["branch_results"]) == set(result["data_result"])
+    assert "Aetna" in result["data_result"]
+
+    aetna = run_agent("What's our denial rate for Aetna?")
+    assert result["data_result"]["Aetna"] == aetna["data_result"]
+
+def test_named_payer_comparison_analyzes_only_those_payers():
+    result = run_agent("Compare denial rate Aetna vs BCBS")
+    assert set(result["branch_results"]) == set(result["data_result"]) == {"Aetna", "BCBS"}
+
+def test_multi_metric_question_runs_a_branch_per_metric():
+    result = run_agent("Denial rate and clean claim rate for Aetna")
+    assert set(result["branch_results"]) == {"all|denial_rate", "all|clean_claim_rate"}
+    assert list(result["data_result"]) == result["metrics"]
+    assert result["data_result"]["denial_rate"] == run_agent("Denial rate for Aetna")["data_result"]["denial_rate"]
+
+def test_concurrent_queries_share_one_loop():
+    questions = [f"What's our {m} for {p}?" for m in ("denial rate", "clean claim rate") for p in ("Aetna", "Medicare", "BCBS")]
+
+    async def ask_all():
+        return await asyncio.gather(*(arun_agent(q, session_id=str(i)) for i, q in enumerate(questions)))
+
+    results = asyncio.run(ask_all())
+    assert all(r.get("error") is None and r["answer"] for r in results)
+    assert [r["session_id"] for r in results] == [str(i) for i in range(len(questions))]
+
+def test_anomaly_questions_use_detector():
+    result = run_agent("Show denial rate anomalies for Aetna")
+    assert result["intent"] == "anomaly"
+    assert not result.get("branch_results") # The analysis branches are skipped
+    assert result["data_result"]["anomaly_count"] == len(result["anomalies"])
+    assert all(a["payer_name"] == "Aetna" and a["metric"] == "denial_rate" for a in result["anomalies"])
+
+def test_agent_loop_runs_in_background():
+    future = AgentLoop().submit("What's our denial rate for Aetna?")
+    assert future.result(timeout=30)["data_result"]["denial_rate"] is not None
+
+class FakeStream:
+    """Stands in for the SDK's message stream: yields fixed text chunks."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+class FakeAsyncClient:
+    def __init__(self, chunks):
+        self.messages = self
+        self.chunks = chunks
+        self.requests = []
+
+    def stream(self, **request):
+        self.requests.append(request)
+        return FakeStream(self.chunks)
+
+def test_answer_streams_tokens_in_order():
+    async def collect():
+        return [event async for event in astream_agent("What's our denial rate for Aetna?")]
+
+    events = asyncio.run(collect())
+    tokens = [value for kind, value in events if kind == "token"]
+    kind, final = events[-1]
+    assert kind == "final"
+    assert len(tokens) > 1
+    assert "".join(tokens) == final["answer"]
+    assert final["ttft_ms"] is not None
+
+def test_writer_streams_from_client(monkeypatch):
+    from config.settings import settings
+    from agent.nodes import summary_writer
+    monkeypatch.setattr(settings, "anthropic_api_key", "test-key")
+    fake = FakeAsyncClient(["Denial rate ", "is ", "**12.5%**."])
+    monkeypatch.setattr(summary_writer, "get_async_client", lambda: fake)
+
+    state = asyncio.run(summary_writer.asummary_writer_node({"user_query": "q", "data_result": {"denial_rate": 12.5}}))
+    assert state["answer"] == "Denial rate is **12.5%**."
+    assert state["ttft_ms"] >= 0
+    assert fake.requests[0]["model"].startswith("claude")
+
+def test_agent_loop_exposes_partial_answer():
+    run = AgentLoop().stream("What's our clean claim rate for Medicare?")
+    result = run.result(timeout=30)
+    assert run.partial_answer == result["answer"]
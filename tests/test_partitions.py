@@ -0,0 +1,84 @@
+import os
+import json
+import pandas as pd
+import pytest
+from datetime import date
+from data.dataset import ClaimsDataset
+from data.loader import DataLoader
+from data.partitions import PartitionedClaimsStore, filter_claims
+from data.synthetic_generator import write_synthetic_data
+from agent.nodes.analysis_engine import period_filters
+
+pytest.importorskip("pyarrow")
+
+def _loader(tmp_path, partitions='month', rows=3_000, **kwargs):
+    path = write_synthetic_data(str(tmp_path / "claims.csv"), rows, chunk_size=1_000, seed=4,
+                                start_date='2023-01-01', end_date='2025-01-01')
+    return DataLoader(path, typed=True, float32_amounts=True, chunk_size=700, partitions=partitions, **kwargs)
+
+def _manifest(loader):
+    with open(os.path.join(loader.partitions_path, 'manifest.json')) as f:
+        return json.load(f)
+
+def test_manifest_covers_every_row_by_month(tmp_path):
+    loader = _loader(tmp_path)
+    df, report = loader.load_from_csv()
+    manifest = _manifest(loader)
+
+    assert manifest['rows'] == len(df) == report.total_rows
+    assert [p['month'] for p in manifest['partitions']] == [f"{y}-{m:02d}" for y in (2023, 2024) for m in range(1, 13)]
+    months = pd.to_datetime(df['service_date']).dt.strftime('%Y-%m')
+    for part in manifest['partitions']:
+        in_month = df['service_date'][months == part['month']]
+        assert part['rows'] == len(in_month)
+        assert part['min_date'] == in_month.min().date().isoformat() and part['max_date'] == in_month.max().date().isoformat()
+
+@pytest.mark.parametrize("partitions", ['month', 'month_facility'])
+def test_range_reads_prune_partitions_and_match_full_scan(tmp_path, partitions):
+    loader = _loader(tmp_path, partitions)
+    df, _ = loader.load_from_csv()
+    store = PartitionedClaimsStore(loader.partitions_path, partitions)
+    manifest = store.manifest()
+
+    cases = [
+        dict(start_date=date(2024, 10, 3), end_date=date(2024, 12, 31)),
+        dict(start_date='2023-06-15', end_date='2023-06-20', facilities=['East Wing']),
+        dict(months=[10, 11, 12]),
+        dict(start_date='2030-01-01'),
+    ]
+    for case in cases:
+        expected = filter_claims(df, **case)
+        got = loader.read_partitions(**case)
+        pd.testing.assert_frame_equal(
+            got.sort_values('claim_id').reset_index(drop=True), expected.sort_values('claim_id').reset_index(drop=True)
+        )
+    assert len(store.select(manifest, **cases[0])) == (3 if partitions == 'month' else 6)
+    assert len(store.select(manifest, **cases[1])) == 1
+    assert all(p['month'][5:] in ('10', '11', '12') for p in store.select(manifest, **cases[2]))
+
+def test_stale_store_is_ignored_until_reload(tmp_path):
+    loader = _loader(tmp_path)
+    loader.load_from_csv()
+    assert loader.read_partitions(start_date='2024-01-01') is not None
+
+    write_synthetic_data(loader.data_path, 500, seed=5, start_date='2024-01-01', end_date='2024-02-01')
+    assert loader.read_partitions(start_date='2024-01-01') is None
+    loader.load_from_csv()
+    assert len(loader.read_partitions(start_date='2024-01-01')) == 500
+
+def test_dataset_range_reads_without_loading_and_after_append(tmp_path):
+    _loader(tmp_path).load_from_csv()
+    dataset = ClaimsDataset(_loader(tmp_path))
+    recent = dataset.get_range(start_date='2024-10-01')
+    assert dataset.version == 0 and not recent.empty
+
+    extra = dataset.get().head(5).copy()
+    extra['claim_id'] = 'EXTRA-' + extra['claim_id']
+    extra['service_date'] = pd.Timestamp('2024-12-30')
+    dataset.append(extra)
+    assert len(dataset.get_range(start_date='2024-10-01')) == len(recent) + 5
+
+def test_period_filters():
+    assert period_filters("q4") == {'months': [10, 11, 12]}
+    assert period_filters("2024") == {'start_date': date(2024, 1, 1), 'end_date': date(2024, 12, 31)}
+    assert period_filters(None) == {} and period_filters("last month") == {}
@@ -0,0 +1,48 @@
+import pytest
+from agent.nodes import query_parser
+from agent.nodes.query_parser import rule_based_parse, query_parser_node, ParserStats
+
+@pytest.mark.parametrize("query, expected", [
+    ("What's our denial rate for Aetna in Q4?",
+     {"intent": "kpi_query", "metrics": ["denial_rate"], "filters": {"payer": "Aetna", "date_range": "Q4"}, "comparison_type": None}),
+    ("Show me collections performance for 2025",
+     {"intent": "kpi_query", "metrics": ["net_collection_rate"], "filters": {"payer": None, "date_range": "2025"}, "comparison_type": None}),
+    ("Days in A/R for UHC in the fourth quarter",
+     {"intent": "kpi_query", "metrics": ["days_in_ar"], "filters": {"payer": "UnitedHealthcare", "date_range": "Q4"}, "comparison_type": None}),
+    ("Compare Medicare collections in Q3 vs Q4",
+     {"intent": "comparison", "metrics": ["net_collection_rate"], "filters": {"payer": "Medicare", "date_range": None}, "comparison_type": "period_over_period"}),
+    ("Which payer has the highest denial rate?",
+     {"intent": "comparison", "metrics": ["denial_rate"], "filters": {"payer": None, "date_range": None}, "comparison_type": "payer_vs_payer"}),
+    ("Compare denial rate Aetna vs BCBS",
+     {"intent": "comparison", "metrics": ["denial_rate"], "filters": {"payer": None, "date_range": None, "payers": ["Aetna", "BCBS"]}, "comparison_type": "payer_vs_payer"}),
+    ("How does our clean claim rate compare to industry benchmarks?",
+     {"intent": "comparison", "metrics": ["clean_claim_rate"], "filters": {"payer": None, "date_range": None}, "comparison_type": "benchmark"}),
+    ("Any unusual spike in charge lag?",
+     {"intent": "anomaly", "metrics": ["charge_lag"], "filters": {"payer": None, "date_range": None}, "comparison_type": None}),
+])
+def test_rules_parse_common_questions(query, expected):
+    assert rule_based_parse(query) == expected
+
+@pytest.mark.parametrize("query", [
+    "What's our denial rate for Cigna?",                     # unknown payer
+    "Show me anomalies in our collections this month",       # relative period
+    "Denial rate at the downtown facility",                  # facility
+    "Generate a board report",                               # report, no metric
+    "Denial rate for Aetna and Medicare",                    # two payers without a comparison
+    "Compare our denial rate",                               # comparison type unclear
+    "Denial rate in Q4 2024",                                # quarter and year
+])
+def test_uncertain_questions_fall_through(query):
+    assert rule_based_parse(query) is None
+
+def test_node_counts_fall_through(monkeypatch):
+    from config.settings import settings
+    monkeypatch.setattr(settings, "anthropic_api_key", None)
+    stats = ParserStats()
+    monkeypatch.setattr(query_parser, "parser_stats", stats)
+
+    state = query_parser_node({"user_query": "What's our denial rate for Aetna in Q4?"})
+    assert state["filters"] == {"payer": "Aetna", "date_range": "Q4"}
+    query_parser_node({"user_query": "Show me anomalies in our collections this month"})
+
+    assert stats.snapshot() == {"rules": 1, "llm": 1, "total": 2, "fall_through_rate": 0.5}
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data.loader import DataLoader
+from data.synthetic_generator import (
+    COLUMNS, PAYERS, DENIAL_REASONS, TECHNICAL_DENIALS, generate_claims, iter_claim_chunks, write_synthetic_data,
+    write_partitioned_data, generate_synthetic_data, plan_partitions, payer_table, facility_weights
+)
+
+def test_columns_and_row_rules():
+    """Same columns as the bundled CSV; denied claims carry a reason and no payment."""
+    df = generate_claims(20_000, rng=np.random.default_rng(1))
+    assert list(df.columns) == COLUMNS == list(pd.read_csv(DataLoader().data_path, nrows=0).columns)
+    assert df['claim_id'].is_unique and df['claim_id'].iloc[0] == 'CLM-100000'
+
+    denied = df['claim_status'] == 'Denied'
+    assert df.loc[denied, 'denial_reason'].notna().all() and df.loc[~denied, 'denial_reason'].isna().all()
+    assert (df.loc[denied, ['payments', 'patient_responsibility']] == 0).all().all()
+    assert df.loc[denied, 'payment_date'].isna().all() and df.loc[~denied, 'payment_date'].notna().all()
+    technical = df['denial_reason'].isin(TECHNICAL_DENIALS)
+    assert (df.loc[denied & technical, 'denial_category'] == 'Technical').all()
+    assert (df.loc[denied & ~technical, 'denial_category'] == 'Clinical').all()
+
+    lag_entry = (df['charge_entry_date'] - df['service_date']).dt.days
+    lag_submit = (df['claim_submission_date'] - df['charge_entry_date']).dt.days
+    assert lag_entry.between(1, 4).all() and lag_submit.between(1, 2).all()
+    assert ((df['payment_date'] - df['service_date']).dt.days.dropna() >= 1).all()
+    assert df['service_date'].min() >= pd.Timestamp('2024-01-01') and df['service_date'].max() < pd.Timestamp('2025-12-31')
+    np.testing.assert_allclose(df['adjustments'], df['charges'] - df['allowed_amount'], atol=0.011)
+    assert (df.loc[~df['payer_category'].isin(['Commercial', 'Self-Pay']), 'pos_collections'] == 0).all()
+
+def test_payer_and_denial_distributions():
+    df = generate_claims(200_000, rng=np.random.default_rng(2))
+    shares = df['payer_name'].value_counts(normalize=True)
+    denial_rates = (df['claim_status'] == 'Denied').groupby(df['payer_name'], observed=True).mean()
+    for payer, info in PAYERS.items():
+        assert shares[payer] == pytest.approx(info['weight'], abs=0.005)
+        assert denial_rates[payer] == pytest.approx(info['denial_rate'], abs=0.01)
+
+    reasons = df['denial_reason'].value_counts(normalize=True)
+    for reason, weight in DENIAL_REASONS.items():
+        assert reasons[reason] == pytest.approx(weight, abs=0.015)
+    assert (df['facility'] == 'Main Campus').mean() == pytest.approx(0.8, abs=0.005)
+
+def test_chunks_are_seeded_and_ids_continue():
+    first = pd.concat(iter_claim_chunks(2_500, chunk_size=1_000, seed=7), ignore_index=True)
+    again = pd.concat(iter_claim_chunks(2_500, chunk_size=1_000, seed=7), ignore_index=True)
+    other = pd.concat(iter_claim_chunks(2_500, chunk_size=1_000, seed=8), ignore_index=True)
+
+    pd.testing.assert_frame_equal(first, again)
+    assert not first['charges'].equals(other['charges'])
+    assert len(first) == 2_500 and first['claim_id'].is_unique
+    assert first['claim_id'].iloc[-1] == 'CLM-102499'
+
+@pytest.mark.parametrize("name", ["claims.csv", "claims.parquet"])
+def test_written_extract_loads_and_validates(tmp_path, name):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / name)
+    write_synthetic_data(path, 2_500, chunk_size=1_000, seed=3)
+    expected = pd.concat(iter_claim_chunks(2_500, chunk_size=1_000, seed=3), ignore_index=True)
+
+    if name.endswith('.csv'):
+        df, report = DataLoader(path, use_cache=False, typed=True).load_from_csv()
+        assert report.status == "success" and report.invalid_rows == 0
+    else:
+        df = pd.read_parquet(path)
+        for col in ['service_date', 'payment_date']:
+            df[col] = pd.to_datetime(df[col]).astype('datetime64[s]')
+    assert len(df) == 2_500
+    assert df['claim_id'].tolist() == expected['claim_id'].tolist()
+    np.testing.assert_allclose(df['payments'], expected['payments'])
+    assert (df['payment_date'].isna() == expected['payment_date'].isna()).all()
+    assert (df['service_date'].to_numpy() == expected['service_date'].to_numpy()).all()
+
+def test_month_plan_covers_range_in_proportion_to_days():
+    plan = plan_partitions(1_000, '2024-01-15', '2024-04-10', partition_by='month')
+    assert [p['label'] for p in plan] == ['2024-01', '2024-02', '2024-03', '2024-04']
+    assert plan[0]['start_date'] == '2024-01-15' and plan[-1]['end_date'] == '2024-04-10'
+    assert sum(p['num_rows'] for p in plan) == 1_000
+    assert [p['first_id'] for p in plan[1:]] == list(np.cumsum([p['num_rows'] for p in plan])[:-1])
+    assert abs(plan[2]['num_rows'] - 1_000 * 31 / 86) < 1
+
+def _read_parts(paths):
+    return pd.concat([pd.read_parquet(p) for p in paths], ignore_index=True)
+
+def test_partitioned_output_is_independent_of_worker_count(tmp_path):
+    pytest.importorskip("pyarrow")
+    kwargs = dict(num_rows=3_000, chunk_size=1_000, seed=5, start_date='2024-01-01', end_date='2024-07-01',
+                  partition_by='month', num_payers=8, num_facilities=4)
+    serial = write_partitioned_data(str(tmp_path / "serial"), workers=1, **kwargs)
+    parallel = write_partitioned_data(str(tmp_path / "parallel"), workers=3, **kwargs)
+
+    assert [p.rsplit('/', 1)[1] for p in serial] == [f"claims-2024-0{m}.parquet" for m in range(1, 7)]
+    pd.testing.assert_frame_equal(_read_parts(serial), _read_parts(parallel))
+
+    for path, partition in zip(serial, plan_partitions(3_000, '2024-01-01', '2024-07-01', 1_000, 'month')):
+        part = pd.read_parquet(path)
+        months = pd.to_datetime(part['service_date']).dt.strftime('%Y-%m')
+        assert len(part) == partition['num_rows'] and (months == partition['label']).all()
+
+def test_row_partitions_match_single_file_stream(tmp_path):
+    pytest.importorskip("pyarrow")
+    paths = write_partitioned_data(str(tmp_path), 2_500, chunk_size=1_000, seed=9, workers=2)
+    expected = pd.concat(iter_claim_chunks(2_500, chunk_size=1_000, seed=9), ignore_index=True)
+    parts = _read_parts(paths)
+    assert len(paths) == 3
+    assert parts['claim_id'].tolist() == expected['claim_id'].tolist()
+    np.testing.assert_allclose(parts['charges'], expected['charges'])
+
+def test_payer_and_facility_knobs(tmp_path):
+    payers, facilities = payer_table(9), facility_weights(5)
+    assert payers['weight'].sum() == pytest.approx(1.0) and list(payers.index[:6]) == list(PAYERS)
+    assert (payers.loc['Regional Plan 1':, 'category'] == 'Commercial').all()
+    assert facilities.index[0] == 'Main Campus' and facility_weights(2).tolist() == pytest.approx([0.8, 0.2])
+
+    df = generate_claims(50_000, rng=np.random.default_rng(4), payers=payer_table(3), facilities=facilities)
+    assert set(df['payer_name']) == {'UnitedHealthcare', 'Aetna', 'BCBS'}
+    assert df['facility'].nunique() == 5
+
+    path = generate_synthetic_data(
+        start_date='2024-01-01', end_date='2024-01-11', output_path=str(tmp_path / "daily.csv"), claims_per_day=40
+    )
+    assert len(pd.read_csv(path)) == 400
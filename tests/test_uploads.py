@@ -0,0 +1,83 @@
+import io
+import pandas as pd
+import pytest
+from data.dataset import ClaimsDataset
+from data.loader import DataLoader
+from data.uploads import UploadProcessor
+from data.synthetic_generator import iter_claim_chunks
+
+def _extract(rows, seed):
+    return pd.concat(iter_claim_chunks(rows, chunk_size=rows, seed=seed), ignore_index=True)
+
+def _processor(tmp_path, chunk_size=300):
+    path = str(tmp_path / "claims.csv")
+    _extract(1_000, seed=1).to_csv(path, index=False)
+    dataset = ClaimsDataset(DataLoader(path, use_cache=False, typed=True, float32_amounts=True))
+    return UploadProcessor(dataset, max_workers=1, chunk_size=chunk_size), dataset
+
+def test_csv_upload_appends_valid_rows_in_background(tmp_path):
+    processor, dataset = _processor(tmp_path)
+    dataset.get()
+    base_version = dataset.version
+    upload = _extract(1_000, seed=2).astype({'payer_name': 'str'})
+    upload['claim_id'] = 'UP-' + upload['claim_id']
+    upload.loc[[5, 700], 'charges'] = -1.0
+    upload.loc[900, 'payer_name'] = 'Upload Regional Plan'
+
+    job = processor.submit(io.BytesIO(upload.to_csv(index=False).encode()), "extract.csv")
+    job.future.result(timeout=60)
+
+    assert job.status == "done" and job.progress == 1.0 and job.rows_read == 1_000
+    assert job.report.total_rows == 1_000 and job.report.invalid_rows == 2
+    assert job.version == base_version + 1 == dataset.version
+    df = dataset.get()
+    appended = df[df['claim_id'].astype(str).str.startswith('UP-')]
+    assert len(df) == 1_998 and len(appended) == 998
+    assert not appended['claim_id'].isin(['UP-CLM-100005', 'UP-CLM-100700']).any()
+    assert isinstance(df['payer_name'].dtype, pd.CategoricalDtype)
+    assert 'Upload Regional Plan' in set(appended['payer_name'])
+
+def test_unsupported_and_malformed_uploads(tmp_path):
+    processor, dataset = _processor(tmp_path)
+    with pytest.raises(ValueError):
+        processor.submit(io.BytesIO(b"a,b\n1,2\n"), "extract.json")
+
+    version = dataset.version
+    job = processor.submit(io.BytesIO(b"claim_id,charges\nCLM-1,10\n"), "broken.csv")
+    job.future.result(timeout=60)
+    assert job.status == "error" and job.error
+    assert dataset.version == version and len(dataset.get()) == 1_000
+
+def _xlsx(frame):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(list(frame.columns))
+    for row in frame.astype(object).where(frame.notna(), None).itertuples(index=False):
+        sheet.append([value.date() if isinstance(value, pd.Timestamp) else value for value in row])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer
+
+def test_xlsx_upload(tmp_path):
+    upload = _xlsx(_extract(100, seed=3))
+    processor, dataset = _processor(tmp_path, chunk_size=40)
+
+    job = processor.submit(upload, "extract.xlsx")
+    job.future.result(timeout=60)
+    assert job.status == "done" and job.report.invalid_rows == 0, job.error
+    assert job.rows_read == 100 and len(dataset.get()) == 1_100
+
+def test_xlsx_blank_required_cells_are_rejected(tmp_path):
+    """Empty cells stay missing rather than becoming the text 'None'."""
+    frame = _extract(100, seed=4).astype({'payer_name': object, 'claim_status': object})
+    frame.loc[3, 'payer_name'] = None
+    frame.loc[7, 'claim_status'] = None
+    upload = _xlsx(frame)
+    processor, dataset = _processor(tmp_path, chunk_size=40)
+
+    job = processor.submit(upload, "extract.xlsx")
+    job.future.result(timeout=60)
+    assert job.status == "done" and job.report.invalid_rows == 2 and job.report.missing_payer_name == 1
+    payers = dataset.get()['payer_name']
+    assert len(payers) == 1_098 and not payers.isin(['None', 'nan']).any()
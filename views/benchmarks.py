@@ -1,36 +1,48 @@
 import streamlit as st
 import pandas as pd
-from data.loader import DataLoader
+from data.dataset import claims_dataset
 from data.calculator import KPICalculator
-from data.benchmarks import BenchmarkData
+from data.benchmarks import BenchmarkData, benchmark_store, BED_BANDS
 from config.constants import KPI_METADATA
 
 def render():
     st.header("⚖️ Benchmark Comparison")
     st.markdown("---")
 
-    # 1. Profile Config
+    # 1. Profile Config (resolved against the shared benchmark store; nearest profile when unpublished)
     st.subheader("🏥 Hospital Profile")
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.selectbox("Hospital Type", ["Community", "Academic", "Rural", "Specialty"], index=0)
+        hospital_type = st.selectbox("Hospital Type", ["Community", "Academic", "Rural", "Specialty"], index=0)
     with col2:
-        st.selectbox("Bed Count", ["1-99", "100-249", "250-499", "500+"], index=1)
+        band = st.selectbox("Bed Count", BED_BANDS, index=1)
     with col3:
-        st.selectbox("Region", ["West", "Midwest", "Northeast", "South", "Global"], index=1)
+        region = st.selectbox("Region", ["Global", "West", "Midwest", "Northeast", "South"], index=0)
+    with col4:
+        year = st.selectbox("Year", benchmark_store.years(), index=0)
+
+    benchmarks = BenchmarkData(hospital_type, region=region, year=year, band=band)
+    resolved_type, resolved_band, resolved_region, resolved_year = benchmarks.profile
+    if benchmarks.profile != (hospital_type.lower(), band, region, year):
+        st.caption(f"No published benchmarks for this profile; showing the nearest one: "
+                   f"{resolved_type.title()}, {resolved_band} beds, {resolved_region}, {resolved_year}.")
+    source = benchmark_store.profile_source(benchmarks.profile)
+    if source:
+        st.caption(f"Benchmark data version {benchmark_store.version} · Source: {source}")
+    else:
+        st.warning(f"Illustrative benchmarks, not published figures. {benchmark_store.source}")
+        st.caption(f"Benchmark data version {benchmark_store.version}")
 
     st.markdown("---")
 
     # 2. Comparison Table
     st.subheader("🏁 Performance vs. Benchmarks")
     
-    loader = DataLoader()
     calculator = KPICalculator()
-    benchmarks = BenchmarkData()
     
-    df = loader.refresh_data()
+    df = claims_dataset.get()
     kpis = calculator.calculate_all(df)
-    b_data = benchmarks.get_benchmarks()
+    b_data = benchmarks.benchmarks
 
     # Build Table
     table_rows = []
@@ -50,7 +62,16 @@ def render():
 
     st.table(pd.DataFrame(table_rows))
 
-    # 3. AI Insights
+    # 3. Peer Groups (our KPIs ranked against every profile at once)
+    st.subheader("👥 Peer Group Standing")
+    peers = benchmark_store.compare_all(kpis).xs(resolved_year, level='year')
+    standing = peers.median(axis=1).groupby(level=['hospital_type', 'bed_band']).median().unstack('bed_band')
+    standing = standing.reindex(columns=[b for b in BED_BANDS if b in standing.columns])
+    st.caption("Median percentile across KPIs against each peer group (regions pooled). "
+               "Peer groups without a published source are illustrative.")
+    st.dataframe(standing.round(0), use_container_width=True)
+
+    # 4. AI Insights
     st.markdown("---")
     st.subheader("🤖 AI Benchmark Insights")
     with st.container(border=True):
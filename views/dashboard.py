@@ -3,13 +3,13 @@ import pandas as pd
 from datetime import date, timedelta
 from typing import Dict, Any
 
-from data.loader import DataLoader
-from data.calculator import KPICalculator
+from data.dataset import claims_dataset
 from data.benchmarks import BenchmarkData
 from components.kpi_card import render_kpi_card
 from components.trend_chart import render_trend_chart
 from components.filters import render_dashboard_filters
 from components.anomaly_alert import render_anomaly_alert
+from agent.nodes.anomaly_detector import recent_anomalies
 from config.constants import KPI_METADATA
 
 def render():
@@ -19,17 +19,11 @@ def render():
     st.markdown("---")
 
     # 1. Initialize Data and Tools
-    loader = DataLoader()
-    calculator = KPICalculator()
     benchmarks = BenchmarkData()
     
-    # 2. Load Data (with caching)
-    @st.cache_data(ttl=900)
-    def load_cached_data():
-        df, report = loader.load_from_csv()
-        return df
-        
-    df = load_cached_data()
+    # 2. Load Data (shared process-wide dataset and its pre-aggregated cube)
+    df = claims_dataset.get()
+    cube = claims_dataset.get_aggregates()
     
     if df.empty:
         st.warning("No data found. Please check data source.")
@@ -40,22 +34,23 @@ def render():
     facilities = sorted(df['facility'].dropna().unique().tolist())
     filters = render_dashboard_filters(payers, facilities)
     
-    # 4. Filter Data
-    filtered_df = df[
-        (df['service_date'] >= filters['start_date']) & 
-        (df['service_date'] <= filters['end_date']) &
-        (df['payer_name'].isin(filters['payers'])) &
-        (df['facility'].isin(filters['facilities']))
-    ]
+    # 4. Filter Selection (answered from cube cells, not raw claims)
+    selection = {
+        'start_date': filters['start_date'],
+        'end_date': filters['end_date'],
+        'payer_name': filters['payers'],
+        'facility': filters['facilities']
+    }
 
     # 5. Calculate KPIs
-    kpis = calculator.calculate_all(filtered_df)
+    kpis = cube.calculate(**selection)
     
     # 6. Top Metrics Section (4x3 Grid)
     st.subheader("🏁 Key Performance Indicators")
     cols = st.columns(4)
     
     kpi_order = list(KPI_METADATA.keys())
+    percentiles = benchmarks.percentile_ranks(pd.DataFrame([kpis])).iloc[0]
     for i, kpi_slug in enumerate(kpi_order):
         metadata = KPI_METADATA[kpi_slug]
         col_idx = i % 4
@@ -67,9 +62,9 @@ def render():
         # Randomly choose up/down/flat based on value
         direction = "up" if trend > 0.5 else ("down" if trend < -0.5 else "flat")
         
-        # Benchmark percentile (Mocked for now)
-        bc_percentile = random.choice([25, 50, 75, 90])
-        
+        # Interpolated benchmark percentile (KPIs without benchmarks show none)
+        bc_percentile = int(round(percentiles[kpi_slug])) if pd.notna(percentiles.get(kpi_slug)) else None
+
         with cols[col_idx]:
             render_kpi_card(
                 title=metadata['label'],
@@ -90,7 +85,7 @@ def render():
     
     with col_chart1:
         # Monthly Collection Trend Chart
-        trends = calculator.calculate_trends(filtered_df)
+        trends = cube.calculate_trends(**selection)
         chart_data = {
             'months': [t['period'] for t in trends],
             'series': [{
@@ -102,7 +97,7 @@ def render():
         
     with col_chart2:
          # Denial Distribution Chart
-        payer_denials = filtered_df[filtered_df['claim_status'] == 'Denied'].groupby('payer_name').size().reset_index(name='count')
+        payer_denials = cube.count('payer_name', **{**selection, 'claim_status': 'Denied'}).reset_index(name='count')
         chart_data_denials = {
             'months': payer_denials['payer_name'].tolist(),
             'series': [{
@@ -119,9 +114,12 @@ def render():
     
     with col_alerts:
         st.subheader("⚠️ Anomaly Alerts")
-        render_anomaly_alert("critical", "Aetna denial rate increased 12.4% WoW (threshold: 5%)", "Denial Rate")
-        render_anomaly_alert("warning", "Days in A/R for Medicare trending upward 3 consecutive weeks", "Days in A/R")
-        render_anomaly_alert("info", "Self-pay POS collections dropped 8.2% this month", "POS Collections")
+        # Detected once per data version across all payer/facility series, then narrowed to the selection
+        alerts = recent_anomalies(payers=filters['payers'], facilities=filters['facilities'])
+        if not alerts:
+            st.caption("No anomalies detected in recent weeks.")
+        for alert in alerts[:5]:
+            render_anomaly_alert(alert['severity'], alert['message'], KPI_METADATA[alert['metric']]['label'])
         
     with col_summary:
         st.subheader("📋 AI Executive Summary")
@@ -140,3 +138,13 @@ def render():
         """)
         if st.button("Regenerate Analysis"):
             st.info("Agent orchestrator triggered. This would call Claude API.")
+
+    st.markdown("---")
+
+    # 9. Claim Detail for the Selected Period (reads only the overlapping service-month partitions)
+    st.subheader("📑 Claims in Selected Period")
+    if st.toggle("Show claim detail"):
+        period_df = claims_dataset.get_range(filters['start_date'], filters['end_date'], facilities=filters['facilities'])
+        period_df = period_df[period_df['payer_name'].isin(filters['payers'])]
+        st.caption(f"{len(period_df):,} claims with service dates from {filters['start_date']} to {filters['end_date']}")
+        st.dataframe(period_df.head(100), use_container_width=True)
@@ -1,8 +1,10 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from data.loader import DataLoader
+from data.dataset import claims_dataset
+from data.uploads import upload_processor
 from config.settings import settings
+from components.progress_bar import render_progress_bar
 import time
 
 # Placeholder for Google OAuth Verification
@@ -48,20 +50,35 @@ def render():
 
     st.markdown("---")
 
-    # 3. Initialize Loader
-    loader = DataLoader()
-    
-    # 4. Data Upload (Gated by Auth)
+    # 3. Data Upload (Gated by Auth)
     st.subheader("📤 Upload Financial Data")
     uploaded_file = st.file_uploader("Upload CSV or XLSX Hospital Data", type=["csv", "xlsx"])
-    if uploaded_file:
-        st.info(f"Processing {uploaded_file.name}...")
-        # Processing logic would go here
-        st.success("File processed and validated against schema.py")
+    if "upload_jobs" not in st.session_state:
+        st.session_state.upload_jobs = {}
+    # Reruns hand back the same file; submit it only once
+    if uploaded_file and uploaded_file.file_id not in st.session_state.upload_jobs:
+        try:
+            st.session_state.upload_jobs[uploaded_file.file_id] = upload_processor.submit(uploaded_file, uploaded_file.name)
+        except ValueError as e:
+            st.error(str(e))
+    # Status is read once, so a job finishing mid-render is picked up by the fragment
+    done = {job_id: job.done() for job_id, job in st.session_state.upload_jobs.items()}
+    reported = st.session_state.setdefault('reported_uploads', set())
+    for job_id, job in st.session_state.upload_jobs.items():
+        if done[job_id]:
+            _render_upload(job)
+            if job.id not in reported:
+                reported.add(job.id)
+                if job.report is not None:
+                    st.session_state['data_quality_report'] = job.report
+    # The polling fragment is mounted only while uploads are queued or running
+    if not all(done.values()):
+        _poll_uploads()
+    st.caption("Uploaded rows are validated in the background and kept in memory until the next sync.")
 
     st.markdown("---")
 
-    # 5. Data Source Status
+    # 4. Data Source Status
     st.subheader("📡 Connection Status")
     col1, col2 = st.columns(2)
     with col1:
@@ -70,7 +87,7 @@ def render():
     with col2:
         if st.button("🔄 Trigger Sync Now"):
             with st.spinner("Synchronizing with data stack..."):
-                df, report = loader.load_from_csv()
+                df, report = claims_dataset.refresh()
                 if report.status == "success":
                     st.success(f"Successfully loaded {report.total_rows} rows!")
                     st.session_state['data_quality_report'] = report
@@ -79,7 +96,7 @@ def render():
 
     st.markdown("---")
 
-    # 6. Data Quality Report
+    # 5. Data Quality Report
     st.subheader("📋 Quality Integrity Report")
     
     if 'data_quality_report' in st.session_state:
@@ -92,6 +109,7 @@ def render():
              st.metric("Valid Integrity", f"{report.valid_rows:,}")
         with col3:
              st.metric("Data Gaps", f"{report.invalid_rows:,}")
+        st.caption(f"In-memory footprint: {report.memory_bytes / 1e6:.1f} MB")
              
         if report.validation_errors:
             with st.expander("View Anonymized Validation Findings"):
@@ -102,8 +120,30 @@ def render():
 
     st.markdown("---")
     
-    # 7. Preview Data
+    # 6. Preview Data
     st.subheader("📑 Processed Data Sample")
-    df = loader.refresh_data()
+    df = claims_dataset.get()
     if not df.empty:
         st.dataframe(df.head(20), use_container_width=True)
+
+def _render_upload(job):
+    """Progress bar for one upload job."""
+    if job.status == "error":
+        detail = f"⚠️ {job.error}"
+    elif job.report is not None:
+        detail = f"{job.report.valid_rows:,} rows added, {job.report.invalid_rows:,} rejected"
+    else:
+        detail = f"{job.rows_read:,} rows read"
+    render_progress_bar(job.filename, job.progress, job.status, detail)
+
+@st.fragment(run_every=0.5)
+def _poll_uploads():
+    """Shows progress of this session's active uploads; reruns the page when one finishes to publish its report."""
+    jobs = list((st.session_state.get('upload_jobs') or {}).values())
+    reported = st.session_state.get('reported_uploads', set())
+    if any(job.done() and job.id not in reported for job in jobs):
+        # The full rerun publishes the report and unmounts the fragment once nothing is active
+        st.rerun()
+    for job in jobs:
+        if not job.done():
+            _render_upload(job)
@@ -16,7 +16,7 @@ def render():
     The central hub for real-time monitoring.
     - **KPI Cards**: View 12 core revenue cycle metrics. Each card shows the current value, a trend comparison vs. the previous period, and your facility's ranking in industry benchmarks (e.g., "75th percentile").
     - **Trend Charts**: Interactive charts show monthly collection rates and denial patterns.
-    - **Anomaly Alerts**: Threshold-based alerts that highlight unusual spikes in denial rates or delays in A/R.
+    - **Anomaly Alerts**: The most severe KPI anomalies of the last four weeks for the selected payers and facilities, found by comparing each week against its recent history.
     - **AI Executive Summary**: A natural-language summary generated by Claude that interprets the raw data for you.
 
     #### 💬 AI Query Console
@@ -38,6 +38,7 @@ def render():
     #### ⚙️ Data Management
     Control your data source and monitor quality.
     - **Refresh**: Trigger a manual sync from your source data.
+    - **Upload**: Add claims from a CSV or XLSX file; it is validated in the background with a progress bar.
     - **Quality Report**: View validation findings and normalization status.
 
     ### 3. Data Specifications
@@ -1,5 +1,7 @@
+import uuid
 import streamlit as st
-from agent.orchestrator import run_agent
+from agent.orchestrator import agent_loop
+from agent.nodes.query_parser import parser_stats
 from components.chat_message import render_chat_message
 
 def render():
@@ -18,27 +20,23 @@ def render():
     chat_container = st.container()
     with chat_container:
         for msg in st.session_state.messages:
-            render_chat_message(msg["role"], msg["content"])
+            render_chat_message(msg["role"], msg["content"], caption=msg.get("caption"))
 
-    # 3. Chat Input
-    if prompt := st.chat_input("Ask about your revenue cycle..."):
+    # 3. Chat Input (disabled while this session's previous question is running)
+    pending = st.session_state.get('pending_query')
+    if prompt := st.chat_input("Ask about your revenue cycle...", disabled=pending is not None):
         # Add user message
         st.session_state.messages.append({"role": "user", "content": prompt})
         with chat_container:
             render_chat_message("user", prompt)
 
-        # 4. Run Agent
-        with st.spinner("🤖 Thinking..."):
-            try:
-                result = run_agent(prompt)
-                answer = result.get("answer", "I'm sorry, I couldn't process that query.")
-                
-                # Add agent message
-                st.session_state.messages.append({"role": "agent", "content": answer})
-                with chat_container:
-                    render_chat_message("agent", answer)
-            except Exception as e:
-                st.error(f"Agent error: {str(e)}")
+        # 4. Run Agent on the shared background loop; the answer streams in while the page keeps rendering
+        session_id = st.session_state.setdefault('agent_session_id', uuid.uuid4().hex)
+        st.session_state.pending_query = agent_loop.stream(prompt, session_id)
+
+    # The polling fragment is mounted only while an answer is pending; it reruns the page once the run completes
+    if st.session_state.get('pending_query') is not None:
+        _poll_pending_answer()
 
     # 5. Sidebar Options
     st.sidebar.markdown("---")
@@ -56,8 +54,44 @@ def render():
             # For simplicity in this demo, it just fills the prompt
             st.info(f"Copy/paste this query: {q}")
             
+    stats = parser_stats.snapshot()
+    if stats['total']:
+        st.sidebar.caption(
+            f"⚡ Rule parser answered {stats['rules']} of {stats['total']} questions "
+            f"({stats['fall_through_rate']:.0%} fell through to the LLM)"
+        )
+
     if st.sidebar.button("🗑️ Clear History"):
         st.session_state.messages = [
             {"role": "agent", "content": "History cleared. How can I help you today?"}
         ]
         st.rerun()
+
+@st.fragment(run_every=0.25)
+def _poll_pending_answer():
+    """Shows the answer as it streams and adds it to the chat once the query completes."""
+    pending = st.session_state.get('pending_query')
+    if pending is None:
+        # Already handled by an earlier tick; a full rerun unmounts the fragment
+        st.rerun()
+    if not pending.done():
+        partial = pending.partial_answer
+        if partial:
+            render_chat_message("agent", partial, streaming=True)
+        else:
+            st.caption("🤖 Thinking...")
+        return
+
+    st.session_state.pending_query = None
+    try:
+        result = pending.result()
+        answer = result.get("answer", "I'm sorry, I couldn't process that query.")
+        ttft_ms = result.get("ttft_ms")
+        if "result" in (result.get("cache_hits") or []):
+            caption = "answered from cache"
+        else:
+            caption = f"first token in {ttft_ms:,.0f} ms" if ttft_ms is not None else None
+        st.session_state.messages.append({"role": "agent", "content": answer, "caption": caption})
+    except Exception as e:
+        st.session_state.messages.append({"role": "agent", "content": f"Agent error: {str(e)}"})
+    st.rerun()
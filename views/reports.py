@@ -1,7 +1,7 @@
 import streamlit as st
 import os
 from datetime import datetime
-from data.loader import DataLoader
+from data.dataset import claims_dataset
 from data.calculator import KPICalculator
 from templates.board_deck import generate_board_deck
 
@@ -50,9 +50,8 @@ def render():
             
             if submitted:
                  with st.spinner("Agent generating report..."):
-                    loader = DataLoader()
                     calculator = KPICalculator()
-                    df = loader.refresh_data()
+                    df = claims_dataset.get()
                     kpis = calculator.calculate_all(df)
                     
                     filename = f"Board_Deck_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pptx"